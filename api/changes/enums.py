@@ -0,0 +1,7 @@
+import enum
+
+
+class ChangeType(enum.Enum):
+    PROJECT = "Project"
+    PARTICIPANT = "Participant"
+    TASK = "Task"
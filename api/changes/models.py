@@ -0,0 +1,43 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Enum, ForeignKey, Index, func, text, types
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.changes.enums import ChangeType
+from api.database.models import BaseDatabaseModel
+from api.utils.ids import uuid7
+
+
+class Tombstone(BaseDatabaseModel):
+    """Record of a deleted project, participant or task, for the change feed of
+    its organization. Kept for `CHANGES_RETENTION_DAYS`."""
+
+    __tablename__ = "tombstones"
+
+    id: Mapped[UUID] = mapped_column(
+        types.Uuid,
+        primary_key=True,
+        init=False,
+        insert_default=uuid7,
+        server_default=text("gen_random_uuid()"),
+    )
+    organization_id: Mapped[UUID] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False
+    )
+    type: Mapped[ChangeType] = mapped_column(Enum(ChangeType), nullable=False)
+    # Id of the project or task; user id of a participant.
+    record_id: Mapped[UUID] = mapped_column(types.Uuid, nullable=False)
+    # Project of a deleted task or participant.
+    project_id: Mapped[UUID] = mapped_column(types.Uuid, nullable=True, default=None)
+    deleted_at: Mapped[datetime] = mapped_column(init=False, server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_tombstones_organization_id_deleted_at_id",
+            "organization_id",
+            "deleted_at",
+            "id",
+        ),
+        Index("ix_tombstones_deleted_at", "deleted_at"),
+    )
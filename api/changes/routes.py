@@ -0,0 +1,52 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Path, Query, status
+from fastapi.routing import APIRouter
+
+from api.changes.schemas import ChangesParams, ChangesResponse
+from api.changes.services import ChangeService
+from api.orgs.permissions import OrganizationPermissionService
+from api.orgs.services import OrganizationService
+from api.users.auth.dependencies import AuthenticatedUser
+from api.utils.permissions import check_permission
+
+router = APIRouter(prefix="", tags=["Changes"])
+
+
+@router.get(
+    "/organizations/{organization_id}/changes",
+    response_model=ChangesResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_organization_changes(
+    organization_id: Annotated[UUID, Path()],
+    params: Annotated[ChangesParams, Query()],
+    organization_service: Annotated[OrganizationService, Depends()],
+    permission_service: Annotated[OrganizationPermissionService, Depends()],
+    change_service: Annotated[ChangeService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Get projects, participants and tasks of an organization created, updated
+    or deleted since `since`, a cursor returned by the previous call.
+    Note: participants and tasks are only those of projects the user participates
+    in, unless user is the manager. Tasks of a project the user was just added to
+    are not part of the feed and should be fetched by the task listing.
+    Responds with 410 when the cursor is too old; the client should sync from
+    scratch by omitting `since`."""
+    organization = await organization_service.get_organization(organization_id)
+    if not organization:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    await check_permission(
+        permission_service.is_organization_member_or_manager,
+        organization=organization,
+        user=user,
+    )
+
+    return await change_service.get_changes(
+        organization.id,
+        user.id,
+        await permission_service.is_organization_manager(organization, user),
+        params,
+    )
@@ -0,0 +1,65 @@
+from datetime import date, datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from api.changes.enums import ChangeType
+from api.orgs.schemas import OrganizationResponse
+from api.projects.enums import ProjectParticipationType
+from api.projects.schemas import ProjectResponse
+from api.tasks.enums import TaskState
+
+
+class ChangesParams(BaseModel):
+    # Cursor of the previous call; everything is returned without it.
+    since: str | None = Field(None)
+    # Maximum number of changes returned per kind (projects, tasks, ...).
+    page_size: int = Field(ge=1, le=500, default=100)
+
+
+class ChangedParticipant(BaseModel):
+    project_id: UUID
+    user_id: UUID
+    participation_type: ProjectParticipationType
+    created_at: datetime
+    modified_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ChangedTask(BaseModel):
+    id: UUID
+    project_id: UUID
+    title: str
+    description: str | None
+    start_date: date | None
+    finish_date: date | None
+    deadline: date | None
+    state: TaskState
+    priority: int
+    rank: str
+    # Assigning or unassigning users counts as a change of the task.
+    assignee_ids: list[UUID]
+    created_at: datetime
+    modified_at: datetime
+
+
+class DeletedRecord(BaseModel):
+    type: ChangeType
+    # Id of the project or task; user id of a participant.
+    id: UUID
+    project_id: UUID | None
+    deleted_at: datetime
+
+
+class ChangesResponse(BaseModel):
+    """Changes since the given cursor. Pass `cursor` to the next call; while
+    `has_more` is true, more changes are ready to be fetched right away."""
+
+    cursor: str
+    has_more: bool
+    organization: OrganizationResponse | None
+    projects: list[ProjectResponse]
+    participants: list[ChangedParticipant]
+    tasks: list[ChangedTask]
+    deleted: list[DeletedRecord]
@@ -0,0 +1,291 @@
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    Select,
+    and_,
+    column,
+    func,
+    or_,
+    select,
+    table,
+    true,
+    tuple_,
+    types,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from api.changes.enums import ChangeType
+from api.changes.models import Tombstone
+from api.changes.schemas import (
+    ChangedParticipant,
+    ChangedTask,
+    ChangesParams,
+    ChangesResponse,
+    DeletedRecord,
+)
+from api.config import settings
+from api.database.dependencies import AsyncSession
+from api.orgs.models import Organization
+from api.orgs.schemas import OrganizationResponse
+from api.projects.models import Project, ProjectParticipant
+from api.projects.schemas import ProjectResponse
+from api.tasks.models import Task, TaskAssignee
+from api.utils.pagination import decode_cursor, encode_cursor
+
+# Number of key columns after the timestamp, per kind of change.
+CURSOR_KEYS = {"projects": 1, "participants": 2, "tasks": 1, "deleted": 1}
+
+pg_stat_activity = table(
+    "pg_stat_activity",
+    column("pid"),
+    column("datname"),
+    column("backend_type"),
+    column("xact_start"),
+)
+
+# A position is the (timestamp, *keys) of the last change returned; or just
+# the timestamp once every change before it was returned.
+Position = tuple
+
+
+def _after(columns: Sequence, position: Position | None):
+    if position is None:
+        return true()
+    if len(position) == 1:
+        return columns[0] >= position[0]
+    return tuple_(*columns) > position
+
+
+class ChangeService:
+    """Change feed of an organization: its projects, participants and tasks
+    created or updated since a cursor, along with the deleted ones.
+
+    Changes are found by `modified_at` (`deleted_at` of tombstones), which is
+    when the writing transaction started; it may commit much later, behind a
+    cursor already handed out. So changes are only returned up to a watermark,
+    the start of the oldest transaction in flight less `CHANGES_SETTLE_SECONDS`.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_changes(
+        self,
+        organization_id: UUID,
+        user_id: UUID,
+        is_manager: bool,
+        params: ChangesParams,
+    ) -> ChangesResponse:
+        """Get changes since `params.since`, at most `params.page_size` of each
+        kind. Managers get every project's participants and tasks, other
+        members only those of the projects they participate in."""
+        positions = self._decode_cursor(params.since) if params.since else {}
+        if positions and positions["deleted"][0] < datetime.now(
+            timezone.utc
+        ) - timedelta(days=settings.CHANGES_RETENTION_DAYS):
+            raise HTTPException(
+                detail="Cursor expired; sync from scratch.",
+                status_code=status.HTTP_410_GONE,
+            )
+
+        # Sessions of other roles don't expose `xact_start`; the app is assumed
+        # to be the only one writing.
+        in_flight = (
+            select(func.min(pg_stat_activity.c.xact_start))
+            .where(
+                pg_stat_activity.c.pid != func.pg_backend_pid(),
+                pg_stat_activity.c.datname == func.current_database(),
+                pg_stat_activity.c.backend_type == "client backend",
+            )
+            .scalar_subquery()
+        )
+        watermark_query = select(
+            Organization,
+            func.least(
+                func.statement_timestamp(),
+                in_flight,
+                type_=types.DateTime(timezone=True),
+            )
+            - timedelta(seconds=settings.CHANGES_SETTLE_SECONDS),
+        ).where(Organization.id == organization_id)
+
+        project_ids = select(Project.id).where(
+            Project.organization_id == organization_id,
+            Project.deleted_at.is_(None),
+        )
+        if not is_manager:
+            project_ids = project_ids.where(
+                Project.id.in_(
+                    select(ProjectParticipant.project_id).where(
+                        ProjectParticipant.user_id == user_id
+                    )
+                )
+            )
+
+        assignee_ids = (
+            select(
+                func.array_agg(
+                    aggregate_order_by(TaskAssignee.user_id, TaskAssignee.created_at)
+                )
+            )
+            .where(TaskAssignee.task_id == Task.id)
+            .scalar_subquery()
+        )
+        tombstones = select(Tombstone).where(
+            Tombstone.organization_id == organization_id
+        )
+        if not is_manager:
+            tombstones = tombstones.where(
+                or_(
+                    Tombstone.type == ChangeType.PROJECT,
+                    Tombstone.project_id.in_(project_ids),
+                    # Lets members drop projects they were removed from.
+                    and_(
+                        Tombstone.type == ChangeType.PARTICIPANT,
+                        Tombstone.record_id == user_id,
+                    ),
+                )
+            )
+
+        # Each kind is read in order of its keys, i.e. along the indexes on
+        # (parent id, modified_at).
+        queries: dict[str, tuple[Select, Sequence]] = {
+            "projects": (
+                select(Project).where(
+                    Project.organization_id == organization_id,
+                    Project.deleted_at.is_(None),
+                ),
+                (Project.modified_at, Project.id),
+            ),
+            "participants": (
+                select(ProjectParticipant).where(
+                    ProjectParticipant.project_id.in_(project_ids)
+                ),
+                (
+                    ProjectParticipant.modified_at,
+                    ProjectParticipant.project_id,
+                    ProjectParticipant.user_id,
+                ),
+            ),
+            "tasks": (
+                select(Task, assignee_ids).where(Task.project_id.in_(project_ids)),
+                (Task.modified_at, Task.id),
+            ),
+            "deleted": (tombstones, (Tombstone.deleted_at, Tombstone.id)),
+        }
+
+        async with self.session() as ac:
+            organization, watermark = (await ac.execute(watermark_query)).one()
+            if not positions:
+                # A client syncing from scratch has nothing to delete.
+                positions = {"deleted": (watermark,)}
+
+            rows = {}
+            for kind, (query, keys) in queries.items():
+                position = positions.get(kind)
+                if position and len(position) == 1 and position[0] >= watermark:
+                    rows[kind] = []
+                    continue
+
+                query = (
+                    query.where(keys[0] < watermark, _after(keys, position))
+                    .order_by(*keys)
+                    .limit(params.page_size + 1)
+                )
+                rows[kind] = (await ac.execute(query)).all()
+
+        cursor = {}
+        has_more = False
+        for kind, (_, keys) in queries.items():
+            if len(rows[kind]) > params.page_size:
+                rows[kind] = rows[kind][: params.page_size]
+                last = rows[kind][-1][0]
+                cursor[kind] = [getattr(last, key.key) for key in keys]
+                has_more = True
+            else:
+                since = positions.get(kind, (watermark,))[0]
+                cursor[kind] = [max(since, watermark)]
+
+        since = positions.get("organization", (None,))[0]
+        changed_organization = organization.modified_at < watermark and (
+            since is None or organization.modified_at >= since
+        )
+        cursor["organization"] = [max(since or watermark, watermark)]
+
+        return ChangesResponse(
+            cursor=self._encode_cursor(cursor),
+            has_more=has_more,
+            organization=(
+                OrganizationResponse.model_validate(organization)
+                if changed_organization
+                else None
+            ),
+            projects=[
+                ProjectResponse.model_validate(project)
+                for (project,) in rows["projects"]
+            ],
+            participants=[
+                ChangedParticipant.model_validate(participant)
+                for (participant,) in rows["participants"]
+            ],
+            tasks=[
+                ChangedTask(
+                    id=task.id,
+                    project_id=task.project_id,
+                    title=task.title,
+                    description=task.description,
+                    start_date=task.start_date,
+                    finish_date=task.finish_date,
+                    deadline=task.deadline,
+                    state=task.state,
+                    priority=task.priority,
+                    rank=task.rank,
+                    assignee_ids=assignees or [],
+                    created_at=task.created_at,
+                    modified_at=task.modified_at,
+                )
+                for task, assignees in rows["tasks"]
+            ],
+            deleted=[
+                DeletedRecord(
+                    type=tombstone.type,
+                    id=tombstone.record_id,
+                    project_id=tombstone.project_id,
+                    deleted_at=tombstone.deleted_at,
+                )
+                for (tombstone,) in rows["deleted"]
+            ],
+        )
+
+    def _encode_cursor(self, positions: dict[str, list]) -> str:
+        return encode_cursor(
+            {
+                kind: [
+                    value.isoformat() if isinstance(value, datetime) else str(value)
+                    for value in position
+                ]
+                for kind, position in positions.items()
+            }
+        )
+
+    def _decode_cursor(self, cursor: str) -> dict[str, Position]:
+        values = decode_cursor(cursor)
+        positions = {}
+        try:
+            for kind, count in {**CURSOR_KEYS, "organization": 0}.items():
+                timestamp, *keys = values[kind]
+                if len(keys) not in (0, count):
+                    raise ValueError
+                positions[kind] = (
+                    datetime.fromisoformat(timestamp),
+                    *(UUID(key) for key in keys),
+                )
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(
+                detail="Invalid cursor.", status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        return positions
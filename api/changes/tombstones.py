@@ -0,0 +1,101 @@
+"""Remove tombstones older than `CHANGES_RETENTION_DAYS`.
+
+Change feed cursors older than that are rejected, so clients holding them sync
+from scratch and never need those tombstones.
+
+Usage:
+    python -m api.changes.tombstones [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+from datetime import timedelta
+from typing import Any, Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.changes.enums import ChangeType
+from api.changes.models import Tombstone
+from api.config import settings
+from api.database.setup import AsyncSessionLocal
+
+
+async def record_deletion(
+    ac: AsyncSession,
+    type: ChangeType,
+    record_id: UUID,
+    organization_id: UUID | Any,
+    project_id: UUID | None = None,
+) -> None:
+    """Record deletion of a record, as part of the transaction deleting it.
+    `organization_id` may be an SQL expression, e.g. a scalar subquery."""
+    await record_deletions(ac, type, [record_id], organization_id, project_id)
+
+
+async def record_deletions(
+    ac: AsyncSession,
+    type: ChangeType,
+    record_ids: Sequence[UUID],
+    organization_id: UUID | Any,
+    project_id: UUID | None = None,
+) -> None:
+    """Record deletion of many records of a type in a single statement."""
+    if not record_ids:
+        return
+
+    await ac.execute(
+        insert(Tombstone).values(
+            [
+                {
+                    "organization_id": organization_id,
+                    "type": type,
+                    "record_id": record_id,
+                    "project_id": project_id,
+                }
+                for record_id in record_ids
+            ]
+        )
+    )
+
+
+async def prune(ac: AsyncSession, batch_size: int) -> int:
+    """Remove a batch of expired tombstones.
+
+    Returns:
+        int: Number of removed tombstones.
+    """
+    expired = (
+        select(Tombstone.id)
+        .where(
+            Tombstone.deleted_at
+            < func.now() - timedelta(days=settings.CHANGES_RETENTION_DAYS)
+        )
+        .limit(batch_size)
+    )
+    result = await ac.execute(delete(Tombstone).where(Tombstone.id.in_(expired)))
+    return result.rowcount
+
+
+async def run(batch_size: int) -> int:
+    removed = 0
+    while True:
+        async with AsyncSessionLocal.begin() as ac:
+            count = await prune(ac, batch_size)
+        removed += count
+        if count < batch_size:
+            return removed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=settings.JOBS_BATCH_SIZE)
+    args = parser.parse_args()
+
+    removed = asyncio.run(run(args.batch_size))
+    print(f"Removed {removed} tombstone(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -44,6 +44,77 @@ class Settings(BaseSettings):
     LOGGING_LEVEL: str = "INFO"
     LOGGING_USE_DEFAULT_HANDLERS: bool = True
 
+    # Profiling
+    # Middleware is not installed at all unless enabled.
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: str = "X-Profile"
+    # Users allowed to request profiling with `PROFILING_HEADER`.
+    PROFILING_ADMIN_USER_IDS: list[str] = []
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_DIR_NAME: str = "profiles"  # Relative to `LOGGING_FILE_DIR`.
+    PROFILING_MAX_FILES: int = 100
+    PROFILING_MAX_BYTES: int = 50 * 1024 * 1024  # 50 megabytes
+
+    # Event loop monitoring
+    LOOP_MONITOR_ENABLED: bool = False
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.1
+    LOOP_MONITOR_THRESHOLD_SECONDS: float = 0.1
+    LOOP_MONITOR_REPORT_INTERVAL_SECONDS: float = 60
+    # Stacks are always captured in debug mode.
+    LOOP_MONITOR_CAPTURE_STACKS: bool = False
+
+    # Background jobs
+    JOBS_ENABLED: bool = True
+    JOBS_POLL_INTERVAL_SECONDS: float = 1.0
+    # Maximum number of rows a job deletes/updates in a single transaction.
+    JOBS_BATCH_SIZE: int = 1000
+    # A running job not heard from for this long is considered abandoned.
+    JOBS_LEASE_SECONDS: int = 60
+    JOBS_MAX_ATTEMPTS: int = 5
+
+    # Monthly partitions of partitioned tables are created this far ahead, and
+    # checked for this often.
+    PARTITIONS_MONTHS_AHEAD: int = 3
+    PARTITIONS_INTERVAL_SECONDS: float = 60 * 60
+
+    # Task analytics
+    TASK_ANALYTICS_CACHE_TTL_SECONDS: float = 300
+    TASK_ANALYTICS_CACHE_MAX_PROJECTS: int = 1024
+
+    # Live task events
+    TASK_EVENTS_ENABLED: bool = True
+    # Events buffered per subscriber; a subscriber falling further behind is
+    # cut off and has to resync.
+    TASK_EVENTS_QUEUE_SIZE: int = 100
+    TASK_EVENTS_HEARTBEAT_SECONDS: float = 15
+    # Streams are closed after this long, for clients to reconnect and have
+    # their permissions checked again.
+    TASK_EVENTS_MAX_STREAM_SECONDS: float = 900
+    TASK_EVENTS_RECONNECT_SECONDS: float = 1.0
+
+    # Change feed
+    # Tombstones of deleted records are kept this long; older cursors are
+    # rejected and clients have to sync from scratch.
+    CHANGES_RETENTION_DAYS: int = 30
+    # Margin kept behind the oldest transaction in flight, see `ChangeService`.
+    CHANGES_SETTLE_SECONDS: float = 1.0
+
+    # Task dependencies
+    # Dependency graphs are cached per project; changes made by other
+    # processes show up once a cached graph expires.
+    TASK_GRAPH_CACHE_TTL_SECONDS: float = 300
+    TASK_GRAPH_CACHE_MAX_PROJECTS: int = 64
+
+    # Organization workload
+    # Workloads are cached per organization; changes made by other processes
+    # show up once a cached workload expires.
+    ORGANIZATION_WORKLOAD_CACHE_TTL_SECONDS: float = 30
+    ORGANIZATION_WORKLOAD_CACHE_MAX_ORGANIZATIONS: int = 256
+
+    # Organization invitations
+    # Invitations not answered for this long expire.
+    ORGANIZATION_INVITATION_EXPIRY_DAYS: int = 14
+
     # Authentication
     ACCESS_TOKEN_EXPIRY_SECONDS: int = 3600
     ACCESS_TOKEN_SECRET_KEY: str
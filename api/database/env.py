@@ -7,6 +7,7 @@ from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from api.config import settings
+from api.database.partitions import is_partition
 from api.database.registry import *  # noqa: F403
 from api.database.setup import async_database_url_scheme
 
@@ -33,6 +34,11 @@ from api.database.models import BaseDatabaseModel  # noqa: F401, E402
 target_metadata = BaseDatabaseModel.metadata
 
 
+def include_name(name, type_, parent_names) -> bool:
+    # Partitions are created by `api.database.partitions`, not from models.
+    return not (type_ == "table" and is_partition(name))
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -49,6 +55,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -58,7 +65,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
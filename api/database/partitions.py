@@ -0,0 +1,174 @@
+"""Create monthly partitions of range-partitioned tables ahead of time.
+
+Tables listed in `PARTITIONED_TABLES` are partitioned by month of `created_at`.
+Partitions for the coming months are created periodically by
+`partition_scheduler`; rows which don't fall in any of them land in the table's
+default partition, and are moved out of it once their month's partition is
+created.
+
+Usage:
+    python -m api.database.partitions [--months 3]
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.config import settings
+from api.database.setup import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("task_state_transitions",)
+
+
+def is_partition(name: str) -> bool:
+    """Whether given table is a partition, which are not part of the models."""
+    return name.startswith(tuple(f"{table}_" for table in PARTITIONED_TABLES))
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+async def create_monthly_partitions(
+    ac: AsyncSession, table: str, months: int, start: date | None = None
+) -> list[str]:
+    """Create missing partitions of `table` for `months` months from `start`
+    (defaults to the current month, in UTC).
+
+    Returns:
+        list[str]: Names of created partitions.
+    """
+    month = (start or datetime.now(timezone.utc).date()).replace(day=1)
+    # Processes creating partitions at the same time wait for each other.
+    await ac.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:table))"), {"table": table}
+    )
+    # Creating a partition locks the parent table, so existing ones are skipped
+    # up front rather than with `IF NOT EXISTS`.
+    existing = set(
+        (
+            await ac.execute(
+                text(
+                    "SELECT c.relname FROM pg_inherits i "
+                    "JOIN pg_class c ON c.oid = i.inhrelid "
+                    "WHERE i.inhparent = CAST(:table AS regclass)"
+                ),
+                {"table": table},
+            )
+        ).scalars()
+    )
+
+    created = []
+    for _ in range(months):
+        name = f"{table}_y{month:%Y}m{month:%m}"
+        if name not in existing:
+            await _create_partition(ac, table, name, month)
+            created.append(name)
+        month = next_month(month)
+
+    return created
+
+
+async def _create_partition(
+    ac: AsyncSession, table: str, name: str, month: date
+) -> None:
+    default = f"{table}_default"
+    lower, upper = f"'{month} 00:00+00'", f"'{next_month(month)} 00:00+00'"
+    in_month = f"created_at >= {lower} AND created_at < {upper}"
+    create = text(
+        f"CREATE TABLE {name} PARTITION OF {table} "
+        f"FOR VALUES FROM ({lower}) TO ({upper})"
+    )
+
+    stranded = await ac.scalar(
+        text(f"SELECT EXISTS (SELECT FROM {default} WHERE {in_month})")
+    )
+    if not stranded:
+        await ac.execute(create)
+        return
+
+    # The partition can't be created while the default partition holds rows of
+    # its month (e.g. when it wasn't created in time), so the default partition
+    # is detached meanwhile and the rows are moved into the new one.
+    await ac.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    await ac.execute(create)
+    await ac.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {in_month} RETURNING *) "
+            f"INSERT INTO {table} SELECT * FROM moved"
+        )
+    )
+    await ac.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+
+
+async def create_partitions(
+    session_maker: async_sessionmaker,
+    months: int = settings.PARTITIONS_MONTHS_AHEAD,
+) -> list[str]:
+    """Create missing monthly partitions of every partitioned table."""
+    created = []
+    for table in PARTITIONED_TABLES:
+        async with session_maker.begin() as ac:
+            created += await create_monthly_partitions(ac, table, months)
+    return created
+
+
+class PartitionScheduler:
+    """Create partitions ahead of time every `interval` seconds, for processes
+    running longer than `PARTITIONS_MONTHS_AHEAD` not to run out of them."""
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        interval: float = settings.PARTITIONS_INTERVAL_SECONDS,
+        months: int = settings.PARTITIONS_MONTHS_AHEAD,
+    ) -> None:
+        self.session_maker = session_maker
+        self.interval = interval
+        self.months = months
+
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._work())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                created = await create_partitions(self.session_maker, self.months)
+                if created:
+                    logger.info("Created partitions.", extra={"partitions": created})
+            except Exception:
+                logger.exception("Failed to create partitions.")
+
+            await asyncio.sleep(self.interval)
+
+
+partition_scheduler = PartitionScheduler(AsyncSessionLocal)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--months", type=int, default=settings.PARTITIONS_MONTHS_AHEAD)
+    args = parser.parse_args()
+
+    created = asyncio.run(create_partitions(AsyncSessionLocal, args.months))
+    print(f"Created {len(created)} partition(s): {', '.join(created) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
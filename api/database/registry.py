@@ -1,3 +1,5 @@
+from api.changes.models import *  # noqa: F403
+from api.jobs.models import *  # noqa: F403
 from api.orgs.models import *  # noqa: F403
 from api.projects.models import *  # noqa: F403
 from api.tasks.models import *  # noqa: F403
@@ -0,0 +1,51 @@
+"""add created_at to task state priority index
+
+Revision ID: 1e0618601b7b
+Revises: 1105e5e0ab23
+Create Date: 2026-10-19 05:52:20.805227+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "1e0618601b7b"
+down_revision: Union[str, None] = "1105e5e0ab23"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Board columns are ordered by (priority, created_at); with created_at in
+    # the index a column's first tasks are read without sorting.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_project_id_state_priority_created_at",
+            "tasks",
+            ["project_id", "state", "priority", "created_at"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_tasks_project_id_state_priority",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_project_id_state_priority",
+            "tasks",
+            ["project_id", "state", "priority"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_tasks_project_id_state_priority_created_at",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
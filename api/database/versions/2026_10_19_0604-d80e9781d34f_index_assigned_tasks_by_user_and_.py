@@ -0,0 +1,50 @@
+"""index assigned tasks by user and assignment time
+
+Revision ID: d80e9781d34f
+Revises: b194ab6a7515
+Create Date: 2026-10-19 06:04:44.709553+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d80e9781d34f"
+down_revision: Union[str, None] = "b194ab6a7515"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # "My tasks" reads a user's assignments in order, straight from the index.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_task_assignees_user_id_created_at_task_id",
+            "task_assignees",
+            ["user_id", "created_at", "task_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_task_assignees_user_id_task_id",
+            table_name="task_assignees",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_task_assignees_user_id_task_id",
+            "task_assignees",
+            ["user_id", "task_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_task_assignees_user_id_created_at_task_id",
+            table_name="task_assignees",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,38 @@
+"""add tasks start date index
+
+Revision ID: 64f2b9330c3d
+Revises: 5d6db43b3fe2
+Create Date: 2026-10-19 06:39:39.984671+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "64f2b9330c3d"
+down_revision: Union[str, None] = "5d6db43b3fe2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Timeline reads tasks of a project by start date.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_project_id_start_date",
+            "tasks",
+            ["project_id", "start_date"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_project_id_start_date",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
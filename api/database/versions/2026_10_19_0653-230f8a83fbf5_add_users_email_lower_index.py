@@ -0,0 +1,39 @@
+"""add users email lower index
+
+Revision ID: 230f8a83fbf5
+Revises: 76e1e16ea662
+Create Date: 2026-10-19 06:53:15.251316+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "230f8a83fbf5"
+down_revision: Union[str, None] = "76e1e16ea662"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Emails are resolved case-insensitively, many at once by bulk invitations.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_email_lower",
+            "users",
+            [sa.literal_column("lower(email)")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_email_lower",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
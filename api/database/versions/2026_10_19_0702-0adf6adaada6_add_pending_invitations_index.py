@@ -0,0 +1,40 @@
+"""add pending invitations index
+
+Revision ID: 0adf6adaada6
+Revises: 230f8a83fbf5
+Create Date: 2026-10-19 07:02:07.080378+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0adf6adaada6"
+down_revision: Union[str, None] = "230f8a83fbf5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Pending invitations of a user are listed newest first.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_organization_invitations_pending_user_id_created_at",
+            "organization_invitations",
+            ["user_id", "created_at"],
+            unique=False,
+            postgresql_where=sa.text("accepted IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_organization_invitations_pending_user_id_created_at",
+            table_name="organization_invitations",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,47 @@
+"""add users trigram index
+
+Revision ID: 681373ace5ea
+Revises: 0adf6adaada6
+Create Date: 2026-10-19 07:06:04.042066+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "681373ace5ea"
+down_revision: Union[str, None] = "0adf6adaada6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Members and users are searched by substrings of their names and emails.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_trgm",
+            "users",
+            ["email", "first_name", "last_name", "display_name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={
+                "email": "gin_trgm_ops",
+                "first_name": "gin_trgm_ops",
+                "last_name": "gin_trgm_ops",
+                "display_name": "gin_trgm_ops",
+            },
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    # The extension is left in place, as other objects may depend on it.
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_trgm",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
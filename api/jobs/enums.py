@@ -0,0 +1,8 @@
+import enum
+
+
+class JobStatus(enum.Enum):
+    PENDING = "Pending"
+    RUNNING = "Running"
+    COMPLETED = "Completed"
+    FAILED = "Failed"
@@ -0,0 +1,25 @@
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.jobs.models import Job
+
+# A handler processes one bounded batch of a job inside the transaction it is
+# given and returns True once there is nothing left to do. It may update
+# `job.progress`, which is saved in the same transaction as the batch.
+# Since a batch is either committed along with the progress or not at all,
+# handlers must pick their next batch from the current database state; this
+# is what makes jobs resumable after a restart.
+JobHandler = Callable[[AsyncSession, Job, int], Awaitable[bool]]
+
+HANDLERS: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register decorated function as the handler of given job kind."""
+
+    def decorator(handler: JobHandler) -> JobHandler:
+        HANDLERS[kind] = handler
+        return handler
+
+    return decorator
@@ -0,0 +1,51 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Enum, ForeignKey, Index, text, types
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.database.models import BaseDatabaseModel, TimestampedModelMixin
+from api.jobs.enums import JobStatus
+from api.utils.ids import uuid7
+
+
+class Job(BaseDatabaseModel, TimestampedModelMixin):
+    """Model representing a background job processed by `JobRunner`."""
+
+    __tablename__ = "jobs"
+
+    id: Mapped[UUID] = mapped_column(
+        types.Uuid,
+        primary_key=True,
+        init=False,
+        insert_default=uuid7,
+        server_default=text("gen_random_uuid()"),
+    )
+
+    # Name of a handler registered with `job_handler`.
+    kind: Mapped[str] = mapped_column(types.String(50), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_by_id: Mapped[UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(JobStatus), nullable=False, default=JobStatus.PENDING
+    )
+    # Handler defined counters, e.g. number of deleted rows so far.
+    progress: Mapped[dict] = mapped_column(JSONB, nullable=False, default_factory=dict)
+    attempts: Mapped[int] = mapped_column(types.Integer(), nullable=False, default=0)
+    error: Mapped[str] = mapped_column(types.Text(), nullable=True, default=None)
+    # Lease of a running job; once expired (e.g. the worker died) the job is
+    # picked up again. For a pending job, it delays the next retry.
+    locked_until: Mapped[datetime] = mapped_column(nullable=True, default=None)
+    finished_at: Mapped[datetime] = mapped_column(nullable=True, default=None)
+
+    __table_args__ = (
+        Index(
+            "ix_jobs_unfinished_created_at",
+            "created_at",
+            postgresql_where=text("status IN ('PENDING', 'RUNNING')"),
+        ),
+    )
@@ -0,0 +1,3 @@
+# Import modules defining job handlers, so they are registered.
+import api.orgs.jobs  # noqa: F401
+import api.projects.jobs  # noqa: F401
@@ -0,0 +1,29 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Path, status
+from fastapi.routing import APIRouter
+
+from api.jobs.schemas import JobResponse
+from api.jobs.services import JobService
+from api.users.auth.dependencies import AuthenticatedUser
+
+router = APIRouter(prefix="", tags=["Jobs"])
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_job(
+    job_id: Annotated[UUID, Path()],
+    service: Annotated[JobService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Get status and progress of a background job. Note: user must be the one who started the job."""
+    job = await service.get_job(job_id)
+    if not job or job.created_by_id != user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    return job
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.config import settings
+from api.database.setup import AsyncSessionLocal
+from api.jobs import registry  # noqa: F401
+from api.jobs.enums import JobStatus
+from api.jobs.handlers import HANDLERS
+from api.jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """Process jobs stored in the `jobs` table, one bounded batch per transaction.
+
+    Jobs are claimed with `FOR UPDATE SKIP LOCKED`, so any number of workers
+    can run a runner. A claimed job holds a lease which is renewed after every
+    batch; if the worker dies, the lease expires and another runner (or the
+    same one after a restart) resumes the job from where it was left.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        poll_interval: float = settings.JOBS_POLL_INTERVAL_SECONDS,
+        batch_size: int = settings.JOBS_BATCH_SIZE,
+        lease_seconds: int = settings.JOBS_LEASE_SECONDS,
+        max_attempts: int = settings.JOBS_MAX_ATTEMPTS,
+    ) -> None:
+        self.session_maker = session_maker
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._work())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run_once(self) -> bool:
+        """Claim a single job and run it to the end.
+
+        Returns:
+            bool: False if there was no job to claim.
+        """
+        job = await self._claim()
+        if job is None:
+            return False
+
+        await self._run(job)
+        return True
+
+    async def run_until_idle(self) -> None:
+        while await self.run_once():
+            pass
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Failed to claim a job.")
+                processed = False
+
+            if not processed:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _claim(self) -> Job | None:
+        claimable_id = (
+            select(Job.id)
+            .where(
+                Job.status.in_((JobStatus.PENDING, JobStatus.RUNNING)),
+                or_(Job.locked_until.is_(None), Job.locked_until < func.now()),
+            )
+            .order_by(Job.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        query = (
+            update(Job)
+            .where(Job.id == claimable_id)
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                locked_until=func.now() + self.lease,
+            )
+            .returning(Job)
+        )
+
+        async with self.session_maker.begin() as ac:
+            return (await ac.execute(query)).scalars().one_or_none()
+
+    async def _run(self, job: Job) -> None:
+        logger.info(
+            "Running job.",
+            extra={"job_id": str(job.id), "kind": job.kind, "attempt": job.attempts},
+        )
+
+        try:
+            handler = HANDLERS.get(job.kind)
+            if handler is None:
+                raise LookupError(f"No handler is registered for {job.kind!r} jobs.")
+
+            done = False
+            while not done:
+                async with self.session_maker.begin() as ac:
+                    done = await handler(ac, job, self.batch_size)
+
+                    values = {"progress": job.progress}
+                    if done:
+                        values |= {
+                            "status": JobStatus.COMPLETED,
+                            "locked_until": None,
+                            "finished_at": func.now(),
+                        }
+                    else:
+                        values["locked_until"] = func.now() + self.lease
+
+                    await ac.execute(
+                        update(Job).where(Job.id == job.id).values(**values)
+                    )
+        except asyncio.CancelledError:
+            # Shutting down; let the next runner pick the job up right away
+            # instead of waiting for the lease to expire.
+            await self._release(job)
+            raise
+        except Exception as e:
+            logger.exception(
+                "Job failed.", extra={"job_id": str(job.id), "kind": job.kind}
+            )
+            await self._fail(job, e)
+            return
+
+        logger.info(
+            "Job completed.",
+            extra={"job_id": str(job.id), "kind": job.kind, "progress": job.progress},
+        )
+
+    async def _release(self, job: Job) -> None:
+        query = (
+            update(Job)
+            .where(Job.id == job.id, Job.status == JobStatus.RUNNING)
+            .values(
+                status=JobStatus.PENDING,
+                attempts=Job.attempts - 1,
+                locked_until=None,
+            )
+        )
+        async with self.session_maker.begin() as ac:
+            await ac.execute(query)
+
+    async def _fail(self, job: Job, error: Exception) -> None:
+        """Retry the job later, or give up once it ran out of attempts."""
+        values = {"error": str(error) or type(error).__name__}
+        if job.attempts >= self.max_attempts:
+            values |= {
+                "status": JobStatus.FAILED,
+                "locked_until": None,
+                "finished_at": func.now(),
+            }
+        else:
+            # Back off exponentially; a pending job is not claimed until then.
+            values |= {
+                "status": JobStatus.PENDING,
+                "locked_until": func.now() + timedelta(seconds=2**job.attempts),
+            }
+
+        async with self.session_maker.begin() as ac:
+            await ac.execute(update(Job).where(Job.id == job.id).values(**values))
+
+
+job_runner = JobRunner(AsyncSessionLocal)
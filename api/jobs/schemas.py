@@ -0,0 +1,20 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from api.jobs.enums import JobStatus
+
+
+class JobResponse(BaseModel):
+    id: UUID
+    kind: str
+    status: JobStatus
+    progress: dict
+    attempts: int
+    error: str | None
+    created_at: datetime
+    modified_at: datetime
+    finished_at: datetime | None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,19 @@
+from uuid import UUID
+
+from sqlalchemy import select
+
+from api.database.dependencies import AsyncSession
+from api.jobs.models import Job
+
+
+class JobService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_job(self, job_id: UUID) -> Job:
+        """Get single job with id."""
+        query = select(Job).where(Job.id == job_id)
+
+        async with self.session() as ac:
+            result = await ac.execute(query)
+            return result.scalars().one_or_none()
@@ -4,10 +4,18 @@ from asgi_correlation_id import CorrelationIdMiddleware
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from api.changes.routes import router as changes_router
 from api.config import settings
+from api.database.partitions import partition_scheduler
+from api.jobs.routes import router as jobs_router
+from api.jobs.runner import job_runner
 from api.logging import configure_logging
+from api.monitoring import event_loop_monitor
 from api.orgs.routes import router as orgs_router
+from api.profiling import ProfilingMiddleware
 from api.projects.routes import router as projects_router
+from api.search.routes import router as search_router
+from api.tasks.events import task_events
 from api.tasks.routes import router as tasks_router
 from api.users.routes import router as users_router
 
@@ -15,8 +23,31 @@ from api.users.routes import router as users_router
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     configure_logging()
+
+    partition_scheduler.start()
+
+    if settings.LOOP_MONITOR_ENABLED:
+        event_loop_monitor.start()
+
+    if settings.JOBS_ENABLED:
+        job_runner.start()
+
+    if settings.TASK_EVENTS_ENABLED:
+        task_events.start()
+
     yield
 
+    if settings.TASK_EVENTS_ENABLED:
+        await task_events.stop()
+
+    if settings.JOBS_ENABLED:
+        await job_runner.stop()
+
+    if settings.LOOP_MONITOR_ENABLED:
+        await event_loop_monitor.stop()
+
+    await partition_scheduler.stop()
+
 
 app = FastAPI(
     title=settings.APP_TITLE,
@@ -26,6 +57,8 @@ app = FastAPI(
     lifespan=lifespan,
     root_path="/api/v1",
 )
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ALLOW_ORIGINS,
@@ -40,3 +73,6 @@ app.include_router(users_router)
 app.include_router(orgs_router)
 app.include_router(projects_router)
 app.include_router(tasks_router)
+app.include_router(jobs_router)
+app.include_router(search_router)
+app.include_router(changes_router)
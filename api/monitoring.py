@@ -0,0 +1,152 @@
+import asyncio
+import bisect
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of lag histogram buckets; the last bucket is unbounded.
+LAG_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class EventLoopMonitor:
+    """Measure event loop lag and report what blocked the loop.
+
+    A coroutine sleeps for `interval` seconds over and over; the extra time it
+    takes to wake up is the loop lag, which is collected into a histogram and
+    reported periodically as a structured log record.
+
+    When `capture_stacks` is on, a watchdog thread notices when the loop has
+    not ticked for longer than `threshold` and logs the stack of the loop
+    thread *while it is still blocked*, which points at the blocking call
+    (e.g. password hashing or serializing a large response).
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        threshold: float,
+        report_interval: float,
+        capture_stacks: bool,
+    ) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.report_interval = report_interval
+        self.capture_stacks = capture_stacks
+
+        self.buckets = [0] * (len(LAG_BUCKETS) + 1)
+        self.samples = 0
+        self.max_lag = 0.0
+        self.blocked = 0
+        self.last_blocking_stack: str | None = None
+
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+
+        if self.capture_stacks:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="event-loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        if self._watchdog:
+            self._watchdog.join()
+
+    def stats(self) -> dict:
+        return {
+            "samples": self.samples,
+            "max_lag": self.max_lag,
+            "blocked": self.blocked,
+            "buckets": dict(
+                zip([*map(str, LAG_BUCKETS), "+Inf"], self.buckets, strict=True)
+            ),
+        }
+
+    def record(self, lag: float) -> None:
+        self.samples += 1
+        self.max_lag = max(self.max_lag, lag)
+        self.buckets[bisect.bisect_left(LAG_BUCKETS, lag)] += 1
+
+        if lag > self.threshold:
+            self.blocked += 1
+            logger.warning(
+                "Event loop was blocked.",
+                extra={"event_loop_lag": lag, "threshold": self.threshold},
+            )
+
+    def reset(self) -> None:
+        self.buckets = [0] * (len(LAG_BUCKETS) + 1)
+        self.samples = 0
+        self.max_lag = 0.0
+        self.blocked = 0
+
+    async def _measure(self) -> None:
+        last_report = time.monotonic()
+
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            self.record(max(now - expected, 0.0))
+
+            if now - last_report >= self.report_interval:
+                logger.info(
+                    "Event loop lag report.", extra={"event_loop": self.stats()}
+                )
+                self.reset()
+                last_report = now
+
+    def _watch(self) -> None:
+        captured_for = None
+
+        while not self._stopped.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+
+            # Capture a single sample per stall.
+            if stalled <= self.threshold or captured_for == heartbeat:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+
+            captured_for = heartbeat
+            self.last_blocking_stack = "".join(traceback.format_stack(frame))
+            logger.warning(
+                "Event loop is blocked, sampled stack of the loop thread.",
+                extra={"event_loop_lag": stalled, "stack": self.last_blocking_stack},
+            )
+
+
+event_loop_monitor = EventLoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+    threshold=settings.LOOP_MONITOR_THRESHOLD_SECONDS,
+    report_interval=settings.LOOP_MONITOR_REPORT_INTERVAL_SECONDS,
+    capture_stacks=settings.DEBUG or settings.LOOP_MONITOR_CAPTURE_STACKS,
+)
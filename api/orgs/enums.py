@@ -0,0 +1,8 @@
+import enum
+
+
+class OrganizationInvitationOutcome(enum.Enum):
+    INVITED = "invited"
+    ALREADY_MEMBER = "already_member"
+    ALREADY_INVITED = "already_invited"
+    USER_NOT_FOUND = "user_not_found"
@@ -0,0 +1,65 @@
+"""Remove answered and expired organization invitations.
+
+Answered invitations have done their job once the membership exists (or was
+declined), and pending ones expire after `ORGANIZATION_INVITATION_EXPIRY_DAYS`.
+Removing both keeps the table, and its index on pending invitations, as small
+as the number of invitations waiting for an answer; removed users can be
+invited again. Run it periodically (e.g. from a cron job).
+
+Usage:
+    python -m api.orgs.invitations [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import delete, not_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import settings
+from api.database.setup import AsyncSessionLocal
+from api.orgs.models import PENDING_INVITATION, OrganizationInvitation
+
+
+async def prune(ac: AsyncSession, batch_size: int) -> int:
+    """Remove a batch of answered or expired invitations.
+
+    Returns:
+        int: Number of removed invitations.
+    """
+    invitation = OrganizationInvitation
+    expired = (
+        select(invitation.organization_id, invitation.user_id)
+        .where(not_(PENDING_INVITATION))
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    result = await ac.execute(
+        delete(invitation).where(
+            tuple_(invitation.organization_id, invitation.user_id).in_(expired)
+        )
+    )
+    return result.rowcount
+
+
+async def run(batch_size: int) -> int:
+    removed = 0
+    while True:
+        async with AsyncSessionLocal.begin() as ac:
+            count = await prune(ac, batch_size)
+        removed += count
+        if count < batch_size:
+            return removed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=settings.JOBS_BATCH_SIZE)
+    args = parser.parse_args()
+
+    removed = asyncio.run(run(args.batch_size))
+    print(f"Removed {removed} invitation(s).")
+
+
+if __name__ == "__main__":
+    main()
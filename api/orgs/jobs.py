@@ -0,0 +1,54 @@
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.jobs.handlers import job_handler
+from api.jobs.models import Job
+from api.orgs.models import Organization, OrganizationInvitation, OrganizationMembership
+from api.projects.jobs import delete_project_batch
+from api.projects.models import Project
+
+DELETE_ORGANIZATION = "delete_organization"
+
+
+@job_handler(DELETE_ORGANIZATION)
+async def delete_organization(ac: AsyncSession, job: Job, batch_size: int) -> bool:
+    """Delete projects (along with their tasks), memberships and invitations of
+    the organization batch by batch, then the organization itself."""
+    organization_id = UUID(job.payload["organization_id"])
+    progress = job.progress
+
+    project_id = (
+        await ac.execute(
+            select(Project.id)
+            .where(Project.organization_id == organization_id)
+            .limit(1)
+        )
+    ).scalar()
+    if project_id:
+        tasks, project_deleted = await delete_project_batch(ac, project_id, batch_size)
+        progress["tasks"] = progress.get("tasks", 0) + tasks
+        progress["projects"] = progress.get("projects", 0) + project_deleted
+        return False
+
+    for model, key in (
+        (OrganizationMembership, "memberships"),
+        (OrganizationInvitation, "invitations"),
+    ):
+        user_ids = (
+            select(model.user_id)
+            .where(model.organization_id == organization_id)
+            .limit(batch_size)
+        )
+        result = await ac.execute(
+            delete(model).where(
+                model.organization_id == organization_id, model.user_id.in_(user_ids)
+            )
+        )
+        if result.rowcount:
+            progress[key] = progress.get(key, 0) + result.rowcount
+            return False
+
+    await ac.execute(delete(Organization).where(Organization.id == organization_id))
+    return True
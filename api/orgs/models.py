@@ -1,9 +1,20 @@
+from datetime import datetime, timedelta
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, PrimaryKeyConstraint, text, types
+from sqlalchemy import (
+    ForeignKey,
+    Index,
+    PrimaryKeyConstraint,
+    and_,
+    func,
+    text,
+    types,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
+from api.config import settings
 from api.database.models import BaseDatabaseModel, TimestampedModelMixin
+from api.utils.ids import uuid7
 
 
 class Organization(BaseDatabaseModel, TimestampedModelMixin):
@@ -15,6 +26,7 @@ class Organization(BaseDatabaseModel, TimestampedModelMixin):
         types.Uuid,
         primary_key=True,
         init=False,
+        insert_default=uuid7,
         server_default=text("gen_random_uuid()"),
     )
 
@@ -23,6 +35,10 @@ class Organization(BaseDatabaseModel, TimestampedModelMixin):
     )
     name: Mapped[str] = mapped_column(types.String(75), nullable=False)
     description: Mapped[str] = mapped_column(types.String(255), nullable=True)
+    # Set when deletion is requested; the organization is removed by a job.
+    deleted_at: Mapped[datetime] = mapped_column(
+        nullable=True, init=False, default=None
+    )
 
     # TODO: add logo field
 
@@ -61,4 +77,23 @@ class OrganizationInvitation(BaseDatabaseModel, TimestampedModelMixin):
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
 
-    __table_args__ = (PrimaryKeyConstraint("organization_id", "user_id"),)
+    __table_args__ = (
+        PrimaryKeyConstraint("organization_id", "user_id"),
+        # Pending invitations of a user, newest first. Answered and expired ones
+        # are removed by `api.orgs.invitations`, so it stays small.
+        Index(
+            "ix_organization_invitations_pending_user_id_created_at",
+            "user_id",
+            "created_at",
+            postgresql_where=text("accepted IS NULL"),
+        ),
+    )
+
+
+# Invitations not answered yet which haven't expired. Must match the partial
+# index on pending invitations.
+PENDING_INVITATION = and_(
+    OrganizationInvitation.accepted.is_(None),
+    OrganizationInvitation.created_at
+    > func.now() - timedelta(days=settings.ORGANIZATION_INVITATION_EXPIRY_DAYS),
+)
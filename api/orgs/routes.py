@@ -4,18 +4,24 @@ from uuid import UUID
 from fastapi import Body, Depends, HTTPException, Path, Query, status
 from fastapi.routing import APIRouter
 
+from api.jobs.schemas import JobResponse
 from api.orgs.models import Organization
 from api.orgs.permissions import OrganizationPermissionService
 from api.orgs.schemas import (
+    OrganizationBulkInvitationRequest,
+    OrganizationBulkInvitationResponse,
     OrganizationCreateRequest,
     OrganizationInvitationResponse,
     OrganizationInvitationSetStatusRequest,
+    OrganizationMemberParams,
     OrganizationMemberResponse,
     OrganizationPartialUpdateRequest,
     OrganizationResponse,
     OrganizationSendInvitationRequest,
+    OrganizationWorkloadResponse,
 )
 from api.orgs.services import OrganizationService
+from api.orgs.workload import OrganizationWorkloadService
 from api.users.auth.dependencies import AuthenticatedUser
 from api.users.services import UserService
 from api.utils.pagination import PaginatedResponse, PaginationParams
@@ -73,6 +79,9 @@ async def get_organization(
 ):
     """Get an organization by id. Note: user must be a member of the organization or the manager."""
     organization = await organization_service.get_organization(organization_id)
+    if not organization:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
     await check_permission(
         permission_service.is_organization_member_or_manager,
         organization=organization,
@@ -111,7 +120,9 @@ async def update_organization(
 
 
 @router.delete(
-    "/organizations/{organization_id}", status_code=status.HTTP_204_NO_CONTENT
+    "/organizations/{organization_id}",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
 )
 async def delete_organization(
     organization_id: Annotated[UUID, Path()],
@@ -119,7 +130,8 @@ async def delete_organization(
     permission_service: Annotated[OrganizationPermissionService, Depends()],
     user: AuthenticatedUser,
 ):
-    """Delete an organization by id. This action removes all memberships and invitations. Note: user must be the manager."""
+    """Delete an organization by id. This action removes all projects, memberships and invitations.
+    The organization is hidden right away and removed by the returned job. Note: user must be the manager."""
     organization = await service.get_organization(organization_id)
     if not organization:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
@@ -128,7 +140,7 @@ async def delete_organization(
         permission_service.is_organization_manager, organization=organization, user=user
     )
 
-    await service.delete_organization(organization.id)
+    return await service.delete_organization(organization.id, user.id)
 
 
 @router.get(
@@ -137,29 +149,56 @@ async def delete_organization(
     status_code=status.HTTP_200_OK,
 )
 async def get_organization_members(
-    pagination_params: Annotated[PaginationParams, Query()],
+    params: Annotated[OrganizationMemberParams, Query()],
     organization_id: Annotated[UUID, Path()],
     permission_service: Annotated[OrganizationPermissionService, Depends()],
     service: Annotated[OrganizationService, Depends()],
     user: AuthenticatedUser,
 ):
+    """Get members by name, optionally searching their names and email with `q`.
+    Note: inactive members are listed to the manager only."""
     organization = await service.get_organization(organization_id)
     if not organization:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
-    if permission_service.is_organization_manager(organization=organization, user=user):
-        return await service.get_organization_members(
-            organization.id, pagination_params
-        )
+    if await permission_service.is_organization_manager(
+        organization=organization, user=user
+    ):
+        return await service.get_organization_members(organization.id, params)
 
     await check_permission(
         permission_service.is_organization_member, organization=organization, user=user
     )
 
     return await service.get_organization_members(
-        organization.id, pagination_params, is_active=True
+        organization.id, params, is_active=True
+    )
+
+
+@router.get(
+    "/organizations/{organization_id}/workload",
+    response_model=OrganizationWorkloadResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_organization_workload(
+    organization_id: Annotated[UUID, Path()],
+    permission_service: Annotated[OrganizationPermissionService, Depends()],
+    service: Annotated[OrganizationService, Depends()],
+    workload_service: Annotated[OrganizationWorkloadService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Get open tasks assigned to each active member, per priority and overdue.
+    Note: user must be the manager."""
+    organization = await service.get_organization(organization_id)
+    if not organization:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    await check_permission(
+        permission_service.is_organization_manager, organization=organization, user=user
     )
 
+    return await workload_service.get_workload(organization.id)
+
 
 @router.post(
     "/organizations/{organization_id}/members/{member_id}/activate",
@@ -256,6 +295,33 @@ async def invite_to_organization(
     )
 
 
+@router.post(
+    "/organizations/{organization_id}/invitations:bulk",
+    response_model=OrganizationBulkInvitationResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def bulk_invite_to_organization(
+    body: Annotated[OrganizationBulkInvitationRequest, Body()],
+    organization_id: Annotated[UUID, Path()],
+    organization_service: Annotated[OrganizationService, Depends()],
+    permission_service: Annotated[OrganizationPermissionService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Invite existing users to current organization with their emails, reporting
+    the outcome of each email. Note: inviter must be the manager."""
+    organization = await organization_service.get_organization(organization_id)
+    if not organization:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    await check_permission(
+        permission_service.is_organization_manager, organization=organization, user=user
+    )
+
+    return await organization_service.invite_users_to_organization(
+        organization.id, body.emails
+    )
+
+
 @router.get(
     "/users/me/organizations/invitations",
     status_code=status.HTTP_200_OK,
@@ -281,11 +347,5 @@ async def set_invitation_status(
     service: Annotated[OrganizationService, Depends()],
 ):
     """Accept or reject invitation for the organization. This action is not reservable. Note: user must be the invited."""
-    invitation = await service.get_user_pending_invitation_with_organization_id(
-        user.id, organization_id
-    )
-
-    if not invitation:
+    if not await service.set_invitation_status(user.id, organization_id, body.accepted):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
-
-    await service.set_invitation_status(invitation, body.accepted)
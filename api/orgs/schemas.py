@@ -3,7 +3,11 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
+from api.orgs.enums import OrganizationInvitationOutcome
 from api.users.schemas import User
+from api.utils.pagination import PaginationParams
+
+MAX_BULK_INVITATIONS = 5000
 
 
 class OrganizationCreateRequest(BaseModel):
@@ -31,11 +35,26 @@ class OrganizationSendInvitationRequest(BaseModel):
     email: EmailStr
 
 
+class OrganizationBulkInvitationRequest(BaseModel):
+    emails: list[EmailStr] = Field(min_length=1, max_length=MAX_BULK_INVITATIONS)
+
+
+class OrganizationBulkInvitationResult(BaseModel):
+    email: str
+    outcome: OrganizationInvitationOutcome
+    user_id: UUID | None
+
+
+class OrganizationBulkInvitationResponse(BaseModel):
+    # One result per distinct email (case-insensitive), in request order.
+    results: list[OrganizationBulkInvitationResult]
+
+
 class OrganizationInvitationResponse(BaseModel):
     class InvitorDetail(BaseModel):
         first_name: str
         last_name: str
-        display_name: str
+        display_name: str | None
         email: str
         model_config = ConfigDict(from_attributes=True)
 
@@ -59,6 +78,11 @@ class OrganizationInvitationSetStatusRequest(BaseModel):
     accepted: bool
 
 
+class OrganizationMemberParams(PaginationParams):
+    # Words contained in names or email of members.
+    q: str | None = Field(None, min_length=1, max_length=255)
+
+
 class OrganizationMemberResponse(User):
     class ResponseMetadata(BaseModel):
         is_active: bool
@@ -68,3 +92,26 @@ class OrganizationMemberResponse(User):
     metadata: ResponseMetadata
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class OrganizationMemberWorkload(BaseModel):
+    class MemberDetail(BaseModel):
+        id: UUID
+        first_name: str
+        last_name: str
+        display_name: str | None
+        email: str
+        model_config = ConfigDict(from_attributes=True)
+
+    user: MemberDetail
+    # Open tasks assigned to the member in projects of the organization.
+    open: int
+    # Open tasks per priority; every priority is present.
+    priorities: dict[int, int]
+    # Open tasks past their deadline.
+    overdue: int
+
+
+class OrganizationWorkloadResponse(BaseModel):
+    # Active members, most open tasks first.
+    members: list[OrganizationMemberWorkload]
@@ -1,19 +1,61 @@
+import math
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, delete, exists, or_, select, update
+from sqlalchemy import (
+    String,
+    Uuid,
+    and_,
+    any_,
+    cast,
+    exists,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, Insert, insert
 
 from api.database.dependencies import AsyncSession
-from api.orgs.models import Organization, OrganizationInvitation, OrganizationMembership
+from api.jobs.models import Job
+from api.orgs.enums import OrganizationInvitationOutcome
+from api.orgs.jobs import DELETE_ORGANIZATION
+from api.orgs.models import (
+    PENDING_INVITATION,
+    Organization,
+    OrganizationInvitation,
+    OrganizationMembership,
+)
 from api.orgs.schemas import (
+    OrganizationBulkInvitationResponse,
+    OrganizationBulkInvitationResult,
     OrganizationInvitationResponse,
+    OrganizationMemberParams,
     OrganizationMemberResponse,
     OrganizationResponse,
 )
+from api.orgs.workload import workload_cache
+from api.projects.models import Project
+from api.search.utils import contains_words
 from api.users.models import User
 from api.utils.pagination import PaginatedResponse, PaginationParams, paginate
 
 
+def renew_invitations(statement: Insert) -> Insert:
+    """Turn answered or expired invitations hit by an insert into new pending
+    ones, leaving pending invitations alone."""
+    return statement.on_conflict_do_update(
+        index_elements=[
+            OrganizationInvitation.organization_id,
+            OrganizationInvitation.user_id,
+        ],
+        set_={"accepted": None, "created_at": func.now(), "modified_at": func.now()},
+        where=~PENDING_INVITATION,
+    )
+
+
 class OrganizationService:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -34,7 +76,8 @@ class OrganizationService:
                 or_(
                     Organization.manager_id == user_id,
                     OrganizationMembership.user_id == user_id,
-                )
+                ),
+                Organization.deleted_at.is_(None),
             )
             .select_from(Organization)
             .distinct()
@@ -43,7 +86,9 @@ class OrganizationService:
 
     async def get_organization(self, organization_id: UUID) -> Organization:
         """Get single organization with id."""
-        query = select(Organization).where(Organization.id == organization_id)
+        query = select(Organization).where(
+            Organization.id == organization_id, Organization.deleted_at.is_(None)
+        )
 
         async with self.session() as ac:
             instance = await ac.execute(query)
@@ -52,52 +97,80 @@ class OrganizationService:
     async def get_organization_members(
         self,
         organization_id: UUID,
-        pagination_param: PaginationParams,
+        params: OrganizationMemberParams,
         is_active: bool | None = None,
     ) -> PaginatedResponse[OrganizationMemberResponse]:
-        organization_manager_id_query = select(Organization.manager_id).where(
-            Organization.id == organization_id
-        )
-
-        async with self.session() as ac:
-            organization_manager_id = (
-                await ac.execute(organization_manager_id_query)
-            ).scalar()
-
-        members_query = (
-            select(OrganizationMembership, User)
-            .select_from(OrganizationMembership)
-            .outerjoin(
-                User,
-                User.id == OrganizationMembership.user_id,
-            )
-            .where(
-                OrganizationMembership.organization_id == organization_id,
+        """Members of an organization by name, optionally matching `params.q`,
+        in a single statement along with their total."""
+        membership = OrganizationMembership
+        query = (
+            select(
+                User.id,
+                User.email,
+                User.first_name,
+                User.last_name,
+                User.display_name,
+                User.created_at,
+                User.modified_at,
+                membership.is_active,
+                (Organization.manager_id == User.id).label("is_manager"),
+                func.count().over().label("total"),
             )
+            .select_from(membership)
+            .join(User, User.id == membership.user_id)
+            .join(Organization, Organization.id == membership.organization_id)
+            .where(membership.organization_id == organization_id)
+            .order_by(User.first_name, User.last_name, User.id)
+            .limit(params.page_size)
+            .offset((params.page - 1) * params.page_size)
         )
-
-        if is_active:
-            members_query = members_query.where(
-                OrganizationMembership.is_active == is_active
+        if is_active is not None:
+            query = query.where(membership.is_active.is_(is_active))
+        if params.q:
+            query = query.where(
+                contains_words(
+                    params.q,
+                    User.first_name,
+                    User.last_name,
+                    User.display_name,
+                    User.email,
+                )
             )
 
-        users = []
-
-        paginated_data = await paginate(
-            members_query, self.session, pagination_param, serialize_items=False
-        )
+        async with self.session() as ac:
+            rows = (await ac.execute(query)).all()
+            total = rows[0].total if rows else 0
+
+            # Past the last page no rows (nor total) come back, so whether
+            # there are any members at all takes counting them separately.
+            if not rows and params.page > 1:
+                total = await ac.scalar(
+                    query.with_only_columns(func.count())
+                    .order_by(None)
+                    .limit(None)
+                    .offset(None)
+                )
 
-        for item in paginated_data["items"]:
-            user = item[1]
-            user.metadata = OrganizationMemberResponse.ResponseMetadata(
-                is_active=item[0].is_active,
-                is_manager=user.id == organization_manager_id,
+        if total and params.page > math.ceil(total / params.page_size):
+            raise HTTPException(
+                detail="Invalid page.", status_code=status.HTTP_400_BAD_REQUEST
             )
-            users.append(user)
 
-        paginated_data["items"] = users
-
-        return paginated_data
+        return PaginatedResponse[OrganizationMemberResponse](
+            total_pages=math.ceil(total / params.page_size),
+            current_page=params.page,
+            count=len(rows),
+            page_size=params.page_size,
+            items=[
+                OrganizationMemberResponse(
+                    **row._mapping,
+                    metadata=OrganizationMemberResponse.ResponseMetadata(
+                        is_active=row.is_active, is_manager=row.is_manager
+                    ),
+                )
+                for row in rows
+            ],
+        )
 
     async def create_organization(self, organization: Organization) -> Organization:
         """Create organization for given user."""
@@ -118,12 +191,37 @@ class OrganizationService:
 
         return organization
 
-    async def delete_organization(self, organization_id: UUID) -> None:
-        """Delete given organization."""
-        query = delete(Organization).where(Organization.id == organization_id)
+    async def delete_organization(self, organization_id: UUID, user_id: UUID) -> Job:
+        """Mark given organization and its projects as deleted and create a job
+        removing them along with everything that belongs to them."""
+        organization_query = (
+            update(Organization)
+            .where(Organization.id == organization_id)
+            .values(deleted_at=func.now())
+        )
+        projects_query = (
+            update(Project)
+            .where(
+                Project.organization_id == organization_id,
+                Project.deleted_at.is_(None),
+            )
+            .values(deleted_at=func.now())
+        )
+
         async with self.session.begin() as ac:
-            await ac.execute(query)
+            await ac.execute(organization_query)
+            await ac.execute(projects_query)
+
+            job = Job(
+                kind=DELETE_ORGANIZATION,
+                payload={"organization_id": str(organization_id)},
+                created_by_id=user_id,
+            )
+            ac.add(job)
             await ac.flush()
+            await ac.refresh(job)
+
+        return job
 
     async def get_membership(
         self, organization_id: UUID, user_id: UUID
@@ -151,14 +249,11 @@ class OrganizationService:
             )
             .select()
         )
-        invitation_exists_query = (
-            exists(OrganizationInvitation)
-            .where(
-                OrganizationInvitation.organization_id == organization_id,
-                OrganizationInvitation.user_id == user_id,
+        invitation_query = renew_invitations(
+            insert(OrganizationInvitation).values(
+                organization_id=organization_id, user_id=user_id, accepted=None
             )
-            .select()
-        )
+        ).returning(OrganizationInvitation)
 
         async with self.session.begin() as ac:
             membership_result = await ac.execute(membership_exists_query)
@@ -170,41 +265,113 @@ class OrganizationService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                 )
 
-            invitation_result = await ac.execute(invitation_exists_query)
-            invitation_exists = invitation_result.scalar()
+            invitation = await ac.scalar(invitation_query)
 
-            if invitation_exists:
+            if invitation is None:
                 raise HTTPException(
                     detail="User is already invited.",
                     status_code=status.HTTP_400_BAD_REQUEST,
                 )
 
-            invitation = OrganizationInvitation(
-                organization_id=organization_id, user_id=user_id, accepted=None
-            )
+        return invitation
 
-            ac.add(invitation)
-            await ac.flush()
-            await ac.refresh(invitation)
+    async def invite_users_to_organization(
+        self, organization_id: UUID, emails: list[str]
+    ) -> OrganizationBulkInvitationResponse:
+        """Invite users with given emails to an organization in a single
+        statement, skipping members and users with a pending invitation."""
+        emails = list(dict.fromkeys(email.lower() for email in emails))
+
+        membership, invitation = OrganizationMembership, OrganizationInvitation
+        lower_email = func.lower(User.email)
+        candidates = (
+            select(
+                User.id.label("user_id"),
+                lower_email.label("email"),
+                membership.user_id.is_not(None).label("is_member"),
+                and_(invitation.user_id.is_not(None), PENDING_INVITATION).label(
+                    "is_invited"
+                ),
+            )
+            .outerjoin(
+                membership,
+                and_(
+                    membership.organization_id == organization_id,
+                    membership.user_id == User.id,
+                ),
+            )
+            .outerjoin(
+                invitation,
+                and_(
+                    invitation.organization_id == organization_id,
+                    invitation.user_id == User.id,
+                ),
+            )
+            .where(lower_email == any_(cast(emails, ARRAY(String))))
+            .cte("candidates")
+        )
+        # Invitations created concurrently since are left alone by the conflict
+        # clause and reported as already invited; answered and expired ones
+        # are renewed.
+        inserted = (
+            renew_invitations(
+                insert(invitation).from_select(
+                    ["organization_id", "user_id", "accepted"],
+                    select(
+                        literal(organization_id, Uuid), candidates.c.user_id, null()
+                    ).where(~candidates.c.is_member, ~candidates.c.is_invited),
+                )
+            )
+            .returning(invitation.user_id)
+            .cte("inserted")
+        )
+        query = select(
+            candidates.c.email,
+            candidates.c.user_id,
+            candidates.c.is_member,
+            inserted.c.user_id.is_not(None),
+        ).outerjoin(inserted, inserted.c.user_id == candidates.c.user_id)
 
-        return invitation
+        async with self.session.begin() as ac:
+            rows = (await ac.execute(query)).all()
+
+        found: dict[str, tuple[UUID | None, OrganizationInvitationOutcome]] = {}
+        for user_email, user_id, is_member, is_invited in rows:
+            if is_member:
+                outcome = OrganizationInvitationOutcome.ALREADY_MEMBER
+            elif is_invited:
+                outcome = OrganizationInvitationOutcome.INVITED
+            else:
+                outcome = OrganizationInvitationOutcome.ALREADY_INVITED
+            found.setdefault(user_email, (user_id, outcome))
+
+        results = []
+        for email in emails:
+            user_id, outcome = found.get(
+                email, (None, OrganizationInvitationOutcome.USER_NOT_FOUND)
+            )
+            results.append(
+                OrganizationBulkInvitationResult(
+                    email=email, user_id=user_id, outcome=outcome
+                )
+            )
+        return OrganizationBulkInvitationResponse(results=results)
 
     async def get_user_invitations(
         self, user_id: UUID, pagination_params: PaginationParams
     ) -> PaginatedResponse[OrganizationInvitationResponse]:
-        """Get user's all invitations."""
+        """Get user's pending invitations, newest first."""
 
         query = (
             select(OrganizationInvitation, Organization, User)
             .select_from(OrganizationInvitation)
-            .where(
-                OrganizationInvitation.user_id == user_id,
-                OrganizationInvitation.accepted == None,  # noqa: E711
-            )
+            .where(OrganizationInvitation.user_id == user_id, PENDING_INVITATION)
             .join(
                 Organization, OrganizationInvitation.organization_id == Organization.id
             )
             .join(User, Organization.manager_id == User.id)
+            .where(Organization.deleted_at.is_(None))
+            .order_by(OrganizationInvitation.created_at.desc())
         )
 
         paginated_data = await paginate(
@@ -228,22 +395,6 @@ class OrganizationService:
 
         return paginated_data
 
-    async def get_user_pending_invitation_with_organization_id(
-        self, user_id: UUID, organization_id: UUID
-    ) -> OrganizationInvitation:
-        """Get single PENDING (accepted=null) invitation for given user and organization."""
-        query = select(OrganizationInvitation).where(
-            and_(
-                OrganizationInvitation.user_id == user_id,
-                OrganizationInvitation.organization_id == organization_id,
-                OrganizationInvitation.accepted == None,  # noqa: E711
-            )
-        )
-
-        async with self.session() as ac:
-            instance = await ac.execute(query)
-            return instance.scalars().one_or_none()
-
     async def add_member_to_organization(
         self, organization_id: UUID, user_id: UUID
     ) -> OrganizationMembership:
@@ -278,22 +429,57 @@ class OrganizationService:
             await ac.flush()
             await ac.refresh(membership)
 
+        workload_cache.invalidate(organization_id)
         return membership
 
     async def set_invitation_status(
-        self, invitation: OrganizationInvitation, accepted: bool
-    ) -> None:
-        """Accept or reject an invitation. If accepted, create the corresponding membership record."""
+        self, user_id: UUID, organization_id: UUID, accepted: bool
+    ) -> bool:
+        """Accept or reject a pending invitation of a user and, if accepted,
+        create the membership, in a single statement.
+
+        Answering an invitation again the same way changes nothing, so retried
+        and concurrent accepts succeed without creating a second membership.
+
+        Returns:
+            bool: False if the user has no such invitation to answer.
+        """
+        invitation, membership = OrganizationInvitation, OrganizationMembership
+        answered = (
+            update(invitation)
+            .where(
+                invitation.user_id == user_id,
+                invitation.organization_id == organization_id,
+                or_(PENDING_INVITATION, invitation.accepted == accepted),
+                exists().where(
+                    Organization.id == organization_id,
+                    Organization.deleted_at.is_(None),
+                ),
+            )
+            .values(accepted=accepted)
+            .returning(invitation.organization_id, invitation.user_id)
+            .cte("answered")
+        )
+        joined = (
+            insert(membership)
+            .from_select(
+                ["organization_id", "user_id", "is_active"],
+                select(
+                    answered.c.organization_id, answered.c.user_id, literal(True)
+                ).where(literal(accepted)),
+            )
+            .on_conflict_do_nothing()
+            .returning(membership.user_id)
+            .cte("joined")
+        )
+        query = select(exists(answered.select()), exists(joined.select()))
+
         async with self.session.begin() as ac:
-            invitation.accepted = accepted
-            ac.add(invitation)
-            await ac.flush()
-            await ac.refresh(invitation)
+            found, joined_now = (await ac.execute(query)).one()
 
-            if invitation.accepted:
-                await self.add_member_to_organization(
-                    invitation.organization_id, invitation.user_id
-                )
+        if joined_now:
+            workload_cache.invalidate(organization_id)
+        return found
 
     async def activate_organization_member(
         self, organization_id: UUID, member_id: UUID
@@ -312,6 +498,8 @@ class OrganizationService:
             await ac.execute(query)
             await ac.flush()
 
+        workload_cache.invalidate(organization_id)
+
     async def deactivate_organization_member(
         self, organization_id: UUID, member_id: UUID
     ) -> None:
@@ -328,3 +516,5 @@ class OrganizationService:
         async with self.session.begin() as ac:
             await ac.execute(query)
             await ac.flush()
+
+        workload_cache.invalidate(organization_id)
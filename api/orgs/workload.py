@@ -0,0 +1,131 @@
+from uuid import UUID
+
+from sqlalchemy import func, select
+
+from api.config import settings
+from api.database.dependencies import AsyncSession
+from api.orgs.models import OrganizationMembership
+from api.orgs.schemas import OrganizationMemberWorkload, OrganizationWorkloadResponse
+from api.projects.models import Project
+from api.tasks.analytics import ProjectCache
+from api.tasks.enums import TASK_PRIORITIES
+from api.tasks.models import OPEN_TASK, Task, TaskAssignee
+from api.users.models import User
+
+# Keyed by organization id. Workloads are cached along with the ids of their
+# organization's projects, for task changes to find them by project.
+workload_cache = ProjectCache(
+    ttl=settings.ORGANIZATION_WORKLOAD_CACHE_TTL_SECONDS,
+    max_projects=settings.ORGANIZATION_WORKLOAD_CACHE_MAX_ORGANIZATIONS,
+)
+
+
+def invalidate_workload(project_id: UUID) -> None:
+    """Drop the cached workload of the organization owning a project whose
+    tasks or assignees changed in this process."""
+    workload_cache.invalidate_where("workload", lambda cached: project_id in cached[0])
+
+
+class OrganizationWorkloadService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_workload(self, organization_id: UUID) -> OrganizationWorkloadResponse:
+        """Open tasks assigned to each active member of an organization, per
+        priority and overdue. Results are cached in `workload_cache`."""
+        cached = workload_cache.get(organization_id, "workload")
+        if cached is not None:
+            return cached[1]
+
+        # Open tasks of the organization's projects, counted per assignee.
+        counts = (
+            select(
+                TaskAssignee.user_id,
+                func.count().label("open"),
+                *(
+                    func.count()
+                    .filter(Task.priority == priority)
+                    .label(f"priority_{priority}")
+                    for priority in TASK_PRIORITIES
+                ),
+                func.count()
+                .filter(Task.deadline < func.current_date())
+                .label("overdue"),
+            )
+            .select_from(Project)
+            .join(Task, Task.project_id == Project.id)
+            .join(TaskAssignee, TaskAssignee.task_id == Task.id)
+            .where(
+                Project.organization_id == organization_id,
+                Project.deleted_at.is_(None),
+                OPEN_TASK,
+            )
+            .group_by(TaskAssignee.user_id)
+            .subquery("counts")
+        )
+        open_count = func.coalesce(counts.c.open, 0)
+        # Ids of the organization's projects, the same for every row (computed
+        # once), for the cached workload to be found by project.
+        project_ids = (
+            select(func.array_agg(Project.id))
+            .where(Project.organization_id == organization_id)
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                User.id,
+                User.first_name,
+                User.last_name,
+                User.display_name,
+                User.email,
+                open_count,
+                *(
+                    func.coalesce(counts.c[f"priority_{priority}"], 0)
+                    for priority in TASK_PRIORITIES
+                ),
+                func.coalesce(counts.c.overdue, 0),
+                project_ids,
+            )
+            .select_from(OrganizationMembership)
+            .join(User, User.id == OrganizationMembership.user_id)
+            .outerjoin(counts, counts.c.user_id == OrganizationMembership.user_id)
+            .where(
+                OrganizationMembership.organization_id == organization_id,
+                OrganizationMembership.is_active.is_(True),
+            )
+            .order_by(open_count.desc(), User.id)
+        )
+        async with self.session() as ac:
+            rows = (await ac.execute(query)).all()
+
+        result = OrganizationWorkloadResponse(
+            members=[
+                OrganizationMemberWorkload(
+                    user=OrganizationMemberWorkload.MemberDetail(
+                        id=user_id,
+                        first_name=first_name,
+                        last_name=last_name,
+                        display_name=display_name,
+                        email=email,
+                    ),
+                    open=open_tasks,
+                    priorities=dict(zip(TASK_PRIORITIES, by_priority, strict=True)),
+                    overdue=overdue,
+                )
+                for (
+                    user_id,
+                    first_name,
+                    last_name,
+                    display_name,
+                    email,
+                    open_tasks,
+                    *by_priority,
+                    overdue,
+                    _,
+                ) in rows
+            ]
+        )
+        # Without active members the workload is empty whatever the tasks.
+        cached_project_ids = frozenset(rows[0][-1] or ()) if rows else frozenset()
+        workload_cache.set(organization_id, "workload", (cached_project_ids, result))
+        return result
@@ -0,0 +1,119 @@
+import asyncio
+import cProfile
+import logging
+import os
+import random
+import time
+from uuid import uuid4
+
+from asgi_correlation_id import correlation_id
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from api.config import settings
+from api.users.services import AuthenticationService
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilingMiddleware:
+    """Run selected requests under cProfile and save stats keyed by correlation id.
+
+    A request is profiled when an admin (see `PROFILING_ADMIN_USER_IDS`) sends
+    `PROFILING_HEADER`, or when it is picked by `PROFILING_SAMPLE_RATE`.
+    Output is written to `LOGGING_FILE_DIR/PROFILING_DIR_NAME` as `.pstats`
+    files (open with `snakeviz`, or convert to a flamegraph with `flameprof`),
+    and the oldest files are removed to stay within
+    `PROFILING_MAX_FILES`/`PROFILING_MAX_BYTES`.
+
+    Since cProfile traces the whole thread, other requests served concurrently
+    on the event loop show up in the stats as well; only one request is
+    profiled at a time.
+
+    This middleware must be added before `CorrelationIdMiddleware` so the
+    correlation id is already set when a request reaches it.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.directory = os.path.join(
+            settings.LOGGING_FILE_DIR, settings.PROFILING_DIR_NAME
+        )
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active or not self._is_selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._active = True
+        profiler = cProfile.Profile()
+        started_at = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.disable()
+            self._active = False
+            elapsed = time.perf_counter() - started_at
+            await asyncio.to_thread(self._save, profiler, scope, elapsed)
+
+    def _is_selected(self, scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+
+        if settings.PROFILING_HEADER in headers:
+            return self._is_admin(headers)
+
+        return random.random() < settings.PROFILING_SAMPLE_RATE
+
+    def _is_admin(self, headers: Headers) -> bool:
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme != "Bearer" or not token:
+            return False
+
+        # Only the token signature is checked, the database is not hit.
+        user_id = AuthenticationService(None)._get_user_id_from_access_token(token)
+        return user_id is not None and user_id in settings.PROFILING_ADMIN_USER_IDS
+
+    def _save(self, profiler: cProfile.Profile, scope: Scope, elapsed: float) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        request_id = correlation_id.get() or uuid4().hex
+        filename = f"{time.strftime('%Y%m%dT%H%M%S')}-{request_id}"
+        path = os.path.join(self.directory, f"{filename}.pstats")
+        profiler.dump_stats(path)
+
+        logger.info(
+            "Request profile saved.",
+            extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "elapsed": elapsed,
+                "profile": path,
+            },
+        )
+
+        self._rotate()
+
+    def _rotate(self) -> None:
+        """Remove the oldest profiles until count and size are within quota."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".pstats"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+
+        while entries and (
+            len(entries) > settings.PROFILING_MAX_FILES
+            or total_bytes > settings.PROFILING_MAX_BYTES
+        ):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
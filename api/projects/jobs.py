@@ -0,0 +1,39 @@
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.jobs.handlers import job_handler
+from api.jobs.models import Job
+from api.projects.models import Project
+from api.tasks.models import Task
+
+DELETE_PROJECT = "delete_project"
+
+
+async def delete_project_batch(
+    ac: AsyncSession, project_id: UUID, batch_size: int
+) -> tuple[int, bool]:
+    """Delete up to `batch_size` tasks of given project, or the project itself
+    once it has no tasks left.
+
+    Returns:
+        tuple[int, bool]: Number of deleted tasks and whether the project was deleted.
+    """
+    task_ids = select(Task.id).where(Task.project_id == project_id).limit(batch_size)
+    # Task assignees are removed along with the tasks (ON DELETE CASCADE).
+    result = await ac.execute(delete(Task).where(Task.id.in_(task_ids)))
+    if result.rowcount:
+        return result.rowcount, False
+
+    await ac.execute(delete(Project).where(Project.id == project_id))
+    return 0, True
+
+
+@job_handler(DELETE_PROJECT)
+async def delete_project(ac: AsyncSession, job: Job, batch_size: int) -> bool:
+    tasks, done = await delete_project_batch(
+        ac, UUID(job.payload["project_id"]), batch_size
+    )
+    job.progress["tasks"] = job.progress.get("tasks", 0) + tasks
+    return done
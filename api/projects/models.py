@@ -1,17 +1,21 @@
-from datetime import date
+from datetime import date, datetime
 from uuid import UUID
 
 from sqlalchemy import (
     Enum,
     ForeignKey,
+    Index,
     PrimaryKeyConstraint,
     text,
     types,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from api.database.models import BaseDatabaseModel, TimestampedModelMixin
 from api.projects.enums import ProjectParticipationType
+from api.search.utils import search_vector
+from api.utils.ids import uuid7
 
 
 class Project(BaseDatabaseModel, TimestampedModelMixin):
@@ -21,6 +25,7 @@ class Project(BaseDatabaseModel, TimestampedModelMixin):
         types.Uuid,
         primary_key=True,
         init=False,
+        insert_default=uuid7,
         server_default=text("gen_random_uuid()"),
     )
 
@@ -38,6 +43,21 @@ class Project(BaseDatabaseModel, TimestampedModelMixin):
     organization_id: Mapped[UUID] = mapped_column(
         ForeignKey("organizations.id", ondelete="RESTRICT"), nullable=False
     )
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, search_vector("title", "description"), init=False, deferred=True
+    )
+    # Set when deletion is requested; the project is removed by a job.
+    deleted_at: Mapped[datetime] = mapped_column(
+        nullable=True, init=False, default=None
+    )
+
+    __table_args__ = (
+        Index("ix_projects_search_vector", "search_vector", postgresql_using="gin"),
+        # Backs the organization change feed.
+        Index(
+            "ix_projects_organization_id_modified_at", "organization_id", "modified_at"
+        ),
+    )
 
 
 class ProjectParticipant(BaseDatabaseModel, TimestampedModelMixin):
@@ -58,4 +78,12 @@ class ProjectParticipant(BaseDatabaseModel, TimestampedModelMixin):
         Enum(ProjectParticipationType), nullable=False
     )
 
-    __table_args__ = (PrimaryKeyConstraint("project_id", "user_id"),)
+    __table_args__ = (
+        PrimaryKeyConstraint("project_id", "user_id"),
+        # Backs the organization change feed.
+        Index(
+            "ix_project_participants_project_id_modified_at",
+            "project_id",
+            "modified_at",
+        ),
+    )
@@ -4,6 +4,7 @@ from uuid import UUID
 from fastapi import Depends, HTTPException, Path, status
 from fastapi.routing import APIRouter
 
+from api.jobs.schemas import JobResponse
 from api.orgs.permissions import OrganizationPermissionService
 from api.orgs.services import OrganizationService
 from api.projects.models import Project, ProjectParticipant
@@ -12,6 +13,8 @@ from api.projects.schemas import (
     ProjectCreateRequest,
     ProjectParticipantCreateRequest,
     ProjectParticipantResponse,
+    ProjectParticipantsReplaceRequest,
+    ProjectParticipantsUpdateRequest,
     ProjectParticipantUpdateRequest,
     ProjectResponse,
     ProjectUpdateRequest,
@@ -132,7 +135,8 @@ async def update_project(
 
 @router.delete(
     "/projects/{project_id}",
-    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
 )
 async def delete_project(
     organization_service: Annotated[OrganizationService, Depends()],
@@ -151,7 +155,8 @@ async def delete_project(
         organization=organization,
         user=user,
     )
-    await project_service.delete(project.id)
+
+    return await project_service.delete(project.id, user.id)
 
 
 @router.get(
@@ -213,6 +218,62 @@ async def create_project_participant(
     )
 
 
+@router.patch(
+    "/projects/{project_id}/participants",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def update_project_participants(
+    body: ProjectParticipantsUpdateRequest,
+    organization_service: Annotated[OrganizationService, Depends()],
+    project_id: Annotated[UUID, Path()],
+    project_service: Annotated[ProjectService, Depends()],
+    permission_service: Annotated[OrganizationPermissionService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Add, update and remove many participants at once. Added users must be
+    active members of the organization."""
+    project = await project_service.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    organization = await organization_service.get_organization(project.organization_id)
+    await check_permission(
+        permission_service.is_organization_manager,
+        organization=organization,
+        user=user,
+    )
+
+    await project_service.update_project_participants(project, body.add, body.remove)
+
+
+@router.put(
+    "/projects/{project_id}/participants",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def replace_project_participants(
+    body: ProjectParticipantsReplaceRequest,
+    organization_service: Annotated[OrganizationService, Depends()],
+    project_id: Annotated[UUID, Path()],
+    project_service: Annotated[ProjectService, Depends()],
+    permission_service: Annotated[OrganizationPermissionService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Replace all participants of a project atomically. Given users must be
+    active members of the organization."""
+    project = await project_service.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    organization = await organization_service.get_organization(project.organization_id)
+    await check_permission(
+        permission_service.is_organization_manager,
+        organization=organization,
+        user=user,
+    )
+
+    await project_service.replace_project_participants(project, body.participants)
+
+
 @router.put(
     "/projects/{project_id}/participants/{user_id}",
     response_model=ProjectParticipantResponse,
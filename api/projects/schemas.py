@@ -6,6 +6,8 @@ from pydantic import BaseModel, ConfigDict, Field, model_validator
 from api.projects.enums import ProjectParticipationType
 from api.users.schemas import UserResponse
 
+MAX_BULK_PARTICIPANTS = 1000
+
 
 class ProjectCreateRequest(BaseModel):
     title: str = Field(min_length=3, max_length=75)
@@ -51,6 +53,41 @@ class ProjectParticipantCreateRequest(BaseModel):
     user_id: UUID
 
 
+class ProjectParticipantsUpdateRequest(BaseModel):
+    # Participants to add, or to update the participation type of.
+    add: list[ProjectParticipantCreateRequest] = Field(
+        default=[], max_length=MAX_BULK_PARTICIPANTS
+    )
+    # Users to remove from participants.
+    remove: list[UUID] = Field(default=[], max_length=MAX_BULK_PARTICIPANTS)
+
+    @model_validator(mode="after")
+    def validate_users(self):
+        added = [p.user_id for p in self.add]
+        if len(set(added)) < len(added):
+            raise ValueError("Users must be added once.")
+
+        if set(added) & set(self.remove):
+            raise ValueError("Users can't be both added and removed.")
+
+        return self
+
+
+class ProjectParticipantsReplaceRequest(BaseModel):
+    # Every participant of the project; others are removed.
+    participants: list[ProjectParticipantCreateRequest] = Field(
+        max_length=MAX_BULK_PARTICIPANTS
+    )
+
+    @model_validator(mode="after")
+    def validate_users(self):
+        user_ids = [p.user_id for p in self.participants]
+        if len(set(user_ids)) < len(user_ids):
+            raise ValueError("Users must be given once.")
+
+        return self
+
+
 class ProjectParticipantUpdateRequest(BaseModel):
     participation_type: ProjectParticipationType
 
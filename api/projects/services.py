@@ -1,12 +1,23 @@
+from typing import Sequence
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import delete, exists, select
+from sqlalchemy import Uuid, all_, any_, cast, delete, exists, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 
+from api.changes.enums import ChangeType
+from api.changes.tombstones import record_deletion, record_deletions
 from api.database.dependencies import AsyncSession
-from api.orgs.models import Organization
+from api.jobs.models import Job
+from api.orgs.models import Organization, OrganizationMembership
+from api.orgs.workload import invalidate_workload, workload_cache
+from api.projects.jobs import DELETE_PROJECT
 from api.projects.models import Project, ProjectParticipant
-from api.projects.schemas import ProjectParticipantResponse, ProjectResponse
+from api.projects.schemas import (
+    ProjectParticipantCreateRequest,
+    ProjectParticipantResponse,
+    ProjectResponse,
+)
 from api.users.models import User
 from api.utils.pagination import PaginatedResponse, PaginationParams, paginate
 
@@ -20,13 +31,18 @@ class ProjectService:
     ) -> PaginatedResponse[ProjectResponse]:
         query = (
             select(Project)
-            .where(Project.organization_id == organization_id)
+            .where(
+                Project.organization_id == organization_id,
+                Project.deleted_at.is_(None),
+            )
             .order_by(Project.modified_at)
         )
         return await paginate(query, self.session, pagination_params)
 
     async def get_project(self, project_id: UUID) -> Project:
-        query = select(Project).where(Project.id == project_id)
+        query = select(Project).where(
+            Project.id == project_id, Project.deleted_at.is_(None)
+        )
 
         async with self.session() as ac:
             result = await ac.execute(query)
@@ -68,6 +84,7 @@ class ProjectService:
             .where(
                 ProjectParticipant.project_id == project_id,
                 ProjectParticipant.user_id == user_id,
+                Project.deleted_at.is_(None),
             )
         )
 
@@ -80,7 +97,10 @@ class ProjectService:
         async with self.session.begin() as ac:
             organization_exists_query = (
                 exists(Organization)
-                .where(Organization.id == project.organization_id)
+                .where(
+                    Organization.id == project.organization_id,
+                    Organization.deleted_at.is_(None),
+                )
                 .select()
             )
             organization_exists_result = await ac.execute(organization_exists_query)
@@ -95,7 +115,10 @@ class ProjectService:
             ac.add(project)
             await ac.flush()
             await ac.refresh(project)
-            return project
+
+        # Cached workloads only know projects existing when they were computed.
+        workload_cache.invalidate(project.organization_id)
+        return project
 
     async def create_project_participant(
         self, participant: ProjectParticipant
@@ -163,11 +186,37 @@ class ProjectService:
                 participation_type=participant.participation_type, user=user
             )
 
-    async def delete(self, project_id: UUID) -> None:
-        query = delete(Project).where(Project.id == project_id)
+    async def delete(self, project_id: UUID, user_id: UUID) -> Job:
+        """Mark given project as deleted and create a job removing it along with
+        its tasks."""
+        query = (
+            update(Project)
+            .where(Project.id == project_id)
+            .values(deleted_at=func.now())
+        )
+
         async with self.session.begin() as ac:
             await ac.execute(query)
+            await record_deletion(
+                ac,
+                ChangeType.PROJECT,
+                project_id,
+                select(Project.organization_id)
+                .where(Project.id == project_id)
+                .scalar_subquery(),
+            )
+
+            job = Job(
+                kind=DELETE_PROJECT,
+                payload={"project_id": str(project_id)},
+                created_by_id=user_id,
+            )
+            ac.add(job)
             await ac.flush()
+            await ac.refresh(job)
+
+        invalidate_workload(project_id)
+        return job
 
     async def get_project_participant(
         self, project_id: UUID, user_id: UUID
@@ -181,6 +230,101 @@ class ProjectService:
             result = await ac.execute(query)
             return result.scalars().one_or_none()
 
+    async def update_project_participants(
+        self,
+        project: Project,
+        added: Sequence[ProjectParticipantCreateRequest],
+        removed: Sequence[UUID],
+    ) -> None:
+        """Add, update and remove many participants of a project at once."""
+        await self._change_project_participants(
+            project,
+            added,
+            ProjectParticipant.user_id == any_(cast(removed, ARRAY(Uuid))),
+        )
+
+    async def replace_project_participants(
+        self, project: Project, participants: Sequence[ProjectParticipantCreateRequest]
+    ) -> None:
+        """Make given users the only participants of a project."""
+        user_ids = [participant.user_id for participant in participants]
+        await self._change_project_participants(
+            project,
+            participants,
+            ProjectParticipant.user_id != all_(cast(user_ids, ARRAY(Uuid))),
+        )
+
+    async def _change_project_participants(
+        self,
+        project: Project,
+        added: Sequence[ProjectParticipantCreateRequest],
+        removed_condition,
+    ) -> None:
+        """Upsert `added` participants of a project and remove those matching
+        `removed_condition`, with a fixed number of statements."""
+        user_ids = [participant.user_id for participant in added]
+        lock_query = (
+            select(Project.id)
+            .where(Project.id == project.id)
+            .with_for_update(key_share=True)
+        )
+        members_query = select(func.count()).where(
+            OrganizationMembership.organization_id == project.organization_id,
+            OrganizationMembership.user_id == any_(cast(user_ids, ARRAY(Uuid))),
+            OrganizationMembership.is_active.is_(True),
+        )
+
+        async with self.session.begin() as ac:
+            # Locking the project makes concurrent changes of its participants
+            # apply one after another.
+            await ac.execute(lock_query)
+
+            if added:
+                if (await ac.execute(members_query)).scalar() < len(user_ids):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Given users are not active members of the organization.",
+                    )
+
+                upsert = insert(ProjectParticipant).values(
+                    [
+                        {
+                            "project_id": project.id,
+                            "user_id": participant.user_id,
+                            "participation_type": participant.participation_type,
+                        }
+                        for participant in added
+                    ]
+                )
+                await ac.execute(
+                    upsert.on_conflict_do_update(
+                        index_elements=["project_id", "user_id"],
+                        set_={
+                            "participation_type": upsert.excluded.participation_type,
+                            "modified_at": func.current_timestamp(),
+                        },
+                        where=ProjectParticipant.participation_type
+                        != upsert.excluded.participation_type,
+                    )
+                )
+
+            deleted = (
+                await ac.scalars(
+                    delete(ProjectParticipant)
+                    .where(
+                        ProjectParticipant.project_id == project.id, removed_condition
+                    )
+                    .returning(ProjectParticipant.user_id)
+                )
+            ).all()
+            await record_deletions(
+                ac,
+                ChangeType.PARTICIPANT,
+                deleted,
+                project.organization_id,
+                project_id=project.id,
+            )
+
     async def delete_project_participant(self, project_id: UUID, user_id: UUID) -> None:
         query = delete(ProjectParticipant).where(
             ProjectParticipant.project_id == project_id,
@@ -188,5 +332,15 @@ class ProjectService:
         )
 
         async with self.session.begin() as ac:
-            await ac.execute(query)
+            result = await ac.execute(query)
+            if result.rowcount:
+                await record_deletion(
+                    ac,
+                    ChangeType.PARTICIPANT,
+                    user_id,
+                    select(Project.organization_id)
+                    .where(Project.id == project_id)
+                    .scalar_subquery(),
+                    project_id=project_id,
+                )
             await ac.flush()
@@ -0,0 +1,6 @@
+import enum
+
+
+class SearchResultType(enum.Enum):
+    PROJECT = "Project"
+    TASK = "Task"
@@ -0,0 +1,135 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Path, Query, status
+from fastapi.routing import APIRouter
+
+from api.orgs.permissions import OrganizationPermissionService
+from api.orgs.services import OrganizationService
+from api.projects.permissions import ProjectPermissionService
+from api.projects.services import ProjectService
+from api.search.schemas import (
+    SearchParams,
+    SearchResult,
+    UserSearchParams,
+    UserSearchResponse,
+)
+from api.search.services import SearchService
+from api.users.auth.dependencies import AuthenticatedUser
+from api.utils.pagination import CursorPaginatedResponse
+from api.utils.permissions import check_permission
+
+router = APIRouter(prefix="", tags=["Search"])
+
+
+@router.get(
+    "/organizations/{organization_id}/search",
+    response_model=CursorPaginatedResponse[SearchResult],
+    status_code=status.HTTP_200_OK,
+)
+async def search_organization(
+    organization_id: Annotated[UUID, Path()],
+    params: Annotated[SearchParams, Query()],
+    organization_service: Annotated[OrganizationService, Depends()],
+    permission_service: Annotated[OrganizationPermissionService, Depends()],
+    search_service: Annotated[SearchService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Search projects and tasks of an organization, best matches first.
+    Note: only projects the user participates in are searched, unless user is the manager."""
+    organization = await organization_service.get_organization(organization_id)
+    if not organization:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    await check_permission(
+        permission_service.is_organization_member_or_manager,
+        organization=organization,
+        user=user,
+    )
+
+    return await search_service.search_organization(
+        organization.id,
+        user.id,
+        await permission_service.is_organization_manager(organization, user),
+        params,
+    )
+
+
+@router.get(
+    "/projects/{project_id}/search",
+    response_model=CursorPaginatedResponse[SearchResult],
+    status_code=status.HTTP_200_OK,
+)
+async def search_project(
+    project_id: Annotated[UUID, Path()],
+    params: Annotated[SearchParams, Query()],
+    organization_service: Annotated[OrganizationService, Depends()],
+    project_service: Annotated[ProjectService, Depends()],
+    permission_service: Annotated[ProjectPermissionService, Depends()],
+    search_service: Annotated[SearchService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Search tasks of a project, best matches first. Note: user must be a participant of the project or the organization manager."""
+    project = await project_service.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    organization = await organization_service.get_organization(project.organization_id)
+    await check_permission(
+        permission_service.is_project_participant_or_organization_manager,
+        organization=organization,
+        project=project,
+        user=user,
+    )
+
+    return await search_service.search_project(project.id, params)
+
+
+@router.get(
+    "/users/search",
+    response_model=UserSearchResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def search_users(
+    params: Annotated[UserSearchParams, Query()],
+    organization_service: Annotated[OrganizationService, Depends()],
+    project_service: Annotated[ProjectService, Depends()],
+    organization_permission_service: Annotated[
+        OrganizationPermissionService, Depends()
+    ],
+    project_permission_service: Annotated[ProjectPermissionService, Depends()],
+    search_service: Annotated[SearchService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Find users to invite or assign by their names and email, as they are typed.
+    Note: with `organization_id` only active members of the organization are searched, and
+    with `project_id` only contributors of the project; user must be able to see either.
+    Without either, only the user whose email is `q` is found, e.g. to be invited."""
+    if params.project_id:
+        project = await project_service.get_project(params.project_id)
+        if not project:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+        organization = await organization_service.get_organization(
+            project.organization_id
+        )
+        await check_permission(
+            project_permission_service.is_project_participant_or_organization_manager,
+            organization=organization,
+            project=project,
+            user=user,
+        )
+    elif params.organization_id:
+        organization = await organization_service.get_organization(
+            params.organization_id
+        )
+        if not organization:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+        await check_permission(
+            organization_permission_service.is_organization_member_or_manager,
+            organization=organization,
+            user=user,
+        )
+
+    return await search_service.search_users(params)
@@ -0,0 +1,54 @@
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from api.search.enums import SearchResultType
+from api.utils.pagination import DEFAULT_PER_PAGE, CursorPaginationParams
+
+MAX_USER_SEARCH_RESULTS = 50
+
+
+class SearchParams(CursorPaginationParams):
+    q: str = Field(min_length=1, max_length=255)
+
+
+class SearchResult(BaseModel):
+    type: SearchResultType
+    id: UUID
+    project_id: UUID
+    title: str
+    # Fragments of title and description with matches wrapped in <b></b>.
+    snippet: str
+    rank: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserSearchParams(BaseModel):
+    q: str = Field(min_length=1, max_length=255)
+    limit: int = Field(ge=1, le=MAX_USER_SEARCH_RESULTS, default=DEFAULT_PER_PAGE)
+    # Only search active members of the organization, or contributors of the project.
+    # Without either, `q` is looked up as a full email.
+    organization_id: UUID | None = None
+    project_id: UUID | None = None
+
+    @model_validator(mode="after")
+    def validate_scope(self):
+        if self.organization_id and self.project_id:
+            raise ValueError("Only one of organization and project can be given.")
+
+        return self
+
+
+class UserSearchResult(BaseModel):
+    id: UUID
+    email: str
+    first_name: str
+    last_name: str
+    display_name: str | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserSearchResponse(BaseModel):
+    items: list[UserSearchResult]
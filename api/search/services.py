@@ -0,0 +1,226 @@
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Float, Select, func, literal, or_, select, tuple_, union_all
+
+from api.database.dependencies import AsyncSession
+from api.orgs.models import OrganizationMembership
+from api.projects.enums import ProjectParticipationType
+from api.projects.models import Project, ProjectParticipant
+from api.search.enums import SearchResultType
+from api.search.schemas import (
+    SearchParams,
+    SearchResult,
+    UserSearchParams,
+    UserSearchResponse,
+    UserSearchResult,
+)
+from api.search.utils import TEXT_SEARCH_REGCONFIG, contains_words, search_query
+from api.tasks.models import Task
+from api.users.models import User
+from api.utils.pagination import CursorPaginatedResponse, decode_cursor, encode_cursor
+
+HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=20, MinWords=5"
+
+
+class SearchService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def search_organization(
+        self,
+        organization_id: UUID,
+        user_id: UUID,
+        is_manager: bool,
+        params: SearchParams,
+    ) -> CursorPaginatedResponse[SearchResult]:
+        """Search projects and tasks of the organization. Managers search every
+        project, other members only the projects they participate in."""
+        project_ids = select(Project.id).where(
+            Project.organization_id == organization_id,
+            Project.deleted_at.is_(None),
+        )
+        if not is_manager:
+            project_ids = project_ids.where(
+                Project.id.in_(
+                    select(ProjectParticipant.project_id).where(
+                        ProjectParticipant.user_id == user_id
+                    )
+                )
+            )
+
+        query = search_query(params.q)
+        hits = union_all(
+            self._projects_query(query).where(Project.id.in_(project_ids)),
+            self._tasks_query(query).where(Task.project_id.in_(project_ids)),
+        )
+        return await self._search(hits, query, params)
+
+    async def search_project(
+        self, project_id: UUID, params: SearchParams
+    ) -> CursorPaginatedResponse[SearchResult]:
+        """Search tasks of the project."""
+        query = search_query(params.q)
+        hits = self._tasks_query(query).where(Task.project_id == project_id)
+        return await self._search(hits, query, params)
+
+    def _projects_query(self, query) -> Select:
+        return select(
+            literal(SearchResultType.PROJECT.value).label("type"),
+            Project.id,
+            Project.id.label("project_id"),
+            Project.title,
+            Project.description,
+            func.ts_rank(Project.search_vector, query, type_=Float).label("rank"),
+        ).where(Project.search_vector.bool_op("@@")(query))
+
+    def _tasks_query(self, query) -> Select:
+        return select(
+            literal(SearchResultType.TASK.value).label("type"),
+            Task.id,
+            Task.project_id,
+            Task.title,
+            Task.description,
+            func.ts_rank(Task.search_vector, query, type_=Float).label("rank"),
+        ).where(Task.search_vector.bool_op("@@")(query))
+
+    async def _search(
+        self, hits, query, params: SearchParams
+    ) -> CursorPaginatedResponse[SearchResult]:
+        """Page through hits ordered by rank, using (rank, id) of the last item
+        as the cursor. Snippets are generated for the returned page only."""
+        hits = hits.subquery()
+        page = (
+            select(hits)
+            .order_by(hits.c.rank.desc(), hits.c.id.desc())
+            .limit(params.page_size + 1)
+        )
+
+        if params.cursor:
+            cursor = decode_cursor(params.cursor)
+            try:
+                after = (float(cursor["rank"]), UUID(cursor["id"]))
+            except (KeyError, TypeError, ValueError):
+                raise HTTPException(
+                    detail="Invalid cursor.", status_code=status.HTTP_400_BAD_REQUEST
+                )
+            page = page.where(tuple_(hits.c.rank, hits.c.id) < after)
+
+        page = page.subquery()
+        snippet = func.ts_headline(
+            TEXT_SEARCH_REGCONFIG,
+            func.concat_ws(". ", page.c.title, page.c.description),
+            query,
+            HEADLINE_OPTIONS,
+        )
+        results_query = select(
+            page.c.type,
+            page.c.id,
+            page.c.project_id,
+            page.c.title,
+            snippet.label("snippet"),
+            page.c.rank,
+        ).order_by(page.c.rank.desc(), page.c.id.desc())
+
+        async with self.session() as ac:
+            rows = (await ac.execute(results_query)).all()
+
+        items = [SearchResult.model_validate(row) for row in rows[: params.page_size]]
+        next_cursor = None
+        if len(rows) > params.page_size:
+            last = items[-1]
+            next_cursor = encode_cursor({"rank": last.rank, "id": str(last.id)})
+
+        return CursorPaginatedResponse[SearchResult](
+            next_cursor=next_cursor, count=len(items), items=items
+        )
+
+    async def search_users(self, params: UserSearchParams) -> UserSearchResponse:
+        """Users whose names or email contain every word of `q`, those starting
+        with it first, among members of the organization or contributors of
+        the project. Without either, only the user whose email is `q` is found,
+        so that users can't be listed by searching."""
+        columns = [
+            User.id,
+            User.email,
+            User.first_name,
+            User.last_name,
+            User.display_name,
+        ]
+        if not (params.organization_id or params.project_id):
+            query = select(*columns).where(
+                func.lower(User.email) == params.q.strip().lower()
+            )
+            return await self._users(query)
+
+        prefix = " ".join(params.q.lower().split())
+        if not prefix:
+            return UserSearchResponse(items=[])
+
+        starts_with_prefix = or_(
+            *(
+                func.lower(expression).startswith(prefix, autoescape=True)
+                for expression in (
+                    User.first_name + " " + User.last_name,
+                    User.last_name,
+                    User.display_name,
+                    User.email,
+                )
+            )
+        ).is_(True)
+        similarity = func.word_similarity(
+            prefix,
+            func.concat_ws(
+                " ", User.first_name, User.last_name, User.display_name, User.email
+            ),
+        )
+        # Each column is matched on its own for the trigram index to find users
+        # containing rare words without reading every member. Matches are all
+        # ranked, so that users starting with the query always come first.
+        query = (
+            select(*columns)
+            .where(
+                User.id.in_(self._user_scope(params)),
+                contains_words(
+                    prefix,
+                    User.first_name,
+                    User.last_name,
+                    User.display_name,
+                    User.email,
+                ),
+            )
+            .order_by(
+                starts_with_prefix.desc(),
+                similarity.desc(),
+                User.first_name,
+                User.last_name,
+                User.id,
+            )
+            .limit(params.limit)
+        )
+        return await self._users(query)
+
+    async def _users(self, query: Select) -> UserSearchResponse:
+        async with self.session() as ac:
+            rows = (await ac.execute(query)).all()
+
+        return UserSearchResponse(
+            items=[UserSearchResult.model_validate(row) for row in rows]
+        )
+
+    def _user_scope(self, params: UserSearchParams) -> Select:
+        # Rendered into the statement like the searched words, for plans to
+        # read the members of small scopes rather than the trigram index.
+        if params.project_id:
+            return select(ProjectParticipant.user_id).where(
+                ProjectParticipant.project_id
+                == literal(params.project_id, literal_execute=True),
+                ProjectParticipant.participation_type
+                == ProjectParticipationType.CONTRIBUTOR,
+            )
+
+        return select(OrganizationMembership.user_id).where(
+            OrganizationMembership.organization_id
+            == literal(params.organization_id, literal_execute=True),
+            OrganizationMembership.is_active.is_(True),
+        )
@@ -0,0 +1,53 @@
+from sqlalchemy import (
+    ColumnElement,
+    Computed,
+    and_,
+    bindparam,
+    func,
+    literal_column,
+    or_,
+    true,
+)
+
+# Text search configuration used for both indexing and querying.
+TEXT_SEARCH_CONFIG = "english"
+TEXT_SEARCH_REGCONFIG = literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig")
+
+
+def search_vector(title: str, description: str) -> Computed:
+    """Expression of a generated `tsvector` column over given columns, where
+    matches in the title rank higher than matches in the description."""
+    return Computed(
+        f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce({title}, '')), 'A')"
+        f" || setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce({description}, '')), 'B')",
+        persisted=True,
+    )
+
+
+def search_query(q: str) -> ColumnElement:
+    """Parse user input (quoted phrases, `or` and `-` are supported) into a
+    `tsquery`. Invalid syntax never raises."""
+    return func.websearch_to_tsquery(TEXT_SEARCH_REGCONFIG, q)
+
+
+def contains_words(q: str, *columns: ColumnElement) -> ColumnElement:
+    """Every word of user input is contained in one of `columns`, ignoring
+    case. Backed by trigram (`gin_trgm_ops`) indexes of the columns.
+
+    Patterns are rendered into the statement rather than bound, so that it's
+    planned for them: the index only pays off for words few rows contain, and
+    a generic plan would use it for any."""
+    patterns = [
+        bindparam(
+            None,
+            "%"
+            + word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            + "%",
+            literal_execute=True,
+        )
+        for word in q.split()
+    ]
+    return and_(
+        true(),
+        *(or_(*(column.ilike(pattern) for column in columns)) for pattern in patterns),
+    )
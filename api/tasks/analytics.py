@@ -0,0 +1,397 @@
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Hashable
+from uuid import UUID
+
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    Select,
+    Uuid,
+    case,
+    cast,
+    func,
+    literal,
+    select,
+)
+from sqlalchemy.dialects.postgresql import array, insert
+
+from api.config import settings
+from api.database.dependencies import AsyncSession
+from api.projects.models import Project
+from api.tasks.enums import CLOSED_TASK_STATES, TaskState
+from api.tasks.models import (
+    ProjectTaskSnapshot,
+    ProjectTaskStats,
+    Task,
+    TaskStateTransition,
+)
+from api.tasks.schemas import (
+    DurationPercentiles,
+    TaskBurndownResponse,
+    TaskCycleTimeResponse,
+    TaskTimeInState,
+    TaskTimeInStateResponse,
+)
+
+PERCENTILES = (0.5, 0.75, 0.9, 0.95)
+
+
+class ProjectCache:
+    """In-process cache of values computed per project, expiring after `ttl`
+    seconds. Entries of a project are dropped together when its tasks change in
+    this process; other processes see the change once their entries expire.
+    """
+
+    def __init__(self, ttl: float, max_projects: int) -> None:
+        self.ttl = ttl
+        self.max_projects = max_projects
+        self._entries: OrderedDict[UUID, dict[Hashable, tuple[float, Any]]] = (
+            OrderedDict()
+        )
+
+    def get(self, project_id: UUID, key: Hashable) -> Any | None:
+        entry = self._entries.get(project_id, {}).get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+
+        self._entries.move_to_end(project_id)
+        return entry[1]
+
+    def set(self, project_id: UUID, key: Hashable, value: Any) -> None:
+        self._entries.setdefault(project_id, {})[key] = (
+            time.monotonic() + self.ttl,
+            value,
+        )
+        self._entries.move_to_end(project_id)
+        while len(self._entries) > self.max_projects:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, project_id: UUID) -> None:
+        self._entries.pop(project_id, None)
+
+    def invalidate_where(self, key: Hashable, predicate: Callable[[Any], bool]) -> None:
+        """Drop entries of every project whose value under `key` matches."""
+        for project_id, entries in list(self._entries.items()):
+            entry = entries.get(key)
+            if entry is not None and predicate(entry[1]):
+                del self._entries[project_id]
+
+
+analytics_cache = ProjectCache(
+    ttl=settings.TASK_ANALYTICS_CACHE_TTL_SECONDS,
+    max_projects=settings.TASK_ANALYTICS_CACHE_MAX_PROJECTS,
+)
+
+
+def _seconds(interval) -> Any:
+    return func.extract("epoch", interval)
+
+
+def _is_open(state) -> Any:
+    return case((state.not_in(CLOSED_TASK_STATES), 1), else_=0)
+
+
+def _is_completed(state) -> Any:
+    return case((state == TaskState.COMPLETED, 1), else_=0)
+
+
+def _percentiles(values: list | None) -> DurationPercentiles:
+    """Map values of `percentile_cont(PERCENTILES)`; null when nothing matched."""
+    values = values or [None] * len(PERCENTILES)
+    return DurationPercentiles(
+        **{
+            f"p{round(p * 100)}": None if value is None else float(value)
+            for p, value in zip(PERCENTILES, values, strict=True)
+        }
+    )
+
+
+class TaskAnalyticsService:
+    """Analytics of a project's tasks based on their state transitions. Results
+    are cached per project in `analytics_cache`."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_cycle_time(
+        self, project_id: UUID, days: int
+    ) -> TaskCycleTimeResponse:
+        """Percentiles of cycle time (first `In_Progress` to `Completed`) and lead
+        time (creation to `Completed`) of tasks completed in last `days` days."""
+        cached = analytics_cache.get(project_id, ("cycle_time", days))
+        if cached is not None:
+            return cached
+
+        transition = TaskStateTransition
+        # The latest completion of each task completed in the period; filtering
+        # on `created_at` limits the scan to the period's partitions.
+        completions = (
+            select(
+                transition.task_id,
+                transition.created_at.label("completed_at"),
+                func.row_number()
+                .over(
+                    partition_by=transition.task_id,
+                    order_by=transition.created_at.desc(),
+                )
+                .label("n"),
+            )
+            .where(
+                transition.project_id == project_id,
+                transition.to_state == TaskState.COMPLETED,
+                transition.created_at >= func.now() - timedelta(days=days),
+            )
+            .subquery("completions")
+        )
+        started = transition.__table__.alias("started")
+        started_at = (
+            select(func.min(started.c.created_at))
+            .where(
+                started.c.task_id == completions.c.task_id,
+                started.c.to_state == TaskState.IN_PROGRESS,
+                started.c.created_at <= completions.c.completed_at,
+            )
+            .scalar_subquery()
+        )
+        cycle_time = _seconds(completions.c.completed_at - started_at)
+        lead_time = _seconds(completions.c.completed_at - Task.created_at)
+        quantiles = array(PERCENTILES, type_=Float)
+        query = (
+            select(
+                func.count(),
+                func.percentile_cont(quantiles).within_group(cycle_time),
+                func.percentile_cont(quantiles).within_group(lead_time),
+            )
+            .select_from(completions)
+            .join(Task, Task.id == completions.c.task_id)
+            .where(completions.c.n == 1)
+        )
+        async with self.session() as ac:
+            completed, cycle_times, lead_times = (await ac.execute(query)).one()
+
+        result = TaskCycleTimeResponse(
+            days=days,
+            completed=completed,
+            cycle_time=_percentiles(cycle_times),
+            lead_time=_percentiles(lead_times),
+        )
+        analytics_cache.set(project_id, ("cycle_time", days), result)
+        return result
+
+    async def get_time_in_state(
+        self, project_id: UUID, days: int
+    ) -> TaskTimeInStateResponse:
+        """Time tasks spent in each state they entered and left in last `days` days."""
+        cached = analytics_cache.get(project_id, ("time_in_state", days))
+        if cached is not None:
+            return cached
+
+        transition = TaskStateTransition
+        # A state lasts until the task's next transition. The period reaches up
+        # to now, so every later transition of a task is in it as well.
+        left_at = func.lead(transition.created_at).over(
+            partition_by=transition.task_id, order_by=transition.created_at
+        )
+        intervals = (
+            select(
+                transition.to_state.label("state"),
+                _seconds(left_at - transition.created_at).label("duration"),
+            )
+            .where(
+                transition.project_id == project_id,
+                transition.created_at >= func.now() - timedelta(days=days),
+            )
+            .subquery("intervals")
+        )
+        duration = intervals.c.duration
+        quantiles = array((0.5, 0.9), type_=Float)
+        query = (
+            select(
+                intervals.c.state,
+                func.count(),
+                func.avg(duration),
+                func.percentile_cont(quantiles).within_group(duration),
+            )
+            .where(duration.is_not(None))
+            .group_by(intervals.c.state)
+            .order_by(intervals.c.state)
+        )
+        async with self.session() as ac:
+            rows = (await ac.execute(query)).all()
+
+        result = TaskTimeInStateResponse(
+            days=days,
+            states=[
+                TaskTimeInState(
+                    state=state,
+                    transitions=count,
+                    average=float(average),
+                    p50=float(p50),
+                    p90=float(p90),
+                )
+                for state, count, average, (p50, p90) in rows
+            ],
+        )
+        analytics_cache.set(project_id, ("time_in_state", days), result)
+        return result
+
+    async def get_burndown(self, project: Project) -> TaskBurndownResponse:
+        """Open and completed tasks of a project at the end of each day of its
+        schedule, for burndown and burnup charts.
+
+        Past days are computed once and kept in `project_task_snapshots`. Other
+        days are counted back from current counts (`project_task_stats`) by the
+        transitions since, so tasks deleted since or older than transitions are
+        counted as they are now.
+        """
+        # Days are in UTC, whatever the time zone of the app or the database.
+        today = datetime.now(timezone.utc).date()
+        first = project.start_date or project.created_at.astimezone(timezone.utc).date()
+        last = min(project.deadline, today) if project.deadline else today
+        key = ("burndown", today, first, last)
+        cached = analytics_cache.get(project.id, key)
+        if cached is not None:
+            return cached
+
+        # A day is kept once the next one is over too, so that transactions in
+        # flight at midnight have committed.
+        keep_until = min(last, today - timedelta(days=2))
+        snapshot = ProjectTaskSnapshot
+        stored_query = (
+            select(snapshot.day, snapshot.open, snapshot.completed)
+            .where(
+                snapshot.project_id == project.id,
+                snapshot.day.between(first, last),
+            )
+            .order_by(snapshot.day)
+        )
+
+        days = [first + timedelta(days=n) for n in range((last - first).days + 1)]
+        counts: dict[date, tuple[int, int]] = {}
+        if days:
+            async with self.session.begin() as ac:
+                counts = {
+                    day: (open_count, completed_count)
+                    for day, open_count, completed_count in await ac.execute(
+                        stored_query
+                    )
+                }
+                # Stored days run from `first` on, unless the start date moved
+                # since; everything from the first missing day is counted.
+                missing = [day for day in days if day not in counts]
+                if missing:
+                    query = self._burndown_query(
+                        project.id, missing[0], last, keep_until
+                    )
+                    for day, open_count, completed_count in await ac.execute(query):
+                        counts.setdefault(day, (open_count, completed_count))
+
+        result = TaskBurndownResponse(
+            start=first,
+            deadline=project.deadline,
+            days=days,
+            open=[counts[day][0] for day in days],
+            completed=[counts[day][1] for day in days],
+        )
+        analytics_cache.set(project.id, key, result)
+        return result
+
+    @staticmethod
+    def _burndown_query(
+        project_id: UUID, first: date, last: date, keep_until: date
+    ) -> Select:
+        """Counts of each day from `first` to `last`, keeping those up to
+        `keep_until` as snapshots, in a single statement."""
+        transition, stats = TaskStateTransition, ProjectTaskStats
+        after_last = last + timedelta(days=1)
+        # Changes per day since the end of `first`; later ones than `last` are
+        # put on the day after it. Filtering on `created_at` limits the scan
+        # to the period's partitions.
+        day = func.least(
+            cast(func.timezone("UTC", transition.created_at), Date), after_last
+        )
+        deltas = (
+            select(
+                day.label("day"),
+                func.sum(
+                    _is_open(transition.to_state) - _is_open(transition.from_state)
+                ).label("open"),
+                func.sum(
+                    _is_completed(transition.to_state)
+                    - _is_completed(transition.from_state)
+                ).label("completed"),
+            )
+            .where(
+                transition.project_id == project_id,
+                transition.created_at
+                >= datetime.combine(
+                    first + timedelta(days=1), datetime.min.time(), timezone.utc
+                ),
+            )
+            .group_by(day)
+            .subquery("deltas")
+        )
+        series = select(
+            cast(
+                func.generate_series(
+                    cast(first, DateTime), cast(after_last, DateTime), timedelta(days=1)
+                ),
+                Date,
+            ).label("day")
+        ).subquery("series")
+
+        def current(condition) -> Any:
+            return (
+                select(func.coalesce(func.sum(stats.task_count), 0))
+                .where(stats.project_id == project_id, condition)
+                .scalar_subquery()
+            )
+
+        def since(column) -> Any:
+            """Sum of changes after each day."""
+            return func.coalesce(
+                func.sum(column).over(order_by=series.c.day.desc(), rows=(None, -1)),
+                0,
+            )
+
+        counts = (
+            select(
+                series.c.day,
+                cast(
+                    current(stats.state.not_in(CLOSED_TASK_STATES))
+                    - since(deltas.c.open),
+                    Integer,
+                ).label("open"),
+                cast(
+                    current(stats.state == TaskState.COMPLETED)
+                    - since(deltas.c.completed),
+                    Integer,
+                ).label("completed"),
+            )
+            .select_from(series)
+            .outerjoin(deltas, deltas.c.day == series.c.day)
+            .cte("counts")
+        )
+        inserted = (
+            insert(ProjectTaskSnapshot)
+            .from_select(
+                ["project_id", "day", "open", "completed"],
+                select(
+                    literal(project_id, Uuid),
+                    counts.c.day,
+                    counts.c.open,
+                    counts.c.completed,
+                ).where(counts.c.day <= keep_until),
+            )
+            .on_conflict_do_nothing()
+            .cte("inserted")
+        )
+        return (
+            select(counts.c.day, counts.c.open, counts.c.completed)
+            .where(counts.c.day <= last)
+            .add_cte(inserted)
+        )
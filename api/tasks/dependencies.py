@@ -0,0 +1,332 @@
+from collections import defaultdict, deque
+from datetime import date
+from functools import partial
+from typing import NamedTuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import case, delete, exists, func, literal, or_, select, true
+from sqlalchemy.dialects.postgresql import insert
+
+from api.config import settings
+from api.database.dependencies import AsyncSession
+from api.tasks.analytics import ProjectCache
+from api.tasks.enums import TaskState
+from api.tasks.models import Task, TaskDependency
+from api.tasks.schemas import (
+    CriticalPathResponse,
+    CriticalPathTask,
+    TaskDependenciesResponse,
+)
+
+dependency_graphs = ProjectCache(
+    ttl=settings.TASK_GRAPH_CACHE_TTL_SECONDS,
+    max_projects=settings.TASK_GRAPH_CACHE_MAX_PROJECTS,
+)
+
+
+class GraphTask(NamedTuple):
+    """Dates of a task which matter for scheduling, as day ordinals."""
+
+    cancelled: bool
+    start: int | None
+    # Days from start date to deadline, zero unless both are set.
+    days: int
+    # Set for completed tasks only.
+    finish: int | None
+
+    @classmethod
+    def from_task(cls, task: Task) -> "GraphTask":
+        days = 0
+        if task.start_date and task.deadline:
+            days = max((task.deadline - task.start_date).days, 0)
+        return cls(
+            cancelled=task.state == TaskState.CANCELLED,
+            start=task.start_date.toordinal() if task.start_date else None,
+            days=days,
+            finish=task.finish_date.toordinal()
+            if task.state == TaskState.COMPLETED and task.finish_date
+            else None,
+        )
+
+
+class DependencyGraph:
+    """Tasks of a project along with their dependencies, for scheduling them
+    in memory. Kept up to date in place by the writes of this process.
+
+    Tasks are keyed by the bytes of their ids, which hash several times faster
+    than `UUID` and are read from the database as such.
+    """
+
+    def __init__(self) -> None:
+        self.tasks: dict[bytes, GraphTask] = {}
+        self.depends_on: defaultdict[bytes, set[bytes]] = defaultdict(set)
+        self.dependents: defaultdict[bytes, set[bytes]] = defaultdict(set)
+        self._schedule: tuple[date, CriticalPathResponse] | None = None
+
+    def put_task(self, task_id: UUID, task: GraphTask) -> None:
+        self._schedule = None
+        self.tasks[task_id.bytes] = task
+
+    def remove_task(self, task_id: UUID) -> None:
+        self._schedule = None
+        key = task_id.bytes
+        self.tasks.pop(key, None)
+        for depends_on_key in self.depends_on.pop(key, ()):
+            self.dependents[depends_on_key].discard(key)
+        for dependent_key in self.dependents.pop(key, ()):
+            self.depends_on[dependent_key].discard(key)
+
+    def add_dependency(self, task_id: UUID, depends_on_id: UUID) -> bool:
+        """Returns:
+        bool: False if either task is missing, e.g. created by another process
+        since the graph was read; the graph is stale then.
+        """
+        if task_id.bytes not in self.tasks or depends_on_id.bytes not in self.tasks:
+            return False
+
+        self._schedule = None
+        self.depends_on[task_id.bytes].add(depends_on_id.bytes)
+        self.dependents[depends_on_id.bytes].add(task_id.bytes)
+        return True
+
+    def remove_dependency(self, task_id: UUID, depends_on_id: UUID) -> None:
+        self._schedule = None
+        self.depends_on[task_id.bytes].discard(depends_on_id.bytes)
+        self.dependents[depends_on_id.bytes].discard(task_id.bytes)
+
+    def schedule(self, today: date) -> CriticalPathResponse:
+        """Earliest dates tasks can be done by, in topological order.
+
+        An open task takes from its start date (today if unset) to its deadline,
+        or a day if either is unset, and starts no earlier than the day after
+        the tasks it depends on finish. Completed tasks finished when they did,
+        and cancelled ones block nothing. The result is kept until the graph
+        changes.
+        """
+        if self._schedule is not None and self._schedule[0] == today:
+            return self._schedule[1]
+
+        tasks, depends_on, dependents = self.tasks, self.depends_on, self.dependents
+        waiting = {
+            key: len(depends_on[key]) if key in depends_on else 0 for key in tasks
+        }
+        ready = deque(key for key, count in waiting.items() if not count)
+        starts: dict[bytes, int] = {}
+        finishes: dict[bytes, int] = {}
+        # The dependency each task waits for the longest, if any.
+        critical: dict[bytes, bytes] = {}
+        today_ordinal = today.toordinal()
+
+        while ready:
+            key = ready.popleft()
+            task = tasks[key]
+            if task.finish is not None:
+                starts[key] = min(
+                    today_ordinal if task.start is None else task.start, task.finish
+                )
+                finishes[key] = task.finish
+            elif not task.cancelled:
+                start = today_ordinal if task.start is None else task.start
+                for depends_on_key in depends_on.get(key, ()):
+                    # Cancelled dependencies have no finish.
+                    finish = finishes.get(depends_on_key)
+                    if finish is not None and finish >= start:
+                        start, critical[key] = finish + 1, depends_on_key
+                starts[key] = start
+                finishes[key] = start + task.days
+
+            for dependent_key in dependents.get(key, ()):
+                waiting[dependent_key] -= 1
+                if not waiting[dependent_key]:
+                    ready.append(dependent_key)
+
+        if not finishes:
+            result = CriticalPathResponse(earliest_finish=None, path=[])
+        else:
+            last = max(finishes, key=finishes.__getitem__)
+            path = [last]
+            while path[-1] in critical:
+                path.append(critical[path[-1]])
+
+            result = CriticalPathResponse(
+                earliest_finish=date.fromordinal(finishes[last]),
+                path=[
+                    CriticalPathTask(
+                        id=UUID(bytes=task_id),
+                        earliest_start=date.fromordinal(starts[task_id]),
+                        earliest_finish=date.fromordinal(finishes[task_id]),
+                    )
+                    for task_id in reversed(path)
+                ],
+            )
+
+        self._schedule = (today, result)
+        return result
+
+
+def _ordinal(column):
+    """Day ordinal of a date column, as `date.toordinal` computes it. (asyncpg
+    sends `date.min` as -infinity, hence a later epoch.)"""
+    epoch = date(2000, 1, 1)
+    return column - literal(epoch) + epoch.toordinal()
+
+
+def update_cached_graph(project_id: UUID, task_id: UUID, task: Task | None) -> None:
+    """Apply a task written by this process to the cached graph of its project,
+    if any; `task` is None once deleted."""
+    graph = dependency_graphs.get(project_id, "graph")
+    if graph is None:
+        return
+    if task is None:
+        graph.remove_task(task_id)
+    else:
+        graph.put_task(task_id, GraphTask.from_task(task))
+
+
+class TaskDependencyService:
+    """Dependencies between tasks of a project. Cycles are ruled out in the
+    database; schedules are computed from graphs cached in `dependency_graphs`.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_dependencies(self, task_id: UUID) -> TaskDependenciesResponse:
+        query = select(TaskDependency.task_id, TaskDependency.depends_on_id).where(
+            or_(
+                TaskDependency.task_id == task_id,
+                TaskDependency.depends_on_id == task_id,
+            )
+        )
+        async with self.session() as ac:
+            rows = (await ac.execute(query)).all()
+
+        return TaskDependenciesResponse(
+            depends_on=[depends_on_id for t, depends_on_id in rows if t == task_id],
+            dependents=[t for t, depends_on_id in rows if depends_on_id == task_id],
+        )
+
+    async def add_dependency(self, task: Task, depends_on_id: UUID) -> None:
+        """Make `task` depend on another task of its project, unless that task
+        already depends on it, directly or not."""
+        # Tasks reachable from `task` through their dependents.
+        reachable = (
+            select(TaskDependency.task_id)
+            .where(TaskDependency.depends_on_id == task.id)
+            .cte("reachable", recursive=True)
+        )
+        reachable = reachable.union(
+            select(TaskDependency.task_id).join(
+                reachable, TaskDependency.depends_on_id == reachable.c.task_id
+            )
+        )
+        check_query = select(
+            select(Task.project_id).where(Task.id == depends_on_id).scalar_subquery(),
+            exists().where(reachable.c.task_id == depends_on_id),
+        )
+
+        async with self.session.begin() as ac:
+            # Checking and adding concurrently could let two edges form a cycle.
+            await ac.execute(
+                select(
+                    func.pg_advisory_xact_lock(
+                        func.hashtextextended(f"task_dependencies:{task.project_id}", 0)
+                    )
+                )
+            )
+            project_id, creates_cycle = (await ac.execute(check_query)).one()
+            if project_id != task.project_id or depends_on_id == task.id:
+                raise HTTPException(
+                    detail="A task can only depend on another task of its project.",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+            if creates_cycle:
+                raise HTTPException(
+                    detail="Given task already depends on this task.",
+                    status_code=status.HTTP_409_CONFLICT,
+                )
+
+            await ac.execute(
+                insert(TaskDependency)
+                .values(
+                    task_id=task.id,
+                    depends_on_id=depends_on_id,
+                    project_id=task.project_id,
+                )
+                .on_conflict_do_nothing()
+            )
+
+        graph = dependency_graphs.get(task.project_id, "graph")
+        if graph is not None and not graph.add_dependency(task.id, depends_on_id):
+            dependency_graphs.invalidate(task.project_id)
+
+    async def delete_dependency(self, task: Task, depends_on_id: UUID) -> None:
+        async with self.session.begin() as ac:
+            await ac.execute(
+                delete(TaskDependency).where(
+                    TaskDependency.task_id == task.id,
+                    TaskDependency.depends_on_id == depends_on_id,
+                )
+            )
+
+        graph = dependency_graphs.get(task.project_id, "graph")
+        if graph is not None:
+            graph.remove_dependency(task.id, depends_on_id)
+
+    async def get_critical_path(self, project_id: UUID) -> CriticalPathResponse:
+        """Earliest date a project's tasks can be done by, along with the chain
+        of dependent tasks which takes the longest."""
+        graph = dependency_graphs.get(project_id, "graph")
+        if graph is None:
+            graph = await self._load_graph(project_id)
+            dependency_graphs.set(project_id, "graph", graph)
+
+        return graph.schedule(date.today())
+
+    async def _load_graph(self, project_id: UUID) -> DependencyGraph:
+        """Read a project's graph, with ids as bytes and `GraphTask` fields
+        computed by the database; decoding rows dominates the time otherwise."""
+        tasks = (
+            select(
+                func.array_agg(func.uuid_send(Task.id)),
+                func.array_agg(Task.state == TaskState.CANCELLED),
+                func.array_agg(_ordinal(Task.start_date)),
+                func.array_agg(
+                    func.coalesce(func.greatest(Task.deadline - Task.start_date, 0), 0)
+                ),
+                func.array_agg(
+                    case(
+                        (Task.state == TaskState.COMPLETED, _ordinal(Task.finish_date))
+                    )
+                ),
+            )
+            .where(Task.project_id == project_id)
+            .subquery("tasks")
+        )
+        dependencies = (
+            select(
+                func.array_agg(func.uuid_send(TaskDependency.task_id)),
+                func.array_agg(func.uuid_send(TaskDependency.depends_on_id)),
+            )
+            .where(TaskDependency.project_id == project_id)
+            .subquery("dependencies")
+        )
+        # A single statement, so tasks and dependencies are read from the same
+        # snapshot. Arrays are decoded much faster than as many rows.
+        query = select(tasks, dependencies).select_from(
+            tasks.join(dependencies, true())
+        )
+
+        async with self.session() as ac:
+            keys, *fields, task_keys, depends_on_keys = (await ac.execute(query)).one()
+
+        graph = DependencyGraph()
+        if keys:
+            # Like `GraphTask._make`, without a Python call per task.
+            make = partial(tuple.__new__, GraphTask)
+            graph.tasks = dict(zip(keys, map(make, zip(*fields))))
+        for task_key, depends_on_key in zip(task_keys or (), depends_on_keys or ()):
+            graph.depends_on[task_key].add(depends_on_key)
+            graph.dependents[depends_on_key].add(task_key)
+        return graph
@@ -12,3 +12,44 @@ class TaskState(enum.Enum):
     QA_REJECTED = "QA_Rejected"
     REVIEWED = "Reviewed"
     TODO = "Todo"
+
+
+# Tasks in these states are not worked on anymore, e.g. they can't be overdue.
+CLOSED_TASK_STATES = (TaskState.COMPLETED, TaskState.CANCELLED)
+
+# Values of task priority, lowest first.
+TASK_PRIORITIES = range(4)
+
+
+class TaskOrdering(enum.Enum):
+    CREATED_AT = "created_at"
+    CREATED_AT_DESC = "-created_at"
+    MODIFIED_AT = "modified_at"
+    MODIFIED_AT_DESC = "-modified_at"
+    PRIORITY = "priority"
+    PRIORITY_DESC = "-priority"
+    DEADLINE = "deadline"
+    DEADLINE_DESC = "-deadline"
+    # Manual order; only for a single state.
+    RANK = "rank"
+
+
+class TaskBoardOrdering(enum.Enum):
+    PRIORITY = "-priority"
+    RANK = "rank"
+
+
+class TimelineZoom(enum.Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class TaskEventType(enum.Enum):
+    CREATED = "Created"
+    UPDATED = "Updated"
+    STATE_CHANGED = "State_Changed"
+    MOVED = "Moved"
+    ASSIGNEE_ADDED = "Assignee_Added"
+    ASSIGNEE_REMOVED = "Assignee_Removed"
+    DELETED = "Deleted"
@@ -0,0 +1,246 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import AsyncIterator, Sequence
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import Text, cast, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import settings
+from api.tasks.enums import TaskEventType
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "task_events"
+# Milliseconds clients wait before reconnecting a closed stream.
+RECONNECT_DELAY_MS = 3000
+
+
+async def notify_task_event(
+    ac: AsyncSession,
+    type: TaskEventType,
+    project_id: UUID,
+    task_id: UUID,
+    user_id: UUID | None = None,
+) -> None:
+    """Publish an event of a task, as part of the transaction changing it;
+    listeners get it once the transaction commits. `user_id` is the assignee of
+    assignee events."""
+    payload = {
+        "type": type.value,
+        "project_id": str(project_id),
+        "task_id": str(task_id),
+        "user_id": user_id and str(user_id),
+    }
+    await ac.execute(select(func.pg_notify(CHANNEL, json.dumps(payload))))
+
+
+async def notify_assignee_events(
+    ac: AsyncSession,
+    type: TaskEventType,
+    project_id: UUID,
+    task_id: UUID,
+    user_ids: Sequence[UUID],
+) -> None:
+    """Publish an assignee event of a task per user in a single statement."""
+    if not user_ids:
+        return
+
+    payloads = [
+        json.dumps(
+            {
+                "type": type.value,
+                "project_id": str(project_id),
+                "task_id": str(task_id),
+                "user_id": str(user_id),
+            }
+        )
+        for user_id in user_ids
+    ]
+    payload = func.unnest(cast(payloads, ARRAY(Text))).column_valued("payload")
+    await ac.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+class Subscription:
+    """Task events of a project for a single client, formatted as server-sent
+    events and buffered up to `max_queued`."""
+
+    def __init__(self, project_id: UUID, max_queued: int) -> None:
+        self.project_id = project_id
+        self.queue: asyncio.Queue[str | None] = asyncio.Queue(max_queued)
+
+    def put(self, message: str) -> bool:
+        """Queue a message, or close the subscription if the client fell too far
+        behind.
+
+        Returns:
+            bool: False if the subscription was closed.
+        """
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.close()
+            return False
+        return True
+
+    def close(self) -> None:
+        """Drop queued messages and tell the client to resync."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class TaskEventBroker:
+    """Fan task events out to subscribers of their project.
+
+    Every process holds a single connection listening on `CHANNEL`; events are
+    formatted once and queued to each subscriber of the project. A subscriber
+    whose queue is full, i.e. a client not reading fast enough, is cut off with
+    a `resync` event instead of holding events in memory, and so are all
+    subscribers when the connection is lost, since events may have been missed.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = settings.TASK_EVENTS_QUEUE_SIZE,
+        heartbeat_seconds: float = settings.TASK_EVENTS_HEARTBEAT_SECONDS,
+        max_stream_seconds: float = settings.TASK_EVENTS_MAX_STREAM_SECONDS,
+        reconnect_seconds: float = settings.TASK_EVENTS_RECONNECT_SECONDS,
+    ) -> None:
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_stream_seconds = max_stream_seconds
+        self.reconnect_seconds = reconnect_seconds
+
+        self.listening = False
+        # Counters, e.g. for load tests.
+        self.delivered = 0
+        self.cut_off = 0
+
+        self._subscriptions: defaultdict[UUID, set[Subscription]] = defaultdict(set)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    @property
+    def subscribers(self) -> int:
+        return sum(len(s) for s in self._subscriptions.values())
+
+    def subscribe(self, project_id: UUID) -> Subscription:
+        subscription = Subscription(project_id, self.queue_size)
+        self._subscriptions[project_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.project_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.project_id]
+
+    async def stream(self, project_id: UUID) -> AsyncIterator[str]:
+        """Server-sent events of a project until `max_stream_seconds` pass, with
+        a comment every `heartbeat_seconds` to keep the connection open."""
+        subscription = self.subscribe(project_id)
+        try:
+            yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+
+            loop = asyncio.get_running_loop()
+            closes_at = loop.time() + self.max_stream_seconds
+            while (remaining := closes_at - loop.time()) > 0:
+                try:
+                    message = await asyncio.wait_for(
+                        subscription.queue.get(),
+                        min(self.heartbeat_seconds, remaining),
+                    )
+                except TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+
+                if message is None:
+                    yield "event: resync\ndata: {}\n\n"
+                    return
+                yield message
+        finally:
+            self.unsubscribe(subscription)
+
+    def dispatch(self, payload: str) -> None:
+        """Queue an event, as published by `notify_task_event`, to subscribers
+        of its project."""
+        try:
+            project_id = UUID(json.loads(payload)["project_id"])
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Ignoring malformed task event: %s", payload)
+            return
+
+        message = f"event: task\ndata: {payload}\n\n"
+        for subscription in list(self._subscriptions.get(project_id, ())):
+            if subscription.put(message):
+                self.delivered += 1
+            else:
+                self.unsubscribe(subscription)
+                self.cut_off += 1
+
+    def _close_all(self) -> None:
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.close()
+        self._subscriptions.clear()
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        self.dispatch(payload)
+
+    async def _listen(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(
+                    user=settings.DATABASE_USERNAME,
+                    password=settings.DATABASE_PASSWORD,
+                    host=settings.DATABASE_HOST,
+                    port=settings.DATABASE_PORT,
+                    database=settings.DATABASE_NAME,
+                )
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(CHANNEL, self._on_notification)
+                self.listening = True
+                await self._watch(connection, closed)
+            except Exception:
+                logger.exception("Task events listener failed.")
+            finally:
+                if self.listening:
+                    self.listening = False
+                    self._close_all()
+                if connection is not None:
+                    connection.terminate()
+
+            await asyncio.sleep(self.reconnect_seconds)
+
+    async def _watch(self, connection: asyncpg.Connection, closed: asyncio.Event):
+        """Wait for the connection to close. An idle connection doesn't notice
+        its peer is gone, so it is checked at every heartbeat."""
+        while True:
+            try:
+                await asyncio.wait_for(closed.wait(), self.heartbeat_seconds)
+                return
+            except TimeoutError:
+                await asyncio.wait_for(
+                    connection.execute("SELECT 1"), self.heartbeat_seconds
+                )
+
+
+task_events = TaskEventBroker()
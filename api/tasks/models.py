@@ -2,17 +2,25 @@ from datetime import date, datetime
 from uuid import UUID
 
 from sqlalchemy import (
+    DDL,
     CheckConstraint,
     ForeignKey,
+    Index,
     PrimaryKeyConstraint,
+    bindparam,
+    event,
     func,
     text,
     types,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from api.database.models import BaseDatabaseModel, TimestampedModelMixin
-from api.tasks.enums import TaskState
+from api.search.utils import search_vector
+from api.tasks.enums import CLOSED_TASK_STATES, TaskState
+from api.tasks.ranks import DEFAULT_RANK, MAX_RANK_LENGTH
+from api.utils.ids import uuid7
 
 
 class Task(BaseDatabaseModel, TimestampedModelMixin):
@@ -22,6 +30,7 @@ class Task(BaseDatabaseModel, TimestampedModelMixin):
         types.Uuid,
         primary_key=True,
         init=False,
+        insert_default=uuid7,
         server_default=text("gen_random_uuid()"),
     )
 
@@ -37,6 +46,16 @@ class Task(BaseDatabaseModel, TimestampedModelMixin):
     state: Mapped[str] = mapped_column(types.Enum(TaskState), nullable=False)
     # Higher the priority value, higher the priority.
     priority: Mapped[int] = mapped_column(types.SmallInteger(), nullable=False)
+    # Manual position within the task's project and state; see `api.tasks.ranks`.
+    rank: Mapped[str] = mapped_column(
+        types.String(collation="C"),
+        nullable=False,
+        init=False,
+        server_default=DEFAULT_RANK,
+    )
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, search_vector("title", "description"), init=False, deferred=True
+    )
 
     __table_args__ = (
         CheckConstraint("finish_date >= start_date", "finish_date_gt_start_date"),
@@ -45,17 +64,194 @@ class Task(BaseDatabaseModel, TimestampedModelMixin):
             "state = 'COMPLETED' AND finish_date IS NOT NULL OR state != 'COMPLETED' AND finish_date IS NULL",
             "finish_date_present_if_done",
         ),
+        # Indexes backing filters and orderings of project tasks listing; see
+        # `TASK_QUERY_SHAPES` when adding one.
+        Index("ix_tasks_project_id_created_at", "project_id", "created_at"),
+        Index("ix_tasks_project_id_modified_at", "project_id", "modified_at"),
+        Index(
+            "ix_tasks_project_id_priority_created_at",
+            "project_id",
+            "priority",
+            "created_at",
+        ),
+        Index(
+            "ix_tasks_project_id_state_priority_created_at",
+            "project_id",
+            "state",
+            "priority",
+            "created_at",
+        ),
+        Index("ix_tasks_project_id_deadline", "project_id", "deadline"),
+        # Timeline; not a listing filter.
+        Index("ix_tasks_project_id_start_date", "project_id", "start_date"),
+        Index("ix_tasks_project_id_state_rank", "project_id", "state", "rank"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        # Open tasks by deadline, e.g. overdue ones. Must match `OPEN_TASK`.
+        Index(
+            "ix_tasks_open_project_id_deadline",
+            "project_id",
+            "deadline",
+            postgresql_where=text("state NOT IN ('COMPLETED', 'CANCELLED')"),
+        ),
+        # Columns due for rebalancing. Must match `LONG_RANK`.
+        Index(
+            "ix_tasks_long_rank_project_id_state",
+            "project_id",
+            "state",
+            postgresql_where=text(f"length(rank) > {MAX_RANK_LENGTH}"),
+        ),
     )
 
 
+# Values are rendered inline (not as bound parameters), so the planner can match
+# the partial index on open tasks even in generic plans of prepared statements.
+OPEN_TASK = Task.state.not_in(
+    bindparam("closed_states", CLOSED_TASK_STATES, literal_execute=True)
+)
+LONG_RANK = func.length(Task.rank) > bindparam(
+    "max_rank_length", MAX_RANK_LENGTH, literal_execute=True
+)
+
+
 class TaskAssignee(BaseDatabaseModel):
     __tablename__ = "task_assignees"
 
-    task_id: Mapped[UUID] = mapped_column(ForeignKey("tasks.id"), nullable=False)
-    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
+    task_id: Mapped[UUID] = mapped_column(
+        ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
         init=False,
         server_default=func.now(),
     )
 
-    __table_args__ = (PrimaryKeyConstraint("task_id", "user_id"),)
+    __table_args__ = (
+        PrimaryKeyConstraint("task_id", "user_id"),
+        # Tasks assigned to a user, most recent first; covers filtering tasks
+        # of a project by assignee as well.
+        Index(
+            "ix_task_assignees_user_id_created_at_task_id",
+            "user_id",
+            "created_at",
+            "task_id",
+        ),
+    )
+
+
+class TaskDependency(BaseDatabaseModel):
+    """Task `task_id` is blocked until task `depends_on_id` is done. Both belong
+    to project `project_id`, and dependencies never form a cycle."""
+
+    __tablename__ = "task_dependencies"
+
+    task_id: Mapped[UUID] = mapped_column(
+        ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False
+    )
+    depends_on_id: Mapped[UUID] = mapped_column(
+        ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False
+    )
+    # Copied from the tasks, so a project's graph is read without joining them.
+    project_id: Mapped[UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        init=False,
+        server_default=func.now(),
+    )
+
+    __table_args__ = (
+        PrimaryKeyConstraint("task_id", "depends_on_id"),
+        CheckConstraint("task_id != depends_on_id", "task_dependency_not_self"),
+        # Tasks depending on a task, walked when looking for cycles.
+        Index("ix_task_dependencies_depends_on_id", "depends_on_id"),
+        Index("ix_task_dependencies_project_id", "project_id"),
+    )
+
+
+class ProjectTaskStats(BaseDatabaseModel):
+    """Number of tasks of a project per state, kept up to date by `TaskService`.
+
+    See `api.tasks.stats` for checking and rebuilding it from `tasks`.
+    """
+
+    __tablename__ = "project_task_stats"
+
+    project_id: Mapped[UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    state: Mapped[TaskState] = mapped_column(types.Enum(TaskState), nullable=False)
+    task_count: Mapped[int] = mapped_column(types.Integer(), nullable=False)
+
+    __table_args__ = (PrimaryKeyConstraint("project_id", "state"),)
+
+
+class ProjectTaskSnapshot(BaseDatabaseModel):
+    """Number of open and completed tasks of a project at the end of a past day,
+    for burndown charts. Written once, when first read; see
+    `TaskAnalyticsService.get_burndown`."""
+
+    __tablename__ = "project_task_snapshots"
+
+    project_id: Mapped[UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    day: Mapped[date] = mapped_column(types.Date(), nullable=False)
+    open: Mapped[int] = mapped_column(types.Integer(), nullable=False)
+    completed: Mapped[int] = mapped_column(types.Integer(), nullable=False)
+
+    __table_args__ = (PrimaryKeyConstraint("project_id", "day"),)
+
+
+class TaskStateTransition(BaseDatabaseModel):
+    """Append-only history of task states; a row per state a task entered.
+
+    Partitioned by month of `created_at`; see `api.database.partitions`.
+    """
+
+    __tablename__ = "task_state_transitions"
+
+    id: Mapped[UUID] = mapped_column(
+        types.Uuid,
+        init=False,
+        insert_default=uuid7,
+        server_default=text("gen_random_uuid()"),
+    )
+    task_id: Mapped[UUID] = mapped_column(
+        ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False
+    )
+    # Copied from the task, so analytics of a project don't need to join tasks.
+    project_id: Mapped[UUID] = mapped_column(types.Uuid, nullable=False)
+    # Null for the state a task was created with.
+    from_state: Mapped[TaskState | None] = mapped_column(
+        types.Enum(TaskState), nullable=True
+    )
+    to_state: Mapped[TaskState] = mapped_column(types.Enum(TaskState), nullable=False)
+    changed_by_id: Mapped[UUID | None] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        init=False,
+        server_default=func.now(),
+    )
+
+    __table_args__ = (
+        # The partition key must be part of the primary key.
+        PrimaryKeyConstraint("id", "created_at"),
+        Index(
+            "ix_task_state_transitions_project_id_created_at",
+            "project_id",
+            "created_at",
+        ),
+        Index("ix_task_state_transitions_task_id_created_at", "task_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+# Tables created from models (e.g. in tests) get a default partition only.
+event.listen(
+    TaskStateTransition.__table__,
+    "after_create",
+    DDL("CREATE TABLE %(table)s_default PARTITION OF %(table)s DEFAULT"),
+)
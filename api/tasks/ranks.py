@@ -0,0 +1,88 @@
+"""Fractional ranks ordering tasks within a column (project and state).
+
+Ranks are strings of base 62 digits compared byte-wise (the column has "C"
+collation), so a rank fitting between any two others always exists and moving
+a task only rewrites its own rank. Ranks never end with the zero digit, which
+would leave no room right before them.
+"""
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+# Rank of tasks which weren't placed explicitly, e.g. inserted by hand.
+DEFAULT_RANK = DIGITS[len(DIGITS) // 2]
+# Columns with ranks longer than this are rebalanced; see `api.tasks.rebalance`.
+# Used in a partial index predicate, so changing it needs a migration.
+MAX_RANK_LENGTH = 12
+
+
+def _midpoint(low: str, high: str | None) -> str:
+    """Rank between `low` ("" for the very start) and `high` (None for the
+    very end); `low` must be less than `high`."""
+    if high is not None:
+        prefix = 0
+        while prefix < len(high) and (low[prefix : prefix + 1] or "0") == high[prefix]:
+            prefix += 1
+        if prefix:
+            return high[:prefix] + _midpoint(low[prefix:], high[prefix:])
+
+    low_digit = DIGITS.index(low[0]) if low else 0
+    high_digit = DIGITS.index(high[0]) if high is not None else len(DIGITS)
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit + 1) // 2]
+    # Adjacent digits; keep the first one and go one digit further.
+    if high is not None and len(high) > 1:
+        return high[:1]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def rank_after(rank: str) -> str:
+    """Short rank following `rank`, for appending to a column. It grows by a
+    digit every 61 appends, rather than every few as halving gaps would."""
+    for i, digit in enumerate(rank):
+        if digit != DIGITS[-1]:
+            return rank[:i] + DIGITS[DIGITS.index(digit) + 1]
+    return rank + DEFAULT_RANK
+
+
+def rank_before(rank: str) -> str:
+    """Short rank preceding `rank`, for prepending to a column."""
+    for i, digit in enumerate(rank):
+        if digit > DIGITS[1]:
+            return rank[:i] + DIGITS[DIGITS.index(digit) - 1]
+    return _midpoint("", rank)
+
+
+def rank_between(low: str | None, high: str | None) -> str:
+    """Rank between two neighbours, either of which may be missing at the ends
+    of a column.
+
+    Raises:
+        ValueError: When `low` is not less than `high`.
+    """
+    if low is None and high is None:
+        return DEFAULT_RANK
+    if low is None:
+        return rank_before(high)
+    if high is None:
+        return rank_after(low)
+    if low >= high:
+        raise ValueError(f"No rank fits between {low!r} and {high!r}.")
+    return _midpoint(low, high)
+
+
+def spread_ranks(count: int) -> list[str]:
+    """`count` ranks of equal length, evenly spread with room for a few
+    insertions between any two of them."""
+    length = 1
+    while len(DIGITS) ** length < len(DIGITS) * (count + 1):
+        length += 1
+
+    step = len(DIGITS) ** length // (count + 1)
+    ranks = []
+    for n in range(1, count + 1):
+        value, digits = n * step, []
+        for _ in range(length):
+            value, digit = divmod(value, len(DIGITS))
+            digits.append(DIGITS[digit])
+        # Dropping trailing zeros keeps the order of equally long ranks.
+        ranks.append("".join(reversed(digits)).rstrip(DIGITS[0]))
+    return ranks
@@ -0,0 +1,104 @@
+"""Rebalance task ranks which grew longer than `MAX_RANK_LENGTH`.
+
+Repeatedly placing tasks at the same spot lengthens their ranks by a digit every
+few moves; rebalancing spreads the ranks of a column evenly again. It's cheap
+for columns without long ranks, which are skipped by a partial index, so run it
+periodically (e.g. from a cron job).
+
+Usage:
+    python -m api.tasks.rebalance
+"""
+
+import argparse
+import asyncio
+from uuid import UUID
+
+from sqlalchemy import cast, column, func, select, types, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.setup import AsyncSessionLocal
+from api.tasks.enums import TaskState
+from api.tasks.models import LONG_RANK, Task
+from api.tasks.ranks import spread_ranks
+
+
+async def lock_column(ac: AsyncSession, project_id: UUID, state: TaskState) -> None:
+    """Serialize placing tasks in a column until the transaction ends, so ranks
+    are computed from neighbours which stay put."""
+    await ac.execute(
+        select(
+            func.pg_advisory_xact_lock(
+                func.hashtextextended(f"tasks:{project_id}:{state.name}", 0)
+            )
+        )
+    )
+
+
+async def rebalance_column(ac: AsyncSession, project_id: UUID, state: TaskState) -> int:
+    """Give tasks of a column evenly spread ranks, keeping their order.
+
+    Returns:
+        int: Number of tasks in the column.
+    """
+    await lock_column(ac, project_id, state)
+    ids = (
+        (
+            await ac.execute(
+                select(Task.id)
+                .where(Task.project_id == project_id, Task.state == state)
+                .order_by(Task.rank, Task.id)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    if not ids:
+        return 0
+
+    # Passed as two arrays, since a column may have more tasks than the bound
+    # parameters a statement can take.
+    ranks = (
+        func.unnest(
+            cast(ids, ARRAY(types.Uuid)),
+            cast(spread_ranks(len(ids)), ARRAY(types.String)),
+        )
+        .table_valued(column("id", types.Uuid), column("rank", types.String))
+        .render_derived(name="ranks", with_types=False)
+    )
+    await ac.execute(
+        update(Task).where(Task.id == ranks.c.id).values(rank=ranks.c.rank)
+    )
+    return len(ids)
+
+
+async def run() -> tuple[int, int]:
+    """Rebalance every column with long ranks, one per transaction.
+
+    Returns:
+        tuple[int, int]: Number of rebalanced columns and of their tasks.
+    """
+    columns = tasks = 0
+    while True:
+        async with AsyncSessionLocal.begin() as ac:
+            found = (
+                await ac.execute(
+                    select(Task.project_id, Task.state).where(LONG_RANK).limit(1)
+                )
+            ).one_or_none()
+            if found is None:
+                return columns, tasks
+            tasks += await rebalance_column(ac, *found)
+        columns += 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    columns, tasks = asyncio.run(run())
+    print(f"Rebalanced {tasks} task(s) in {columns} column(s).")
+
+
+if __name__ == "__main__":
+    main()
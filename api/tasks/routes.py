@@ -1,26 +1,52 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, Path, status
+from fastapi import Depends, HTTPException, Path, Query, status
+from fastapi.responses import StreamingResponse
 from fastapi.routing import APIRouter
 
 from api.orgs.permissions import OrganizationPermissionService
 from api.orgs.services import OrganizationService
 from api.projects.permissions import ProjectPermissionService
 from api.projects.services import ProjectService
+from api.tasks.analytics import TaskAnalyticsService
+from api.tasks.dependencies import TaskDependencyService
+from api.tasks.enums import TaskState
+from api.tasks.events import task_events
 from api.tasks.models import Task
 from api.tasks.permissions import TaskPermissionService
 from api.tasks.schemas import (
+    AssignedTaskItem,
+    AssignedTaskParams,
+    CriticalPathResponse,
+    ProjectTaskStatsResponse,
+    TaskAnalyticsParams,
     TaskAssigneeCreateOrDeleteRequest,
+    TaskAssigneesReplaceRequest,
+    TaskAssigneesUpdateRequest,
+    TaskBoardColumn,
+    TaskBoardColumnParams,
+    TaskBoardParams,
+    TaskBoardResponse,
+    TaskBurndownResponse,
     TaskCreateRequest,
+    TaskCycleTimeResponse,
+    TaskDependenciesResponse,
+    TaskDependencyCreateOrDeleteRequest,
+    TaskFilterParams,
+    TaskMoveRequest,
     TaskPaginationItem,
     TaskSingleResponse,
     TaskStateUpdateRequest,
+    TaskTimeInStateResponse,
+    TaskTimelineParams,
+    TaskTimelineResponse,
     TaskUpdateRequest,
 )
 from api.tasks.services import TaskService
+from api.tasks.timeline import TaskTimelineService
 from api.users.auth.dependencies import AuthenticatedUser
-from api.utils.pagination import PaginatedResponse, PaginationQueryParams
+from api.utils.pagination import CursorPaginatedResponse, PaginatedResponse
 from api.utils.permissions import check_permission
 
 router = APIRouter(prefix="", tags=["Tasks"])
@@ -33,7 +59,7 @@ router = APIRouter(prefix="", tags=["Tasks"])
 )
 async def get_project_tasks(
     organization_service: Annotated[OrganizationService, Depends()],
-    pagination_params: PaginationQueryParams,
+    filter_params: Annotated[TaskFilterParams, Query()],
     project_id: Annotated[UUID, Path()],
     project_service: Annotated[ProjectService, Depends()],
     permission_service: Annotated[ProjectPermissionService, Depends()],
@@ -52,7 +78,315 @@ async def get_project_tasks(
         user=user,
     )
 
-    return await task_service.get_tasks_for_project(project_id, pagination_params)
+    return await task_service.get_tasks_for_project(project_id, filter_params)
+
+
+@router.get(
+    "/users/me/tasks",
+    response_model=CursorPaginatedResponse[AssignedTaskItem],
+    status_code=status.HTTP_200_OK,
+)
+async def get_assigned_tasks(
+    params: Annotated[AssignedTaskParams, Query()],
+    task_service: Annotated[TaskService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Get tasks assigned to current user across all projects and organizations."""
+    return await task_service.get_assigned_tasks(user.id, params)
+
+
+@router.get(
+    "/projects/{project_id}/board",
+    response_model=TaskBoardResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project_board(
+    organization_service: Annotated[OrganizationService, Depends()],
+    params: Annotated[TaskBoardParams, Query()],
+    project_id: Annotated[UUID, Path()],
+    project_service: Annotated[ProjectService, Depends()],
+    permission_service: Annotated[ProjectPermissionService, Depends()],
+    task_service: Annotated[TaskService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Get tasks of a project grouped by state, with the total count and first tasks of each state."""
+    project = await project_service.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    organization = await organization_service.get_organization(project.organization_id)
+    await check_permission(
+        permission_service.is_project_participant_or_organization_manager,
+        organization=organization,
+        project=project,
+        user=user,
+    )
+
+    return {
+        "columns": await task_service.get_board(
+            project.id, params.page_size, order_by=params.order_by
+        )
+    }
+
+
+@router.get(
+    "/projects/{project_id}/board/{state}",
+    response_model=TaskBoardColumn,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project_board_column(
+    organization_service: Annotated[OrganizationService, Depends()],
+    params: Annotated[TaskBoardColumnParams, Query()],
+    project_id: Annotated[UUID, Path()],
+    state: Annotated[TaskState, Path()],
+    project_service: Annotated[ProjectService, Depends()],
+    permission_service: Annotated[ProjectPermissionService, Depends()],
+    task_service: Annotated[TaskService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Get a single column of the board, e.g. to load more tasks with a cursor."""
+    project = await project_service.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    organization = await organization_service.get_organization(project.organization_id)
+    await check_permission(
+        permission_service.is_project_participant_or_organization_manager,
+        organization=organization,
+        project=project,
+        user=user,
+    )
+
+    (column,) = await task_service.get_board(
+        project.id,
+        params.page_size,
+        states=[state],
+        cursor=params.cursor,
+        order_by=params.order_by,
+    )
+    return column
+
+
+@router.get(
+    "/projects/{project_id}/stats",
+    response_model=ProjectTaskStatsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project_stats(
+    organization_service: Annotated[OrganizationService, Depends()],
+    project_id: Annotated[UUID, Path()],
+    project_service: Annotated[ProjectService, Depends()],
+    permission_service: Annotated[ProjectPermissionService, Depends()],
+    task_service: Annotated[TaskService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Get number of tasks of a project per state, overdue and percent complete."""
+    project = await project_service.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    organization = await organization_service.get_organization(project.organization_id)
+    await check_permission(
+        permission_service.is_project_participant_or_organization_manager,
+        organization=organization,
+        project=project,
+        user=user,
+    )
+
+    return await task_service.get_project_stats(project.id)
+
+
+@router.get(
+    "/projects/{project_id}/events",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project_events(
+    organization_service: Annotated[OrganizationService, Depends()],
+    project_id: Annotated[UUID, Path()],
+    project_service: Annotated[ProjectService, Depends()],
+    permission_service: Annotated[ProjectPermissionService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Stream changes of a project's tasks as server-sent events, as they are
+    committed. Events only carry ids; changed tasks are fetched separately.
+    Note: a `resync` event means events were missed, e.g. the client fell behind;
+    the client should sync (e.g. through the change feed) and reconnect."""
+    project = await project_service.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    organization = await organization_service.get_organization(project.organization_id)
+    await check_permission(
+        permission_service.is_project_participant_or_organization_manager,
+        organization=organization,
+        project=project,
+        user=user,
+    )
+
+    if not task_events.listening:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Live updates are unavailable.",
+        )
+
+    return StreamingResponse(
+        task_events.stream(project.id),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/projects/{project_id}/critical-path",
+    response_model=CriticalPathResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project_critical_path(
+    dependency_service: Annotated[TaskDependencyService, Depends()],
+    organization_service: Annotated[OrganizationService, Depends()],
+    project_id: Annotated[UUID, Path()],
+    project_service: Annotated[ProjectService, Depends()],
+    permission_service: Annotated[ProjectPermissionService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Get the earliest date tasks of a project can be done by, given their
+    dependencies, and the chain of tasks deciding it."""
+    project = await project_service.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    organization = await organization_service.get_organization(project.organization_id)
+    await check_permission(
+        permission_service.is_project_participant_or_organization_manager,
+        organization=organization,
+        project=project,
+        user=user,
+    )
+
+    return await dependency_service.get_critical_path(project.id)
+
+
+@router.get(
+    "/projects/{project_id}/timeline",
+    response_model=TaskTimelineResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project_timeline(
+    organization_service: Annotated[OrganizationService, Depends()],
+    params: Annotated[TaskTimelineParams, Query()],
+    project_id: Annotated[UUID, Path()],
+    project_service: Annotated[ProjectService, Depends()],
+    permission_service: Annotated[ProjectPermissionService, Depends()],
+    timeline_service: Annotated[TaskTimelineService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Get every scheduled task of a project overlapping a date window, with
+    its dates, state and assignees, bucketed by day, week or month."""
+    project = await project_service.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    organization = await organization_service.get_organization(project.organization_id)
+    await check_permission(
+        permission_service.is_project_participant_or_organization_manager,
+        organization=organization,
+        project=project,
+        user=user,
+    )
+
+    return await timeline_service.get_timeline(project.id, params)
+
+
+@router.get(
+    "/projects/{project_id}/analytics/cycle-time",
+    response_model=TaskCycleTimeResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project_cycle_time(
+    analytics_service: Annotated[TaskAnalyticsService, Depends()],
+    organization_service: Annotated[OrganizationService, Depends()],
+    params: Annotated[TaskAnalyticsParams, Query()],
+    project_id: Annotated[UUID, Path()],
+    project_service: Annotated[ProjectService, Depends()],
+    permission_service: Annotated[ProjectPermissionService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Get cycle and lead time percentiles of tasks completed in last days."""
+    project = await project_service.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    organization = await organization_service.get_organization(project.organization_id)
+    await check_permission(
+        permission_service.is_project_participant_or_organization_manager,
+        organization=organization,
+        project=project,
+        user=user,
+    )
+
+    return await analytics_service.get_cycle_time(project.id, params.days)
+
+
+@router.get(
+    "/projects/{project_id}/analytics/time-in-state",
+    response_model=TaskTimeInStateResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project_time_in_state(
+    analytics_service: Annotated[TaskAnalyticsService, Depends()],
+    organization_service: Annotated[OrganizationService, Depends()],
+    params: Annotated[TaskAnalyticsParams, Query()],
+    project_id: Annotated[UUID, Path()],
+    project_service: Annotated[ProjectService, Depends()],
+    permission_service: Annotated[ProjectPermissionService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Get time tasks of a project spent in each state in last days."""
+    project = await project_service.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    organization = await organization_service.get_organization(project.organization_id)
+    await check_permission(
+        permission_service.is_project_participant_or_organization_manager,
+        organization=organization,
+        project=project,
+        user=user,
+    )
+
+    return await analytics_service.get_time_in_state(project.id, params.days)
+
+
+@router.get(
+    "/projects/{project_id}/analytics/burndown",
+    response_model=TaskBurndownResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project_burndown(
+    analytics_service: Annotated[TaskAnalyticsService, Depends()],
+    organization_service: Annotated[OrganizationService, Depends()],
+    project_id: Annotated[UUID, Path()],
+    project_service: Annotated[ProjectService, Depends()],
+    permission_service: Annotated[ProjectPermissionService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Get open and completed tasks at the end of each day of the project's
+    schedule, for burndown and burnup charts."""
+    project = await project_service.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    organization = await organization_service.get_organization(project.organization_id)
+    await check_permission(
+        permission_service.is_project_participant_or_organization_manager,
+        organization=organization,
+        project=project,
+        user=user,
+    )
+
+    return await analytics_service.get_burndown(project)
 
 
 @router.post(
@@ -82,7 +416,7 @@ async def create_task(
     )
 
     created_task = await task_service.create_task(
-        Task(**body.model_dump(), project_id=project.id)
+        Task(**body.model_dump(), project_id=project.id), user_id=user.id
     )
 
     setattr(created_task, "assignees", [])  # Required for pydantic serialization
@@ -150,7 +484,7 @@ async def update_task(
     for k, v in body.model_dump().items():
         setattr(task, k, v)
 
-    task = await task_service.update_task(task)
+    task = await task_service.update_task(task, user_id=user.id)
 
     setattr(task, "assignees", assignees)  # Required for pydantic serialization
 
@@ -222,7 +556,42 @@ async def set_task_state(
     for k, v in body.model_dump().items():
         setattr(task, k, v)
 
-    task = await task_service.update_task(task)
+    task = await task_service.update_task(task, user_id=user.id)
+
+    setattr(task, "assignees", assignees)
+
+    return task
+
+
+@router.put(
+    "/tasks/{task_id}/rank",
+    response_model=TaskSingleResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def move_task(
+    body: TaskMoveRequest,
+    task_id: Annotated[UUID, Path()],
+    permission_service: Annotated[ProjectPermissionService, Depends()],
+    task_service: Annotated[TaskService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Place a task right after another task of its column, or first."""
+    result = await task_service.get_task_with_project_and_organization_and_assignees(
+        task_id
+    )
+
+    if not result:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    task, assignees, project, organization = result
+    await check_permission(
+        permission_service.is_project_participant_or_organization_manager,
+        organization=organization,
+        project=project,
+        user=user,
+    )
+
+    task = await task_service.move_task(task, body.after_id)
 
     setattr(task, "assignees", assignees)
 
@@ -277,3 +646,141 @@ async def delete_task_assignee(
     )
 
     await task_service.delete_task_assignee(task, body.user_id)
+
+
+@router.patch("/tasks/{task_id}/assignees", status_code=status.HTTP_204_NO_CONTENT)
+async def update_task_assignees(
+    body: TaskAssigneesUpdateRequest,
+    task_id: Annotated[UUID, Path()],
+    permission_service: Annotated[OrganizationPermissionService, Depends()],
+    task_service: Annotated[TaskService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Add and remove many assignees of a task at once."""
+    result = await task_service.get_task_with_project_and_organization_and_assignees(
+        task_id
+    )
+
+    if not result:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    task, _, _, organization = result
+    await check_permission(
+        permission_service.is_organization_manager,
+        organization=organization,
+        user=user,
+    )
+
+    await task_service.update_task_assignees(task, body.add, body.remove)
+
+
+@router.put("/tasks/{task_id}/assignees", status_code=status.HTTP_204_NO_CONTENT)
+async def replace_task_assignees(
+    body: TaskAssigneesReplaceRequest,
+    task_id: Annotated[UUID, Path()],
+    permission_service: Annotated[OrganizationPermissionService, Depends()],
+    task_service: Annotated[TaskService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Replace all assignees of a task atomically."""
+    result = await task_service.get_task_with_project_and_organization_and_assignees(
+        task_id
+    )
+
+    if not result:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    task, _, _, organization = result
+    await check_permission(
+        permission_service.is_organization_manager,
+        organization=organization,
+        user=user,
+    )
+
+    await task_service.replace_task_assignees(task, body.user_ids)
+
+
+@router.get(
+    "/tasks/{task_id}/dependencies",
+    response_model=TaskDependenciesResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_task_dependencies(
+    task_id: Annotated[UUID, Path()],
+    dependency_service: Annotated[TaskDependencyService, Depends()],
+    permission_service: Annotated[ProjectPermissionService, Depends()],
+    task_service: Annotated[TaskService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Get tasks a task waits for, and tasks waiting for it."""
+    result = await task_service.get_task_with_project_and_organization_and_assignees(
+        task_id
+    )
+
+    if not result:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    task, _, project, organization = result
+    await check_permission(
+        permission_service.is_project_participant_or_organization_manager,
+        organization=organization,
+        project=project,
+        user=user,
+    )
+
+    return await dependency_service.get_dependencies(task.id)
+
+
+@router.post("/tasks/{task_id}/dependencies", status_code=status.HTTP_204_NO_CONTENT)
+async def add_task_dependency(
+    body: TaskDependencyCreateOrDeleteRequest,
+    task_id: Annotated[UUID, Path()],
+    dependency_service: Annotated[TaskDependencyService, Depends()],
+    permission_service: Annotated[ProjectPermissionService, Depends()],
+    task_service: Annotated[TaskService, Depends()],
+    user: AuthenticatedUser,
+):
+    """Make a task wait for another task of its project."""
+    result = await task_service.get_task_with_project_and_organization_and_assignees(
+        task_id
+    )
+
+    if not result:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    task, _, project, organization = result
+    await check_permission(
+        permission_service.is_project_participant_or_organization_manager,
+        organization=organization,
+        project=project,
+        user=user,
+    )
+
+    await dependency_service.add_dependency(task, body.depends_on_id)
+
+
+@router.delete("/tasks/{task_id}/dependencies", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_task_dependency(
+    body: TaskDependencyCreateOrDeleteRequest,
+    task_id: Annotated[UUID, Path()],
+    dependency_service: Annotated[TaskDependencyService, Depends()],
+    permission_service: Annotated[ProjectPermissionService, Depends()],
+    task_service: Annotated[TaskService, Depends()],
+    user: AuthenticatedUser,
+):
+    result = await task_service.get_task_with_project_and_organization_and_assignees(
+        task_id
+    )
+
+    if not result:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    task, _, project, organization = result
+    await check_permission(
+        permission_service.is_project_participant_or_organization_manager,
+        organization=organization,
+        project=project,
+        user=user,
+    )
+
+    await dependency_service.delete_dependency(task, body.depends_on_id)
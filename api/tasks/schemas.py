@@ -3,7 +3,18 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, model_validator
 
-from api.tasks.enums import TaskState
+from api.tasks.enums import (
+    TASK_PRIORITIES,
+    TaskBoardOrdering,
+    TaskOrdering,
+    TaskState,
+    TimelineZoom,
+)
+from api.utils.pagination import (
+    DEFAULT_PER_PAGE,
+    CursorPaginationParams,
+    PaginationParams,
+)
 
 
 class TaskPaginationItemUser(BaseModel):
@@ -25,6 +36,7 @@ class TaskPaginationItem(BaseModel):
     deadline: datetime | None
     state: TaskState
     priority: int
+    rank: str
     assignees: list[TaskPaginationItemUser]
     created_at: datetime
     modified_at: datetime
@@ -39,7 +51,7 @@ class TaskCreateRequest(BaseModel):
     finish_date: datetime | None
     deadline: datetime | None
     state: TaskState
-    priority: int = Field(ge=0, le=3)
+    priority: int = Field(ge=TASK_PRIORITIES[0], le=TASK_PRIORITIES[-1])
 
     @model_validator(mode="after")
     def validate_end_date_lt_start_date(self):
@@ -74,6 +86,7 @@ class TaskSingleResponse(BaseModel):
     deadline: datetime | None
     state: TaskState
     priority: int
+    rank: str
     assignees: list[TaskPaginationItemUser]
     created_at: datetime
     modified_at: datetime
@@ -88,7 +101,7 @@ class TaskUpdateRequest(BaseModel):
     finish_date: datetime | None
     deadline: datetime | None
     state: TaskState
-    priority: int = Field(ge=0, le=3)
+    priority: int = Field(ge=TASK_PRIORITIES[0], le=TASK_PRIORITIES[-1])
 
     @model_validator(mode="after")
     def validate_end_date_lt_start_date(self):
@@ -132,3 +145,343 @@ class TaskStateUpdateRequest(BaseModel):
 
 class TaskAssigneeCreateOrDeleteRequest(BaseModel):
     user_id: UUID
+
+
+MAX_BULK_ASSIGNEES = 1000
+
+
+class TaskAssigneesUpdateRequest(BaseModel):
+    add: list[UUID] = Field(default=[], max_length=MAX_BULK_ASSIGNEES)
+    remove: list[UUID] = Field(default=[], max_length=MAX_BULK_ASSIGNEES)
+
+    @model_validator(mode="after")
+    def validate_users(self):
+        if set(self.add) & set(self.remove):
+            raise ValueError("Users can't be both added and removed.")
+
+        return self
+
+
+class TaskAssigneesReplaceRequest(BaseModel):
+    # Every assignee of the task; others are removed.
+    user_ids: list[UUID] = Field(max_length=MAX_BULK_ASSIGNEES)
+
+
+class TaskDependencyCreateOrDeleteRequest(BaseModel):
+    # Task of the same project which has to be done first.
+    depends_on_id: UUID
+
+
+class TaskDependenciesResponse(BaseModel):
+    # Tasks this task waits for.
+    depends_on: list[UUID]
+    # Tasks waiting for this task.
+    dependents: list[UUID]
+
+
+class TaskMoveRequest(BaseModel):
+    # Task of the same project and state to place the task after; the task
+    # goes first if not given.
+    after_id: UUID | None
+
+
+_ALL_ORDERINGS = frozenset(TaskOrdering) - {TaskOrdering.RANK}
+_BY_DEADLINE = frozenset({TaskOrdering.DEADLINE, TaskOrdering.DEADLINE_DESC})
+_BY_PRIORITY_OR_CREATED_AT = frozenset(
+    {
+        TaskOrdering.PRIORITY,
+        TaskOrdering.PRIORITY_DESC,
+        TaskOrdering.CREATED_AT,
+        TaskOrdering.CREATED_AT_DESC,
+    }
+)
+
+# Combinations of filters allowed together, along with the orderings allowed for
+# them. Each one is served by an index on `tasks` (see `Task.__table_args__`), so
+# a request never ends up scanning and sorting every task of a big project.
+# Filtering by assignee starts from the assignee's (few) tasks instead.
+TASK_QUERY_SHAPES: dict[frozenset[str], frozenset[TaskOrdering]] = {
+    frozenset(): _ALL_ORDERINGS,
+    frozenset({"state"}): _BY_PRIORITY_OR_CREATED_AT | {TaskOrdering.RANK},
+    frozenset({"priority"}): _BY_PRIORITY_OR_CREATED_AT,
+    frozenset({"state", "priority"}): _BY_PRIORITY_OR_CREATED_AT,
+    frozenset({"deadline"}): _BY_DEADLINE,
+    frozenset({"overdue"}): _BY_DEADLINE,
+    frozenset({"assignee_id"}): _ALL_ORDERINGS,
+    frozenset({"assignee_id", "state"}): _ALL_ORDERINGS | {TaskOrdering.RANK},
+    frozenset({"assignee_id", "overdue"}): _BY_DEADLINE,
+}
+
+
+class TaskFilterParams(PaginationParams):
+    """Query params of project tasks listing, pagination included since FastAPI
+    accepts a single query params model per route."""
+
+    state: list[TaskState] | None = Field(None)
+    priority_min: int | None = Field(
+        None, ge=TASK_PRIORITIES[0], le=TASK_PRIORITIES[-1]
+    )
+    priority_max: int | None = Field(
+        None, ge=TASK_PRIORITIES[0], le=TASK_PRIORITIES[-1]
+    )
+    deadline_from: date | None = Field(None)
+    deadline_to: date | None = Field(None)
+    # Open tasks whose deadline has passed.
+    overdue: bool = Field(False)
+    assignee_id: UUID | None = Field(None)
+    order_by: TaskOrdering = Field(TaskOrdering.CREATED_AT_DESC)
+
+    @property
+    def filters(self) -> frozenset[str]:
+        """Names of the filters in use, ranges counted once."""
+        filters = set()
+
+        if self.state:
+            filters.add("state")
+        if self.priority_min is not None or self.priority_max is not None:
+            filters.add("priority")
+        if self.deadline_from or self.deadline_to:
+            filters.add("deadline")
+        if self.overdue:
+            filters.add("overdue")
+        if self.assignee_id:
+            filters.add("assignee_id")
+
+        return frozenset(filters)
+
+    @model_validator(mode="after")
+    def validate_ranges(self):
+        if (
+            self.priority_min is not None
+            and self.priority_max is not None
+            and self.priority_min > self.priority_max
+        ):
+            raise ValueError("Minimum priority must not be greater than maximum.")
+
+        if (
+            self.deadline_from
+            and self.deadline_to
+            and self.deadline_from > self.deadline_to
+        ):
+            raise ValueError("Deadline window must not end before it starts.")
+
+        return self
+
+    @model_validator(mode="after")
+    def validate_shape(self):
+        orderings = TASK_QUERY_SHAPES.get(self.filters)
+
+        if orderings is None:
+            raise ValueError(
+                f"Filtering by {', '.join(sorted(self.filters))} at once is not supported."
+            )
+
+        if self.order_by not in orderings:
+            raise ValueError(
+                f"Ordering by {self.order_by.value} is not supported with given filters."
+            )
+
+        # Ranks are only comparable within a column.
+        if self.order_by == TaskOrdering.RANK and len(self.state) > 1:
+            raise ValueError("Ordering by rank requires a single state.")
+
+        return self
+
+
+class TaskBoardParams(BaseModel):
+    # Number of tasks returned per column.
+    page_size: int = Field(ge=1, le=50, default=DEFAULT_PER_PAGE)
+    order_by: TaskBoardOrdering = Field(TaskBoardOrdering.PRIORITY)
+
+
+class TaskBoardColumnParams(TaskBoardParams):
+    cursor: str | None = Field(None)
+
+
+class TaskBoardColumn(BaseModel):
+    """Tasks of a single state ordered by priority (highest first) or rank.
+    Pass `next_cursor` to the column route, with the same ordering, to load
+    more."""
+
+    state: TaskState
+    count: int
+    next_cursor: str | None
+    items: list[TaskPaginationItem]
+
+
+class TaskBoardResponse(BaseModel):
+    columns: list[TaskBoardColumn]
+
+
+class ProjectTaskStatsResponse(BaseModel):
+    total: int
+    # Every state is present, with zero if the project has no tasks in it.
+    states: dict[TaskState, int]
+    # Open tasks past their deadline.
+    overdue: int
+    # Completed tasks out of those not cancelled, as a percentage.
+    percent_complete: float
+
+
+class TaskAnalyticsParams(BaseModel):
+    # Tasks are considered by their transitions in this many last days.
+    days: int = Field(ge=1, le=365, default=90)
+
+
+class DurationPercentiles(BaseModel):
+    """Percentiles of a duration in seconds; null if there was nothing to measure."""
+
+    p50: float | None
+    p75: float | None
+    p90: float | None
+    p95: float | None
+
+
+class TaskCycleTimeResponse(BaseModel):
+    days: int
+    # Number of tasks completed in the period.
+    completed: int
+    # From first moving to `In_Progress` until completion; tasks which were
+    # never in progress are left out.
+    cycle_time: DurationPercentiles
+    # From creation until completion.
+    lead_time: DurationPercentiles
+
+
+class TaskTimeInState(BaseModel):
+    """Seconds tasks spent in a state, out of the times it was left."""
+
+    state: TaskState
+    transitions: int
+    average: float
+    p50: float
+    p90: float
+
+
+class TaskTimeInStateResponse(BaseModel):
+    days: int
+    states: list[TaskTimeInState]
+
+
+class TaskBurndownResponse(BaseModel):
+    """Open and completed tasks at the end of each day, as parallel arrays, from
+    the project's start date (or creation) up to its deadline or today,
+    whichever comes first. Cancelled tasks count as neither."""
+
+    start: date
+    deadline: date | None
+    days: list[date]
+    open: list[int]
+    completed: list[int]
+
+
+class CriticalPathTask(BaseModel):
+    id: UUID
+    earliest_start: date
+    earliest_finish: date
+
+
+class CriticalPathResponse(BaseModel):
+    # Earliest date every task (cancelled ones aside) can be done by; null if
+    # the project has no tasks.
+    earliest_finish: date | None
+    # Chain of dependent tasks ending with the task finishing last, first to
+    # be done first.
+    path: list[CriticalPathTask]
+
+
+# Longest timeline window per zoom level, in days: about a year of days, two
+# of weeks and ten of months.
+MAX_TIMELINE_DAYS = {
+    TimelineZoom.DAY: 366,
+    TimelineZoom.WEEK: 731,
+    TimelineZoom.MONTH: 3653,
+}
+
+
+class TaskTimelineParams(BaseModel):
+    start: date
+    finish: date
+    zoom: TimelineZoom = Field(TimelineZoom.WEEK)
+
+    @model_validator(mode="after")
+    def validate_window(self):
+        if self.finish < self.start:
+            raise ValueError("Finish must not be before start.")
+
+        if (self.finish - self.start).days >= MAX_TIMELINE_DAYS[self.zoom]:
+            raise ValueError("Window is too long for given zoom level.")
+
+        return self
+
+
+class TaskTimelineResponse(BaseModel):
+    """Tasks of a project overlapping a window, as parallel arrays: the n-th
+    item of each array belongs to the n-th task. Dates of tasks are given in
+    days from `start`, negative for those before the window."""
+
+    # Window widened to whole buckets.
+    start: date
+    finish: date
+    zoom: TimelineZoom
+    # First day of each bucket.
+    buckets: list[date]
+    ids: list[UUID]
+    titles: list[str]
+    states: list[TaskState]
+    start_dates: list[int]
+    deadlines: list[int | None]
+    finish_dates: list[int | None]
+    # Buckets each task spans, clamped to the window.
+    first_buckets: list[int]
+    last_buckets: list[int]
+    # Positions in `users` of each task's assignees.
+    assignees: list[list[int]]
+    users: list[TaskPaginationItemUser]
+
+
+class AssignedTaskParams(CursorPaginationParams):
+    state: list[TaskState] | None = Field(None)
+    deadline_from: date | None = Field(None)
+    deadline_to: date | None = Field(None)
+    organization_id: UUID | None = Field(None)
+
+    @model_validator(mode="after")
+    def validate_deadline_range(self):
+        if (
+            self.deadline_from
+            and self.deadline_to
+            and self.deadline_from > self.deadline_to
+        ):
+            raise ValueError("Deadline window must not end before it starts.")
+
+        return self
+
+
+class AssignedTaskProject(BaseModel):
+    id: UUID
+    title: str
+
+
+class AssignedTaskOrganization(BaseModel):
+    id: UUID
+    name: str
+
+
+class AssignedTaskItem(BaseModel):
+    """A task assigned to the user, most recently assigned first."""
+
+    id: UUID
+    title: str
+    start_date: datetime | None
+    finish_date: datetime | None
+    deadline: datetime | None
+    state: TaskState
+    priority: int
+    created_at: datetime
+    modified_at: datetime
+    assigned_at: datetime
+    project: AssignedTaskProject
+    organization: AssignedTaskOrganization
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,16 +1,78 @@
+from datetime import datetime
+from typing import Sequence
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import delete, exists, select
-
+from sqlalchemy import (
+    Uuid,
+    all_,
+    any_,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    inspect,
+    literal_column,
+    select,
+    true,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, insert
+
+from api.changes.enums import ChangeType
+from api.changes.tombstones import record_deletion
 from api.database.dependencies import AsyncSession
 from api.orgs.models import Organization
+from api.orgs.workload import invalidate_workload
 from api.projects.enums import ProjectParticipationType
 from api.projects.models import Project, ProjectParticipant
-from api.tasks.models import Task, TaskAssignee
-from api.tasks.schemas import TaskPaginationItem
+from api.tasks.analytics import analytics_cache
+from api.tasks.dependencies import update_cached_graph
+from api.tasks.enums import TaskBoardOrdering, TaskEventType, TaskState
+from api.tasks.events import notify_assignee_events, notify_task_event
+from api.tasks.models import (
+    OPEN_TASK,
+    ProjectTaskStats,
+    Task,
+    TaskAssignee,
+    TaskStateTransition,
+)
+from api.tasks.ranks import rank_between
+from api.tasks.rebalance import lock_column, rebalance_column
+from api.tasks.schemas import (
+    AssignedTaskItem,
+    AssignedTaskOrganization,
+    AssignedTaskParams,
+    AssignedTaskProject,
+    ProjectTaskStatsResponse,
+    TaskBoardColumn,
+    TaskFilterParams,
+    TaskPaginationItem,
+)
+from api.tasks.stats import count_tasks
 from api.users.models import User
-from api.utils.pagination import PaginatedResponse, PaginationParams, paginate
+from api.utils.pagination import (
+    CursorPaginatedResponse,
+    PaginatedResponse,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+
+# Keys ordering board columns, the id keeping pages stable.
+BOARD_KEYS = {
+    TaskBoardOrdering.PRIORITY: (Task.priority, Task.created_at, Task.id),
+    TaskBoardOrdering.RANK: (Task.rank, Task.id),
+}
+BOARD_KEY_TYPES = {
+    "priority": int,
+    "created_at": datetime.fromisoformat,
+    "rank": str,
+    "id": UUID,
+}
 
 
 class TaskService:
@@ -18,16 +80,51 @@ class TaskService:
         self.session = session
 
     async def get_tasks_for_project(
-        self, project_id: UUID, pagination_params: PaginationParams
+        self,
+        project_id: UUID,
+        filter_params: TaskFilterParams,
     ) -> PaginatedResponse[TaskPaginationItem]:
-        tasks_query = (
-            select(Task)
-            .where(Task.project_id == project_id)
-            .order_by(Task.created_at.desc())
+        tasks_query = select(Task).where(Task.project_id == project_id)
+
+        if filter_params.state:
+            tasks_query = tasks_query.where(Task.state.in_(filter_params.state))
+        if filter_params.priority_min is not None:
+            tasks_query = tasks_query.where(Task.priority >= filter_params.priority_min)
+        if filter_params.priority_max is not None:
+            tasks_query = tasks_query.where(Task.priority <= filter_params.priority_max)
+        if filter_params.deadline_from:
+            tasks_query = tasks_query.where(
+                Task.deadline >= filter_params.deadline_from
+            )
+        if filter_params.deadline_to:
+            tasks_query = tasks_query.where(Task.deadline <= filter_params.deadline_to)
+        if filter_params.overdue:
+            tasks_query = tasks_query.where(
+                Task.deadline < func.current_date(), OPEN_TASK
+            )
+        if filter_params.assignee_id:
+            tasks_query = tasks_query.where(
+                Task.id.in_(
+                    select(TaskAssignee.task_id).where(
+                        TaskAssignee.user_id == filter_params.assignee_id
+                    )
+                )
+            )
+
+        field = filter_params.order_by.value.lstrip("-")
+        descending = filter_params.order_by.value.startswith("-")
+        # Ties are broken the same way as in the matching index; the id keeps
+        # pages stable.
+        columns = [getattr(Task, field)]
+        if field == "priority":
+            columns.append(Task.created_at)
+        columns.append(Task.id)
+        tasks_query = tasks_query.order_by(
+            *(c.desc() if descending else c.asc() for c in columns)
         )
 
         paginated_result = await paginate(
-            tasks_query, self.session, pagination_params, serialize_items=False
+            tasks_query, self.session, filter_params, serialize_items=False
         )
 
         fetched_tasks = []
@@ -65,30 +162,431 @@ class TaskService:
 
         return paginated_result
 
-    async def create_task(self, task: Task) -> Task:
+    async def get_board(
+        self,
+        project_id: UUID,
+        page_size: int,
+        states: Sequence[TaskState] = tuple(TaskState),
+        cursor: str | None = None,
+        order_by: TaskBoardOrdering = TaskBoardOrdering.PRIORITY,
+    ) -> list[TaskBoardColumn]:
+        """Get count and first `page_size` tasks (by priority or rank) of each
+        given state along with their assignees, in a single statement. `cursor`
+        continues a column, so it is only allowed along with a single state."""
+        states_table = values(column("state", Task.state.type), name="states").data(
+            [(state,) for state in states]
+        )
+        count = (
+            select(func.count())
+            .where(Task.project_id == project_id, Task.state == states_table.c.state)
+            .correlate(states_table)
+            .scalar_subquery()
+        )
+
+        # Served by `ix_tasks_project_id_state_priority_created_at` or
+        # `ix_tasks_project_id_state_rank` per state.
+        keys = BOARD_KEYS[order_by]
+        descending = order_by == TaskBoardOrdering.PRIORITY
+        top = (
+            select(*keys)
+            .where(Task.project_id == project_id, Task.state == states_table.c.state)
+            .order_by(*(key.desc() if descending else key for key in keys))
+            .limit(page_size + 1)
+            .correlate(states_table)
+        )
+        if cursor:
+            position = self._decode_board_cursor(cursor, keys)
+            top = top.where(
+                tuple_(*keys) < position if descending else tuple_(*keys) > position
+            )
+        top = top.lateral("top")
+
+        assignees = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(
+                            func.json_build_object(
+                                "id",
+                                User.id,
+                                "first_name",
+                                User.first_name,
+                                "last_name",
+                                User.last_name,
+                                "display_name",
+                                User.display_name,
+                                "email",
+                                User.email,
+                            ),
+                            TaskAssignee.created_at.desc(),
+                        )
+                    ),
+                    literal_column("'[]'::json"),
+                ).label("assignees")
+            )
+            .select_from(TaskAssignee)
+            .join(User, User.id == TaskAssignee.user_id)
+            .where(TaskAssignee.task_id == top.c.id)
+            .correlate(top)
+            .lateral("assignees")
+        )
+
+        query = (
+            select(states_table.c.state, count.label("count"), Task, assignees)
+            .select_from(states_table)
+            .outerjoin(top, true())
+            .outerjoin(Task, Task.id == top.c.id)
+            .outerjoin(assignees, true())
+            .order_by(
+                *(
+                    top.c[key.key].desc() if descending else top.c[key.key]
+                    for key in keys
+                )
+            )
+        )
+
+        async with self.session() as ac:
+            rows = (await ac.execute(query)).all()
+
+        columns = {
+            state: TaskBoardColumn(state=state, count=0, next_cursor=None, items=[])
+            for state in states
+        }
+        for state, total, task, task_assignees in rows:
+            board_column = columns[state]
+            board_column.count = total
+
+            if task is not None:
+                task.assignees = task_assignees
+                board_column.items.append(TaskPaginationItem.model_validate(task))
+
+        for board_column in columns.values():
+            if len(board_column.items) > page_size:
+                board_column.items = board_column.items[:page_size]
+                last = board_column.items[-1]
+                last_keys = {key.key: getattr(last, key.key) for key in keys}
+                board_column.next_cursor = encode_cursor(
+                    {
+                        key: value.isoformat()
+                        if isinstance(value, datetime)
+                        else str(value)
+                        for key, value in last_keys.items()
+                    }
+                )
+
+        return list(columns.values())
+
+    def _decode_board_cursor(self, cursor: str, keys: Sequence) -> tuple:
+        values = decode_cursor(cursor)
+        try:
+            return tuple(BOARD_KEY_TYPES[key.key](values[key.key]) for key in keys)
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(
+                detail="Invalid cursor.", status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+    async def get_assigned_tasks(
+        self, user_id: UUID, params: AssignedTaskParams
+    ) -> CursorPaginatedResponse[AssignedTaskItem]:
+        """Get tasks assigned to given user across all projects, most recently
+        assigned first, with their project and organization."""
+        # Driven by `ix_task_assignees_user_id_created_at_task_id`, in order;
+        # everything else is joined by primary key.
+        query = (
+            select(
+                TaskAssignee.created_at,
+                Task,
+                Project.title,
+                Organization.id,
+                Organization.name,
+            )
+            .select_from(TaskAssignee)
+            .join(Task, Task.id == TaskAssignee.task_id)
+            .join(Project, Project.id == Task.project_id)
+            .join(Organization, Organization.id == Project.organization_id)
+            .where(
+                TaskAssignee.user_id == user_id,
+                Project.deleted_at.is_(None),
+                Organization.deleted_at.is_(None),
+            )
+            .order_by(TaskAssignee.created_at.desc(), TaskAssignee.task_id.desc())
+            .limit(params.page_size + 1)
+        )
+        if params.state:
+            query = query.where(Task.state.in_(params.state))
+        if params.deadline_from:
+            query = query.where(Task.deadline >= params.deadline_from)
+        if params.deadline_to:
+            query = query.where(Task.deadline <= params.deadline_to)
+        if params.organization_id:
+            query = query.where(Project.organization_id == params.organization_id)
+        if params.cursor:
+            query = query.where(
+                tuple_(TaskAssignee.created_at, TaskAssignee.task_id)
+                < self._decode_assigned_task_cursor(params.cursor)
+            )
+
+        async with self.session() as ac:
+            rows = (await ac.execute(query)).all()
+
+        items = [
+            AssignedTaskItem(
+                id=task.id,
+                title=task.title,
+                start_date=task.start_date,
+                finish_date=task.finish_date,
+                deadline=task.deadline,
+                state=task.state,
+                priority=task.priority,
+                created_at=task.created_at,
+                modified_at=task.modified_at,
+                assigned_at=assigned_at,
+                project=AssignedTaskProject(id=task.project_id, title=project_title),
+                organization=AssignedTaskOrganization(
+                    id=organization_id, name=organization_name
+                ),
+            )
+            for (
+                assigned_at,
+                task,
+                project_title,
+                organization_id,
+                organization_name,
+            ) in rows[: params.page_size]
+        ]
+
+        next_cursor = None
+        if len(rows) > params.page_size:
+            last = items[-1]
+            next_cursor = encode_cursor(
+                {"assigned_at": last.assigned_at.isoformat(), "id": str(last.id)}
+            )
+
+        return CursorPaginatedResponse[AssignedTaskItem](
+            next_cursor=next_cursor, count=len(items), items=items
+        )
+
+    def _decode_assigned_task_cursor(self, cursor: str) -> tuple[datetime, UUID]:
+        keys = decode_cursor(cursor)
+        try:
+            return datetime.fromisoformat(keys["assigned_at"]), UUID(keys["id"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(
+                detail="Invalid cursor.", status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+    async def get_project_stats(self, project_id: UUID) -> ProjectTaskStatsResponse:
+        # Overdue depends on the current date, so it can't be kept as a counter;
+        # it's counted from `ix_tasks_open_project_id_deadline` instead, which
+        # only touches the overdue tasks themselves. A project without stats
+        # has no tasks, let alone overdue ones.
+        overdue = (
+            select(func.count())
+            .where(
+                Task.project_id == project_id,
+                Task.deadline < func.current_date(),
+                OPEN_TASK,
+            )
+            .scalar_subquery()
+        )
+        query = select(
+            ProjectTaskStats.state, ProjectTaskStats.task_count, overdue
+        ).where(ProjectTaskStats.project_id == project_id)
+        async with self.session() as ac:
+            rows = (await ac.execute(query)).all()
+
+        states = {state: 0 for state in TaskState}
+        states |= {state: count for state, count, _ in rows}
+        overdue_count = rows[0][2] if rows else 0
+
+        total = sum(states.values())
+        not_cancelled = total - states[TaskState.CANCELLED]
+        return ProjectTaskStatsResponse(
+            total=total,
+            states=states,
+            overdue=overdue_count,
+            percent_complete=round(100 * states[TaskState.COMPLETED] / not_cancelled, 2)
+            if not_cancelled
+            else 0.0,
+        )
+
+    async def create_task(self, task: Task, user_id: UUID | None = None) -> Task:
         async with self.session.begin() as ac:
+            task.rank = await self._rank_at_end(ac, task.project_id, task.state)
             ac.add(task)
             await ac.flush()
+            await count_tasks(ac, task.project_id, {task.state: 1})
+            ac.add(
+                TaskStateTransition(
+                    task_id=task.id,
+                    project_id=task.project_id,
+                    from_state=None,
+                    to_state=task.state,
+                    changed_by_id=user_id,
+                )
+            )
+            await ac.flush()
+            await notify_task_event(ac, TaskEventType.CREATED, task.project_id, task.id)
             await ac.refresh(task)
-            return task
 
-    async def update_task(self, task: Task) -> Task:
+        analytics_cache.invalidate(task.project_id)
+        update_cached_graph(task.project_id, task.id, task)
+        return task
+
+    async def update_task(self, task: Task, user_id: UUID | None = None) -> Task:
+        state_changed = inspect(task).attrs.state.history.has_changes()
         async with self.session.begin() as ac:
+            if state_changed:
+                # The task was read outside of this transaction; lock it and
+                # count the change from the state it really leaves.
+                previous_state = (
+                    await ac.execute(
+                        select(Task.state).where(Task.id == task.id).with_for_update()
+                    )
+                ).scalar_one()
+                state_changed = previous_state != task.state
+            if state_changed:
+                task.rank = await self._rank_at_end(ac, task.project_id, task.state)
+
+            ac.add(task)
+            if state_changed:
+                ac.add(
+                    TaskStateTransition(
+                        task_id=task.id,
+                        project_id=task.project_id,
+                        from_state=previous_state,
+                        to_state=task.state,
+                        changed_by_id=user_id,
+                    )
+                )
+            await ac.flush()
+            if state_changed:
+                await count_tasks(
+                    ac, task.project_id, {previous_state: -1, task.state: 1}
+                )
+            await notify_task_event(
+                ac,
+                TaskEventType.STATE_CHANGED if state_changed else TaskEventType.UPDATED,
+                task.project_id,
+                task.id,
+            )
+            await ac.refresh(task)
+
+        if state_changed:
+            analytics_cache.invalidate(task.project_id)
+        update_cached_graph(task.project_id, task.id, task)
+        invalidate_workload(task.project_id)
+        return task
+
+    async def move_task(self, task: Task, after_id: UUID | None) -> Task:
+        """Place a task right after another one of its column (project and
+        state), or first if `after_id` is None. Only the task's rank changes."""
+        async with self.session.begin() as ac:
+            await lock_column(ac, task.project_id, task.state)
+            # The task was read outside of this transaction and may have left
+            # the column since.
+            state = (
+                await ac.execute(
+                    select(Task.state).where(Task.id == task.id).with_for_update()
+                )
+            ).scalar_one_or_none()
+            if state != task.state:
+                raise HTTPException(
+                    detail="Task was changed meanwhile, try again.",
+                    status_code=status.HTTP_409_CONFLICT,
+                )
+
+            try:
+                rank = rank_between(*await self._neighbour_ranks(ac, task, after_id))
+            except ValueError:
+                # Neighbours share a rank, e.g. tasks inserted by hand.
+                await rebalance_column(ac, task.project_id, task.state)
+                rank = rank_between(*await self._neighbour_ranks(ac, task, after_id))
+
+            task.rank = rank
             ac.add(task)
             await ac.flush()
+            await notify_task_event(ac, TaskEventType.MOVED, task.project_id, task.id)
             await ac.refresh(task)
-            return task
+
+        return task
+
+    async def _neighbour_ranks(
+        self, ac, task: Task, after_id: UUID | None
+    ) -> tuple[str | None, str | None]:
+        """Ranks of the tasks `task` goes between; both read along
+        `ix_tasks_project_id_state_rank`."""
+        in_column = (Task.project_id == task.project_id, Task.state == task.state)
+        following = (
+            select(Task.rank)
+            .where(*in_column, Task.id != task.id)
+            .order_by(Task.rank, Task.id)
+            .limit(1)
+        )
+
+        low = None
+        if after_id is not None:
+            preceding = (
+                await ac.execute(
+                    select(Task.rank, Task.id).where(*in_column, Task.id == after_id)
+                )
+            ).one_or_none()
+            if preceding is None or after_id == task.id:
+                raise HTTPException(
+                    detail="Task to place after must be another task of the same project and state.",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+            low = preceding.rank
+            following = following.where(tuple_(Task.rank, Task.id) > tuple(preceding))
+
+        return low, (await ac.execute(following)).scalar_one_or_none()
+
+    async def _rank_at_end(self, ac, project_id: UUID, state: TaskState) -> str:
+        """Rank for appending a task to a column, which stays locked until the
+        transaction ends."""
+        await lock_column(ac, project_id, state)
+        last = (
+            await ac.execute(
+                select(func.max(Task.rank)).where(
+                    Task.project_id == project_id, Task.state == state
+                )
+            )
+        ).scalar()
+        return rank_between(last, None)
 
     async def delete_task_and_assignees(self, task_id: UUID) -> None:
         task_assignees_delete_query = delete(TaskAssignee).where(
             TaskAssignee.task_id == task_id
         )
-        task_delete_query = delete(Task).where(Task.id == task_id)
+        task_delete_query = (
+            delete(Task)
+            .where(Task.id == task_id)
+            .returning(Task.project_id, Task.state)
+        )
         async with self.session.begin() as ac:
             await ac.execute(task_assignees_delete_query)
-            await ac.execute(task_delete_query)
+            deleted = (await ac.execute(task_delete_query)).one_or_none()
+            if deleted:
+                await count_tasks(ac, deleted.project_id, {deleted.state: -1})
+                await record_deletion(
+                    ac,
+                    ChangeType.TASK,
+                    task_id,
+                    select(Project.organization_id)
+                    .where(Project.id == deleted.project_id)
+                    .scalar_subquery(),
+                    project_id=deleted.project_id,
+                )
+                await notify_task_event(
+                    ac, TaskEventType.DELETED, deleted.project_id, task_id
+                )
             await ac.flush()
 
+        if deleted:
+            analytics_cache.invalidate(deleted.project_id)
+            update_cached_graph(deleted.project_id, task_id, None)
+            invalidate_workload(deleted.project_id)
+
     async def get_task_with_project_and_organization_and_assignees(
         self,
         task_id: UUID,
@@ -98,7 +596,7 @@ class TaskService:
             .select_from(Task)
             .join(Project, Project.id == Task.project_id)
             .join(Organization, Organization.id == Project.organization_id)
-            .where(Task.id == task_id)
+            .where(Task.id == task_id, Project.deleted_at.is_(None))
         )
         assignees_query = (
             select(TaskAssignee, User)
@@ -162,9 +660,18 @@ class TaskService:
             task_assignee = TaskAssignee(task.id, user_id)
             ac.add(task_assignee)
             await ac.flush()
+            await self._touch_task(ac, task.id)
+            await notify_task_event(
+                ac,
+                TaskEventType.ASSIGNEE_ADDED,
+                task.project_id,
+                task.id,
+                user_id=user_id,
+            )
             await ac.refresh(task_assignee)
 
-            return task_assignee
+        invalidate_workload(task.project_id)
+        return task_assignee
 
     async def delete_task_assignee(self, task: Task, user_id: UUID) -> None:
         async with self.session.begin() as ac:
@@ -173,4 +680,96 @@ class TaskService:
                     TaskAssignee.task_id == task.id, TaskAssignee.user_id == user_id
                 )
             )
+            await self._touch_task(ac, task.id)
+            await notify_task_event(
+                ac,
+                TaskEventType.ASSIGNEE_REMOVED,
+                task.project_id,
+                task.id,
+                user_id=user_id,
+            )
             await ac.flush()
+
+        invalidate_workload(task.project_id)
+
+    async def update_task_assignees(
+        self, task: Task, added: Sequence[UUID], removed: Sequence[UUID]
+    ) -> None:
+        """Add and remove many assignees of a task at once."""
+        await self._change_task_assignees(
+            task, added, TaskAssignee.user_id == any_(cast(removed, ARRAY(Uuid)))
+        )
+
+    async def replace_task_assignees(
+        self, task: Task, user_ids: Sequence[UUID]
+    ) -> None:
+        """Make given users the only assignees of a task."""
+        await self._change_task_assignees(
+            task, user_ids, TaskAssignee.user_id != all_(cast(user_ids, ARRAY(Uuid)))
+        )
+
+    async def _change_task_assignees(
+        self, task: Task, added: Sequence[UUID], removed_condition
+    ) -> None:
+        """Add `added` users to assignees of a task and remove those matching
+        `removed_condition`, with a fixed number of statements."""
+        added = list(dict.fromkeys(added))
+        contributors_query = select(func.count()).where(
+            ProjectParticipant.project_id == task.project_id,
+            ProjectParticipant.user_id == any_(cast(added, ARRAY(Uuid))),
+            ProjectParticipant.participation_type
+            == ProjectParticipationType.CONTRIBUTOR,
+        )
+
+        async with self.session.begin() as ac:
+            # Touching the task first also locks it, so concurrent changes of
+            # its assignees apply one after another.
+            await self._touch_task(ac, task.id)
+
+            inserted = []
+            if added:
+                if (await ac.execute(contributors_query)).scalar() < len(added):
+                    raise HTTPException(
+                        detail="Given users are not defined as contributors in this project.",
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                    )
+
+                inserted = (
+                    await ac.scalars(
+                        insert(TaskAssignee)
+                        .values(
+                            [
+                                {"task_id": task.id, "user_id": user_id}
+                                for user_id in added
+                            ]
+                        )
+                        .on_conflict_do_nothing()
+                        .returning(TaskAssignee.user_id)
+                    )
+                ).all()
+
+            deleted = (
+                await ac.scalars(
+                    delete(TaskAssignee)
+                    .where(TaskAssignee.task_id == task.id, removed_condition)
+                    .returning(TaskAssignee.user_id)
+                )
+            ).all()
+
+            await notify_assignee_events(
+                ac, TaskEventType.ASSIGNEE_ADDED, task.project_id, task.id, inserted
+            )
+            await notify_assignee_events(
+                ac, TaskEventType.ASSIGNEE_REMOVED, task.project_id, task.id, deleted
+            )
+
+        invalidate_workload(task.project_id)
+
+    async def _touch_task(self, ac, task_id: UUID) -> None:
+        """Bump `modified_at` of a task whose assignees changed, for the change
+        feed to pick it up."""
+        await ac.execute(
+            update(Task)
+            .where(Task.id == task_id)
+            .values(modified_at=func.current_timestamp())
+        )
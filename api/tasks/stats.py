@@ -0,0 +1,157 @@
+"""Check `project_task_stats` against `tasks`, and rebuild it where it drifted.
+
+Stats are kept up to date by `TaskService`; they only drift if tasks are written
+some other way, e.g. by hand or by an older version of the app during a deploy.
+
+Usage:
+    python -m api.tasks.stats [--project PROJECT_ID] [--rebuild]
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import Row, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.setup import AsyncSessionLocal
+from api.projects.models import Project
+from api.tasks.enums import TaskState
+from api.tasks.models import ProjectTaskStats, Task
+
+
+async def count_tasks(
+    ac: AsyncSession, project_id: UUID, changes: dict[TaskState, int]
+) -> None:
+    """Apply changes in number of tasks per state of a project, as part of the
+    transaction changing the tasks."""
+    # Rows are always locked in the same order, so tasks moving between two
+    # states in opposite directions can't deadlock.
+    rows = [
+        {"project_id": project_id, "state": state, "task_count": change}
+        for state, change in sorted(changes.items(), key=lambda c: c[0].name)
+        if change
+    ]
+    if not rows:
+        return
+
+    query = insert(ProjectTaskStats).values(rows)
+    await ac.execute(
+        query.on_conflict_do_update(
+            index_elements=[ProjectTaskStats.project_id, ProjectTaskStats.state],
+            set_={
+                "task_count": ProjectTaskStats.task_count + query.excluded.task_count
+            },
+        )
+    )
+
+
+def _live_counts(project_ids: Sequence[UUID]):
+    return (
+        select(Task.project_id, Task.state, func.count().label("task_count"))
+        .where(Task.project_id.in_(project_ids))
+        .group_by(Task.project_id, Task.state)
+    )
+
+
+async def find_drift(ac: AsyncSession, project_ids: Sequence[UUID]) -> list[Row]:
+    """Compare stored and live counts of given projects.
+
+    Both are read by a single statement, i.e. from the same snapshot, so
+    transactions in flight never show up as drift.
+
+    Returns:
+        list[Row]: (project_id, state, stored, actual) of every mismatch.
+    """
+    live = _live_counts(project_ids).subquery("live")
+    stored = (
+        select(ProjectTaskStats)
+        .where(ProjectTaskStats.project_id.in_(project_ids))
+        .subquery("stored")
+    )
+    stored_count = func.coalesce(stored.c.task_count, 0)
+    actual_count = func.coalesce(live.c.task_count, 0)
+    query = (
+        select(
+            func.coalesce(live.c.project_id, stored.c.project_id).label("project_id"),
+            func.coalesce(live.c.state, stored.c.state).label("state"),
+            stored_count.label("stored"),
+            actual_count.label("actual"),
+        )
+        .select_from(live)
+        .join(
+            stored,
+            (live.c.project_id == stored.c.project_id)
+            & (live.c.state == stored.c.state),
+            full=True,
+        )
+        .where(stored_count != actual_count)
+        .order_by("project_id", "state")
+    )
+    return list((await ac.execute(query)).all())
+
+
+async def rebuild(ac: AsyncSession, project_ids: Sequence[UUID]) -> None:
+    """Recount tasks of given projects from scratch."""
+    # Waits for transactions which already counted their changes, and holds
+    # off new ones until the recount commits; their changes are then applied
+    # on top of a count which doesn't include them.
+    await ac.execute(text("LOCK TABLE project_task_stats IN SHARE ROW EXCLUSIVE MODE"))
+    await ac.execute(
+        delete(ProjectTaskStats).where(ProjectTaskStats.project_id.in_(project_ids))
+    )
+    await ac.execute(
+        insert(ProjectTaskStats).from_select(
+            ["project_id", "state", "task_count"], _live_counts(project_ids)
+        )
+    )
+
+
+async def run(args: argparse.Namespace) -> int:
+    drifted = 0
+    last_id = None
+    while True:
+        if args.project:
+            project_ids = [args.project]
+        else:
+            query = select(Project.id).order_by(Project.id).limit(args.batch_size)
+            if last_id:
+                query = query.where(Project.id > last_id)
+            async with AsyncSessionLocal() as ac:
+                project_ids = list((await ac.execute(query)).scalars().all())
+            if not project_ids:
+                break
+            last_id = project_ids[-1]
+
+        async with AsyncSessionLocal() as ac:
+            drift = await find_drift(ac, project_ids)
+        for project_id, state, stored, actual in drift:
+            print(f"{project_id} {state.value}: stored {stored}, actual {actual}")
+
+        if drift and args.rebuild:
+            async with AsyncSessionLocal.begin() as ac:
+                await rebuild(ac, sorted({row.project_id for row in drift}))
+
+        drifted += len({row.project_id for row in drift})
+        if args.project:
+            break
+
+    print(f"{drifted} project(s) {'rebuilt' if args.rebuild else 'drifted'}.")
+    return 1 if drifted and not args.rebuild else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project", type=UUID, default=None)
+    parser.add_argument("--rebuild", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
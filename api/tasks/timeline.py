@@ -0,0 +1,144 @@
+from datetime import date, timedelta
+from uuid import UUID
+
+from sqlalchemy import any_, cast, func, select, types
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+
+from api.database.dependencies import AsyncSession
+from api.tasks.enums import TimelineZoom
+from api.tasks.models import Task, TaskAssignee
+from api.tasks.schemas import (
+    TaskPaginationItemUser,
+    TaskTimelineParams,
+    TaskTimelineResponse,
+)
+from api.users.models import User
+
+
+def bucket_start(day: date, zoom: TimelineZoom) -> date:
+    """First day of the bucket `day` falls in; weeks start on Monday."""
+    if zoom == TimelineZoom.WEEK:
+        return day - timedelta(days=day.weekday())
+    if zoom == TimelineZoom.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start: date, zoom: TimelineZoom) -> date:
+    """First day of the bucket following the one starting at `start`."""
+    if zoom == TimelineZoom.WEEK:
+        return start + timedelta(days=7)
+    if zoom == TimelineZoom.MONTH:
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def bucket_index(day: date, start: date, zoom: TimelineZoom) -> int:
+    """Bucket of `day`, counted from the bucket starting at `start`."""
+    if zoom == TimelineZoom.WEEK:
+        return (day - start).days // 7
+    if zoom == TimelineZoom.MONTH:
+        return (day.year - start.year) * 12 + day.month - start.month
+    return (day - start).days
+
+
+class TaskTimelineService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_timeline(
+        self, project_id: UUID, params: TaskTimelineParams
+    ) -> TaskTimelineResponse:
+        """Tasks of a project overlapping a window, bucketed by day, week or
+        month. A task spans from its start date to its finish date, or deadline
+        if it isn't finished; tasks without a start date aren't scheduled and
+        are left out."""
+        zoom = params.zoom
+        buckets = [bucket_start(params.start, zoom)]
+        while (following := next_bucket(buckets[-1], zoom)) <= params.finish:
+            buckets.append(following)
+        start = buckets[0]
+        finish = next_bucket(buckets[-1], zoom) - timedelta(days=1)
+
+        span_end = func.greatest(
+            Task.start_date, func.coalesce(Task.finish_date, Task.deadline)
+        )
+        assignee_ids = (
+            select(
+                func.array_agg(
+                    aggregate_order_by(
+                        TaskAssignee.user_id, TaskAssignee.created_at.desc()
+                    )
+                )
+            )
+            .where(TaskAssignee.task_id == Task.id)
+            .scalar_subquery()
+        )
+        # Served by `ix_tasks_project_id_start_date`.
+        query = (
+            select(
+                Task.id,
+                Task.title,
+                Task.state,
+                Task.start_date,
+                Task.deadline,
+                Task.finish_date,
+                span_end,
+                assignee_ids,
+            )
+            .where(
+                Task.project_id == project_id,
+                Task.start_date <= finish,
+                span_end >= start,
+            )
+            .order_by(Task.start_date, Task.id)
+        )
+
+        async with self.session() as ac:
+            rows = (await ac.execute(query)).all()
+
+            user_ids = {user_id for row in rows for user_id in row[-1] or ()}
+            users = []
+            if user_ids:
+                # Passed as an array, since there may be more users than the
+                # bound parameters a statement can take.
+                users_query = select(User).where(
+                    User.id == any_(cast(list(user_ids), ARRAY(types.Uuid)))
+                )
+                users = (await ac.execute(users_query)).scalars().all()
+
+        positions = {user.id: n for n, user in enumerate(users)}
+        last_bucket = len(buckets) - 1
+        result = TaskTimelineResponse(
+            start=start,
+            finish=finish,
+            zoom=zoom,
+            buckets=buckets,
+            ids=[],
+            titles=[],
+            states=[],
+            start_dates=[],
+            deadlines=[],
+            finish_dates=[],
+            first_buckets=[],
+            last_buckets=[],
+            assignees=[],
+            users=[TaskPaginationItemUser.model_validate(user) for user in users],
+        )
+        for task_id, title, state, start_date, deadline, finish_date, end, ids in rows:
+            result.ids.append(task_id)
+            result.titles.append(title)
+            result.states.append(state)
+            result.start_dates.append((start_date - start).days)
+            result.deadlines.append(
+                None if deadline is None else (deadline - start).days
+            )
+            result.finish_dates.append(
+                None if finish_date is None else (finish_date - start).days
+            )
+            result.first_buckets.append(max(bucket_index(start_date, start, zoom), 0))
+            result.last_buckets.append(min(bucket_index(end, start, zoom), last_bucket))
+            result.assignees.append(
+                [positions[user_id] for user_id in ids or () if user_id in positions]
+            )
+        return result
@@ -0,0 +1,375 @@
+"""Drive the API with a scripted mix of requests and report latency percentiles.
+
+Runs against a live server (`--base-url`) or in-process through
+`httpx.ASGITransport`. The database must be populated with
+`api.tests.benchmarks.seed` first, since virtual users log in with the seeded
+password.
+
+Usage:
+    python -m api.tests.benchmarks.load --duration 30 --output baseline.json
+    python -m api.tests.benchmarks.load --duration 30 --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+from uuid import UUID
+
+import httpx
+
+from api.tests.benchmarks.seed import SEED_EMAIL_DOMAIN, SEED_PASSWORD
+from api.tests.benchmarks.utils import (
+    connect,
+    percentiles,
+    read_json,
+    write_json,
+)
+
+
+@dataclass
+class VirtualUser:
+    """A seeded organization manager along with resources they may access."""
+
+    email: str
+    organization_id: UUID
+    project_ids: list[UUID]
+    task_ids: list[UUID]
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+Scenario = Callable[[httpx.AsyncClient, VirtualUser, random.Random], Awaitable]
+
+
+async def list_organizations(c, u, rng):
+    return await c.get("/users/me/organizations", headers=u.headers)
+
+
+async def get_organization(c, u, rng):
+    return await c.get(f"/organizations/{u.organization_id}", headers=u.headers)
+
+
+async def list_organization_members(c, u, rng):
+    return await c.get(f"/organizations/{u.organization_id}/members", headers=u.headers)
+
+
+async def list_projects(c, u, rng):
+    return await c.get(
+        f"/organizations/{u.organization_id}/projects", headers=u.headers
+    )
+
+
+async def get_project(c, u, rng):
+    return await c.get(f"/projects/{rng.choice(u.project_ids)}", headers=u.headers)
+
+
+async def list_project_participants(c, u, rng):
+    return await c.get(
+        f"/projects/{rng.choice(u.project_ids)}/participants", headers=u.headers
+    )
+
+
+async def list_project_tasks(c, u, rng):
+    return await c.get(
+        f"/projects/{rng.choice(u.project_ids)}/tasks",
+        params={"page_size": 50},
+        headers=u.headers,
+    )
+
+
+async def list_overdue_tasks(c, u, rng):
+    return await c.get(
+        f"/projects/{rng.choice(u.project_ids)}/tasks",
+        params={"page_size": 50, "overdue": True, "order_by": "deadline"},
+        headers=u.headers,
+    )
+
+
+async def list_assigned_tasks(c, u, rng):
+    return await c.get("/users/me/tasks", params={"page_size": 50}, headers=u.headers)
+
+
+async def get_task(c, u, rng):
+    return await c.get(f"/tasks/{rng.choice(u.task_ids)}", headers=u.headers)
+
+
+async def set_task_state(c, u, rng):
+    return await c.put(
+        f"/tasks/{rng.choice(u.task_ids)}/state",
+        json={"state": rng.choice(("Todo", "In_Progress", "QA")), "finish_date": None},
+        headers=u.headers,
+    )
+
+
+async def create_task(c, u, rng):
+    return await c.post(
+        f"/projects/{rng.choice(u.project_ids)}/tasks",
+        json={
+            "title": "Load test task",
+            "description": None,
+            "start_date": None,
+            "finish_date": None,
+            "deadline": None,
+            "state": "Todo",
+            "priority": rng.randrange(4),
+        },
+        headers=u.headers,
+    )
+
+
+# Scenario name, weight and callable. Reads dominate as they do in production.
+SCENARIOS: tuple[tuple[str, int, Scenario], ...] = (
+    ("list_organizations", 5, list_organizations),
+    ("get_organization", 5, get_organization),
+    ("list_organization_members", 5, list_organization_members),
+    ("list_projects", 10, list_projects),
+    ("get_project", 10, get_project),
+    ("list_project_participants", 5, list_project_participants),
+    ("list_project_tasks", 20, list_project_tasks),
+    ("list_overdue_tasks", 5, list_overdue_tasks),
+    ("list_assigned_tasks", 10, list_assigned_tasks),
+    ("get_task", 20, get_task),
+    ("set_task_state", 10, set_task_state),
+    ("create_task", 5, create_task),
+)
+
+
+async def load_virtual_users(count: int, database: str | None) -> list[VirtualUser]:
+    """Pick seeded organization managers (deterministically) with their resources."""
+    conn = await connect(database)
+    try:
+        rows = await conn.fetch(
+            """
+            SELECT o.id, u.email
+            FROM organizations o
+            JOIN users u ON u.id = o.manager_id
+            WHERE u.email LIKE '%@' || $1
+            ORDER BY o.id
+            LIMIT $2
+            """,
+            SEED_EMAIL_DOMAIN,
+            count,
+        )
+        users = []
+        for organization_id, email in rows:
+            project_ids = [
+                r[0]
+                for r in await conn.fetch(
+                    "SELECT id FROM projects WHERE organization_id = $1 ORDER BY id",
+                    organization_id,
+                )
+            ]
+            task_ids = [
+                r[0]
+                for r in await conn.fetch(
+                    "SELECT id FROM tasks WHERE project_id = ANY($1::uuid[]) "
+                    "ORDER BY id LIMIT 200",
+                    project_ids,
+                )
+            ]
+            if project_ids and task_ids:
+                users.append(VirtualUser(email, organization_id, project_ids, task_ids))
+        return users
+    finally:
+        await conn.close()
+
+
+async def login(client: httpx.AsyncClient, user: VirtualUser) -> None:
+    response = await client.post(
+        "/auth/token", json={"email": user.email, "password": SEED_PASSWORD}
+    )
+    response.raise_for_status()
+    user.headers = {"Authorization": f"Bearer {response.json()['access']}"}
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    users: list[VirtualUser],
+    rng: random.Random,
+    deadline: float,
+    remaining: list[int],
+    samples: dict[str, list[float]],
+    errors: dict[str, int],
+) -> None:
+    names = [s[0] for s in SCENARIOS]
+    weights = [s[1] for s in SCENARIOS]
+    scenarios = {s[0]: s[2] for s in SCENARIOS}
+
+    while time.perf_counter() < deadline and remaining[0] != 0:
+        remaining[0] -= 1
+        name = rng.choices(names, weights)[0]
+        started_at = time.perf_counter()
+        try:
+            response = await scenarios[name](client, rng.choice(users), rng)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            failed = True
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+
+        samples[name].append(elapsed_ms)
+        if failed:
+            errors[name] += 1
+
+
+async def run(args: argparse.Namespace) -> dict:
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+    else:
+        from api.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+
+    users = await load_virtual_users(args.users, args.database)
+    if not users:
+        raise SystemExit(
+            "No seeded users found. Run `api.tests.benchmarks.seed` first."
+        )
+
+    samples: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+
+    async with client:
+        for user in users:
+            await login(client, user)
+
+        # A negative budget never reaches zero, so only the duration applies.
+        remaining = [args.requests or -1]
+        started_at = time.perf_counter()
+        deadline = started_at + args.duration
+        await asyncio.gather(
+            *(
+                worker(
+                    client,
+                    users,
+                    random.Random(args.seed + n),
+                    deadline,
+                    remaining,
+                    samples,
+                    errors,
+                )
+                for n in range(args.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started_at
+
+    endpoints = {}
+    for name, values in sorted(samples.items()):
+        endpoints[name] = {
+            "requests": len(values),
+            "errors": errors[name],
+            "throughput": len(values) / elapsed,
+            **percentiles(values),
+        }
+
+    all_samples = [v for values in samples.values() for v in values]
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "target": args.base_url or "asgi",
+            "concurrency": args.concurrency,
+            "users": len(users),
+            "seed": args.seed,
+            "elapsed": elapsed,
+        },
+        "total": {
+            "requests": len(all_samples),
+            "errors": sum(errors.values()),
+            "throughput": len(all_samples) / elapsed,
+            **percentiles(all_samples),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """Return human readable regressions of current run compared to baseline.
+
+    Latency percentiles may grow and throughput may drop by `tolerance`
+    (a fraction) before being flagged.
+    """
+    regressions = []
+    pairs = {"total": (baseline["total"], current["total"])}
+    for name, stats in current["endpoints"].items():
+        if name in baseline["endpoints"]:
+            pairs[name] = (baseline["endpoints"][name], stats)
+
+    for name, (before, after) in pairs.items():
+        for key in ("p50", "p95", "p99"):
+            if after[key] > before[key] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {key} {before[key]:.1f}ms -> {after[key]:.1f}ms"
+                )
+
+        if after["throughput"] < before["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {before['throughput']:.1f}/s "
+                f"-> {after['throughput']:.1f}/s"
+            )
+
+        if after["errors"] > before["errors"]:
+            regressions.append(
+                f"{name}: errors {before['errors']} -> {after['errors']}"
+            )
+
+    return regressions
+
+
+def print_report(result: dict) -> None:
+    print(
+        f"{'endpoint':<28}{'reqs':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+    )
+    rows = list(result["endpoints"].items()) + [("total", result["total"])]
+    for name, s in rows:
+        print(
+            f"{name:<28}{s['requests']:>8}{s['errors']:>6}{s['throughput']:>9.1f}"
+            f"{s['p50']:>9.1f}{s['p95']:>9.1f}{s['p99']:>9.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--base-url", default=None, help="Run over HTTP instead of in-process."
+    )
+    parser.add_argument("--database", default=None)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds.")
+    parser.add_argument(
+        "--requests", type=int, default=0, help="Stop after N requests (0: no limit)."
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=20, help="Virtual users.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write results to JSON file.")
+    parser.add_argument(
+        "--compare", default=None, help="Baseline JSON to compare results with."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Allowed relative regression before failing (0.1 is 10%%).",
+    )
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print_report(result)
+
+    if args.output:
+        write_json(args.output, result)
+
+    if args.compare:
+        regressions = compare(read_json(args.compare), result, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Measure full-text search latency on a seeded database.
+
+Runs organization and project scoped searches, through `SearchService`, for
+queries made of the seed's vocabulary, and reports latency percentiles of the
+first and the following (keyset paginated) pages per query kind. With
+`--explain`, the plan of one organization search is printed as well.
+
+Seed the database first; e.g. for about 5M tasks:
+    python -m api.tests.benchmarks.seed --rows 13200000 --truncate
+
+Usage:
+    python -m api.tests.benchmarks.search --queries 200
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.config import settings
+from api.database.setup import async_database_url_scheme
+from api.search.schemas import SearchParams
+from api.search.services import SearchService
+from api.tests.benchmarks.seed import WORDS
+from api.tests.benchmarks.utils import connect, percentiles, write_json
+
+
+def make_query(kind: str, rng: random.Random) -> str:
+    first, second = rng.sample(WORDS, 2)
+    return {
+        "word": first,
+        "words": f"{first} {second}",
+        "phrase": f'"{first} {second}"',
+        "negation": f"{first} -{second}",
+    }[kind]
+
+
+async def load_scopes(
+    count: int, database: str | None, rng: random.Random
+) -> list[tuple]:
+    """Pick organizations (with their manager) and one of their projects."""
+    conn = await connect(database)
+    try:
+        rows = await conn.fetch(
+            """
+            SELECT o.id, o.manager_id, p.id AS project_id
+            FROM organizations o
+            JOIN LATERAL (
+                SELECT id FROM projects WHERE organization_id = o.id LIMIT 1
+            ) p ON true
+            WHERE o.deleted_at IS NULL
+            ORDER BY o.id
+            LIMIT $1
+            """,
+            count * 10,
+        )
+    finally:
+        await conn.close()
+
+    return rng.sample(list(rows), min(count, len(rows)))
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    engine = create_async_engine(
+        async_database_url_scheme.format(
+            settings.DATABASE_USERNAME,
+            settings.DATABASE_PASSWORD,
+            settings.DATABASE_HOST,
+            settings.DATABASE_PORT,
+            args.database or settings.DATABASE_NAME,
+        )
+    )
+    service = SearchService(async_sessionmaker(bind=engine, expire_on_commit=False))
+    scopes = await load_scopes(args.scopes, args.database, rng)
+
+    samples: dict[str, list[float]] = defaultdict(list)
+    try:
+        for _ in range(args.queries):
+            organization_id, manager_id, project_id = rng.choice(scopes)
+            kind = rng.choice(("word", "words", "phrase", "negation"))
+            q = make_query(kind, rng)
+
+            for scope in ("organization", "project"):
+                cursor = None
+                for page in range(args.pages):
+                    params = SearchParams(q=q, page_size=args.page_size, cursor=cursor)
+                    started_at = time.perf_counter()
+                    if scope == "organization":
+                        result = await service.search_organization(
+                            organization_id, manager_id, True, params
+                        )
+                    else:
+                        result = await service.search_project(project_id, params)
+                    elapsed = time.perf_counter() - started_at
+
+                    samples[
+                        f"{scope}:{kind}:{'first' if page == 0 else 'next'}"
+                    ].append(elapsed)
+                    cursor = result.next_cursor
+                    if cursor is None:
+                        break
+
+        if args.explain:
+            await explain(engine, service, scopes[0], rng)
+    finally:
+        await engine.dispose()
+
+    return {
+        name: {"requests": len(values), **percentiles(values)}
+        for name, values in sorted(samples.items())
+    }
+
+
+async def explain(engine, service: SearchService, scope: tuple, rng) -> None:
+    """Print the plan of an organization search, as executed by the service."""
+    organization_id, manager_id, _ = scope
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    await service.search_organization(
+        organization_id, manager_id, True, SearchParams(q=make_query("word", rng))
+    )
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    statement, parameters = statements[-1]
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        plan = await raw.driver_connection.fetch(
+            f"EXPLAIN (ANALYZE, BUFFERS) {statement}", *parameters
+        )
+    print("\n".join(row[0] for row in plan))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scopes", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", default=None)
+    parser.add_argument("--explain", action="store_true")
+    parser.add_argument("--output", default=None, help="Write results to JSON file.")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    print(f"{'search':<36}{'requests':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in result.items():
+        print(
+            f"{name:<36}{r['requests']:>9}"
+            f"{r['p50'] * 1000:>10.1f}{r['p95'] * 1000:>10.1f}{r['p99'] * 1000:>10.1f}"
+        )
+
+    if args.output:
+        write_json(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
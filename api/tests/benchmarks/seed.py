@@ -0,0 +1,483 @@
+"""Generate a realistic synthetic dataset with COPY.
+
+The generated graph mirrors how the API is used: every organization has a
+manager and a set of members, pending/resolved invitations, projects with
+participants, and tasks assigned to the projects' contributors. Output is fully
+determined by `--seed`, so two runs with the same arguments produce the same
+rows (and ids).
+
+The schema must already exist (`alembic upgrade head`).
+
+Usage:
+    python -m api.tests.benchmarks.seed --rows 1000000 --truncate
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterable
+
+import asyncpg
+
+from api.tests.benchmarks.utils import connect
+from api.users.services import UserService
+from api.utils.ids import uuid7
+
+# Every seeded user shares this password, so load tests can log in as anyone.
+SEED_PASSWORD = "seeded-user-password"
+SEED_EMAIL_DOMAIN = "seed.example.com"
+
+# Tables in foreign key order along with the columns that are copied.
+TABLE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "users": (
+        "id",
+        "email",
+        "password",
+        "first_name",
+        "last_name",
+        "display_name",
+        "created_at",
+        "modified_at",
+    ),
+    "organizations": (
+        "id",
+        "manager_id",
+        "name",
+        "description",
+        "created_at",
+        "modified_at",
+    ),
+    "organization_memberships": (
+        "organization_id",
+        "user_id",
+        "is_active",
+        "created_at",
+        "modified_at",
+    ),
+    "organization_invitations": (
+        "organization_id",
+        "user_id",
+        "accepted",
+        "created_at",
+        "modified_at",
+    ),
+    "projects": (
+        "id",
+        "title",
+        "description",
+        "start_date",
+        "finish_date",
+        "deadline",
+        "organization_id",
+        "created_at",
+        "modified_at",
+    ),
+    "project_participants": (
+        "project_id",
+        "user_id",
+        "participation_type",
+        "created_at",
+        "modified_at",
+    ),
+    "tasks": (
+        "id",
+        "project_id",
+        "title",
+        "description",
+        "start_date",
+        "finish_date",
+        "deadline",
+        "state",
+        "priority",
+        "created_at",
+        "modified_at",
+    ),
+    "task_assignees": ("task_id", "user_id", "created_at"),
+    "project_task_stats": ("project_id", "state", "task_count"),
+}
+
+# Enum columns are stored by member name.
+TASK_STATES = (
+    ("BACKLOG", 15),
+    ("BLOCKED", 3),
+    ("CANCELLED", 4),
+    ("CODE_REVIEW", 6),
+    ("COMPLETED", 35),
+    ("IN_PROGRESS", 12),
+    ("QA", 5),
+    ("QA_REJECTED", 2),
+    ("REVIEWED", 3),
+    ("TODO", 15),
+)
+
+FIRST_NAMES = ("Ada", "Alan", "Grace", "Linus", "Margaret", "Dennis", "Barbara", "Ken")
+LAST_NAMES = ("Lovelace", "Turing", "Hopper", "Torvalds", "Hamilton", "Ritchie")
+WORDS = (
+    "api",
+    "billing",
+    "cache",
+    "dashboard",
+    "deploy",
+    "docs",
+    "export",
+    "invoice",
+    "login",
+    "migration",
+    "mobile",
+    "onboarding",
+    "payment",
+    "report",
+    "search",
+    "settings",
+)
+
+
+@dataclass(frozen=True)
+class Shape:
+    """Average shape of a single organization in the generated graph."""
+
+    members_per_organization: int = 40
+    invitations_per_organization: int = 10
+    projects_per_organization: int = 8
+    participants_per_project: int = 10
+    tasks_per_project: int = 150
+    max_assignees_per_task: int = 3
+    organizations_per_user: float = 1.5
+
+    @property
+    def rows_per_organization(self) -> float:
+        participants = self.projects_per_organization * self.participants_per_project
+        tasks = self.projects_per_organization * self.tasks_per_project
+        return (
+            1
+            + self.members_per_organization / self.organizations_per_user  # users
+            + self.members_per_organization
+            + self.invitations_per_organization
+            + self.projects_per_organization
+            + participants
+            + tasks
+            + tasks * self.max_assignees_per_task / 2
+        )
+
+    def organizations_for(self, rows: int) -> int:
+        return max(1, round(rows / self.rows_per_organization))
+
+    def users_for(self, organizations: int) -> int:
+        users = organizations * self.members_per_organization
+        return max(
+            math.ceil(users / self.organizations_per_user),
+            self.members_per_organization + self.invitations_per_organization,
+        )
+
+
+class Generator:
+    """Deterministic row generator. All randomness comes from a single seed."""
+
+    def __init__(self, shape: Shape, seed: int, now: datetime) -> None:
+        self.shape = shape
+        self.rng = random.Random(seed)
+        self.now = now
+        self.hashed_password = UserService(None)._hash_password(SEED_PASSWORD)
+        self.user_ids: list[uuid.UUID] = []
+
+    def new_id(self, created_at: datetime) -> uuid.UUID:
+        """Time-ordered id matching the row's creation time, like the app issues."""
+        return uuid7(int(created_at.timestamp() * 1000), self.rng.getrandbits(74))
+
+    def timestamps(
+        self, not_before: datetime | None = None
+    ) -> tuple[datetime, datetime]:
+        start = not_before or self.now - timedelta(days=365)
+        span = max(int((self.now - start).total_seconds()), 1)
+        created_at = start + timedelta(seconds=self.rng.randrange(span))
+        modified_span = max(int((self.now - created_at).total_seconds()), 1)
+        modified_at = created_at + timedelta(seconds=self.rng.randrange(modified_span))
+        return created_at, modified_at
+
+    def words(self, count: int) -> str:
+        return " ".join(self.rng.choice(WORDS) for _ in range(count))
+
+    def dates(self, created_at: datetime) -> tuple[date | None, date | None]:
+        """Return (start_date, deadline) around given creation time."""
+        if self.rng.random() < 0.2:
+            return None, None
+
+        start_date = created_at.date() + timedelta(days=self.rng.randrange(14))
+        deadline = start_date + timedelta(days=self.rng.randrange(1, 90))
+        return start_date, deadline
+
+    def users(self, count: int) -> Iterable[tuple[Any, ...]]:
+        for n in range(count):
+            created_at, modified_at = self.timestamps()
+            user_id = self.new_id(created_at)
+            self.user_ids.append(user_id)
+            first_name = self.rng.choice(FIRST_NAMES)
+            last_name = self.rng.choice(LAST_NAMES)
+            yield (
+                user_id,
+                f"user{n}@{SEED_EMAIL_DOMAIN}",
+                self.hashed_password,
+                first_name,
+                last_name,
+                f"{first_name} {last_name[0]}." if self.rng.random() < 0.5 else None,
+                created_at,
+                modified_at,
+            )
+
+    def organization(self, number: int) -> dict[str, list[tuple[Any, ...]]]:
+        """Generate one organization along with everything that belongs to it."""
+        shape = self.shape
+        rows: dict[str, list[tuple[Any, ...]]] = {t: [] for t in TABLE_COLUMNS}
+
+        population = len(self.user_ids)
+        picked = self.rng.sample(
+            range(population),
+            min(
+                shape.members_per_organization + shape.invitations_per_organization,
+                population,
+            ),
+        )
+        members = [self.user_ids[i] for i in picked[: shape.members_per_organization]]
+        invitees = [self.user_ids[i] for i in picked[shape.members_per_organization :]]
+        manager_id = members[0]
+
+        created_at, modified_at = self.timestamps()
+        organization_id = self.new_id(created_at)
+        rows["organizations"].append(
+            (
+                organization_id,
+                manager_id,
+                f"Organization {number}",
+                self.words(6),
+                created_at,
+                modified_at,
+            )
+        )
+
+        for user_id in members:
+            rows["organization_memberships"].append(
+                (
+                    organization_id,
+                    user_id,
+                    user_id == manager_id or self.rng.random() < 0.95,
+                    *self.timestamps(created_at),
+                )
+            )
+
+        for user_id in invitees:
+            rows["organization_invitations"].append(
+                (
+                    organization_id,
+                    user_id,
+                    self.rng.choice((None, None, None, True, False)),
+                    *self.timestamps(created_at),
+                )
+            )
+
+        for _ in range(shape.projects_per_organization):
+            self._project(rows, organization_id, members, created_at)
+
+        return rows
+
+    def _project(
+        self,
+        rows: dict[str, list[tuple[Any, ...]]],
+        organization_id: uuid.UUID,
+        members: list[uuid.UUID],
+        not_before: datetime,
+    ) -> None:
+        created_at, modified_at = self.timestamps(not_before)
+        project_id = self.new_id(created_at)
+        start_date, deadline = self.dates(created_at)
+        rows["projects"].append(
+            (
+                project_id,
+                self.words(3).title(),
+                self.words(20),
+                start_date,
+                None,
+                deadline,
+                organization_id,
+                created_at,
+                modified_at,
+            )
+        )
+
+        contributors = []
+        participants = self.rng.sample(
+            members, min(self.shape.participants_per_project, len(members))
+        )
+        for user_id in participants:
+            participation_type = "CONTRIBUTOR" if self.rng.random() < 0.8 else "VIEWER"
+            if participation_type == "CONTRIBUTOR":
+                contributors.append(user_id)
+            rows["project_participants"].append(
+                (
+                    project_id,
+                    user_id,
+                    participation_type,
+                    *self.timestamps(created_at),
+                )
+            )
+
+        states, weights = zip(*TASK_STATES)
+        task_counts: Counter[str] = Counter()
+        for _ in range(self.shape.tasks_per_project):
+            task_created_at, task_modified_at = self.timestamps(created_at)
+            task_id = self.new_id(task_created_at)
+            task_start_date, task_deadline = self.dates(task_created_at)
+            state = self.rng.choices(states, weights)[0]
+            task_counts[state] += 1
+            finish_date = None
+            if state == "COMPLETED":
+                finish_date = (task_start_date or task_created_at.date()) + timedelta(
+                    days=self.rng.randrange(30)
+                )
+
+            rows["tasks"].append(
+                (
+                    task_id,
+                    project_id,
+                    self.words(5).capitalize(),
+                    self.words(30) if self.rng.random() < 0.7 else None,
+                    task_start_date,
+                    finish_date,
+                    task_deadline,
+                    state,
+                    self.rng.randrange(4),
+                    task_created_at,
+                    task_modified_at,
+                )
+            )
+
+            assignees = self.rng.randint(
+                0, min(self.shape.max_assignees_per_task, len(contributors))
+            )
+            for user_id in self.rng.sample(contributors, assignees):
+                rows["task_assignees"].append(
+                    (task_id, user_id, self.timestamps(task_created_at)[0])
+                )
+
+        rows["project_task_stats"].extend(
+            (project_id, state, count) for state, count in task_counts.items()
+        )
+
+
+async def copy_rows(
+    conn: asyncpg.Connection, table: str, rows: Iterable[tuple[Any, ...]]
+) -> int:
+    rows = list(rows)
+    if rows:
+        await conn.copy_records_to_table(
+            table, records=rows, columns=TABLE_COLUMNS[table]
+        )
+    return len(rows)
+
+
+async def seed(
+    rows: int,
+    shape: Shape,
+    seed_value: int,
+    database: str | None,
+    truncate: bool,
+    chunk_size: int,
+) -> dict[str, int]:
+    organizations = shape.organizations_for(rows)
+    users = shape.users_for(organizations)
+    generator = Generator(
+        shape, seed_value, now=datetime(2025, 1, 1, tzinfo=timezone.utc)
+    )
+    counts = {table: 0 for table in TABLE_COLUMNS}
+
+    conn = await connect(database)
+    try:
+        if truncate:
+            await conn.execute(f"TRUNCATE {', '.join(reversed(TABLE_COLUMNS))} CASCADE")
+
+        async with conn.transaction():
+            counts["users"] = await copy_rows(conn, "users", generator.users(users))
+
+        for start in range(0, organizations, chunk_size):
+            chunk: dict[str, list[tuple[Any, ...]]] = {t: [] for t in TABLE_COLUMNS}
+            for number in range(start, min(start + chunk_size, organizations)):
+                for table, table_rows in generator.organization(number).items():
+                    chunk[table].extend(table_rows)
+
+            async with conn.transaction():
+                for table, table_rows in chunk.items():
+                    counts[table] += await copy_rows(conn, table, table_rows)
+
+            print(
+                f"organizations: {min(start + chunk_size, organizations)}/{organizations}"
+            )
+
+        await conn.execute("ANALYZE")
+    finally:
+        await conn.close()
+
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=100_000,
+        help="Approximate number of rows to generate across all tables.",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--database", default=None, help="Defaults to DATABASE_NAME setting."
+    )
+    parser.add_argument(
+        "--truncate", action="store_true", help="Remove existing rows first."
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=50,
+        help="Number of organizations copied per transaction.",
+    )
+    parser.add_argument(
+        "--tasks-per-project", type=int, default=Shape.tasks_per_project
+    )
+    parser.add_argument(
+        "--members-per-organization", type=int, default=Shape.members_per_organization
+    )
+    args = parser.parse_args()
+
+    shape = Shape(
+        tasks_per_project=args.tasks_per_project,
+        members_per_organization=args.members_per_organization,
+    )
+
+    started_at = time.perf_counter()
+    counts = asyncio.run(
+        seed(
+            args.rows,
+            shape,
+            args.seed,
+            args.database,
+            args.truncate,
+            args.chunk_size,
+        )
+    )
+    elapsed = time.perf_counter() - started_at
+
+    for table, count in counts.items():
+        print(f"{table:<28}{count:>12}")
+    total = sum(counts.values())
+    print(
+        f"{'total':<28}{total:>12} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
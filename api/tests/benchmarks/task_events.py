@@ -0,0 +1,243 @@
+"""Load test live task events with many concurrent subscribers.
+
+Subscribers are spread evenly over projects and read their project's events
+while task events are published with `NOTIFY` at a steady rate, the way
+`TaskService` publishes them. Delivery latency (publish to receipt) percentiles
+are reported, along with subscribers cut off with a `resync` event; a fraction
+of subscribers (`--slow`) reads an event per second only, to exercise
+backpressure.
+
+In-process, subscribers read `TaskEventBroker.stream` directly, i.e. a single
+broker listening on its own connection, as in a worker. With `--base-url`,
+they open SSE streams of a running server (one node) instead, as seeded
+organization managers; seed the database first:
+    python -m api.tests.benchmarks.seed --rows 1000000 --truncate
+
+Usage:
+    python -m api.tests.benchmarks.task_events --subscribers 10000 --duration 30
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import resource
+import time
+from collections import Counter
+from typing import AsyncIterator
+from uuid import UUID, uuid4
+
+import httpx
+
+from api.tasks.enums import TaskEventType
+from api.tasks.events import CHANNEL, TaskEventBroker
+from api.tests.benchmarks.load import load_virtual_users, login
+from api.tests.benchmarks.utils import connect, percentiles, write_json
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.sent: dict[str, float] = {}
+        self.latencies: list[float] = []
+        self.counts: Counter[str] = Counter()
+
+
+async def read_events(lines: AsyncIterator[str]) -> AsyncIterator[tuple[str, str]]:
+    """Parse (event, data) pairs of a server-sent events stream."""
+    event, data = None, ""
+    async for line in lines:
+        if line.startswith("event: "):
+            event = line.removeprefix("event: ")
+        elif line.startswith("data: "):
+            data = line.removeprefix("data: ")
+        elif not line and event:
+            yield event, data
+            event, data = None, ""
+
+
+async def split_lines(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    async for chunk in chunks:
+        for line in chunk.split("\n"):
+            yield line
+
+
+async def subscriber(lines: AsyncIterator[str], stats: Stats, slow: bool) -> None:
+    stats.counts["subscribed"] += 1
+    async for event, data in read_events(lines):
+        if event == "resync":
+            stats.counts["cut_off"] += 1
+            return
+
+        sent_at = stats.sent.get(json.loads(data)["task_id"])
+        if sent_at is not None:
+            stats.latencies.append(time.perf_counter() - sent_at)
+        stats.counts["received"] += 1
+        if slow:
+            await asyncio.sleep(1)
+
+
+async def publish(
+    project_ids: list[UUID],
+    rate: float,
+    duration: float,
+    stats: Stats,
+    database: str | None,
+    rng: random.Random,
+) -> None:
+    """NOTIFY `rate` events per second for `duration` seconds, each committed on
+    its own like the writes of `TaskService`."""
+    conn = await connect(database)
+    try:
+        started_at = time.perf_counter()
+        for n in range(int(rate * duration)):
+            await asyncio.sleep(max(0, started_at + n / rate - time.perf_counter()))
+            task_id = str(uuid4())
+            payload = {
+                "type": TaskEventType.UPDATED.value,
+                "project_id": str(rng.choice(project_ids)),
+                "task_id": task_id,
+                "user_id": None,
+            }
+            stats.sent[task_id] = time.perf_counter()
+            await conn.execute("SELECT pg_notify($1, $2)", CHANNEL, json.dumps(payload))
+            stats.counts["published"] += 1
+    finally:
+        await conn.close()
+
+
+async def run_in_process(args: argparse.Namespace, stats: Stats) -> None:
+    rng = random.Random(args.seed)
+    broker = TaskEventBroker(max_stream_seconds=args.duration + 60)
+    broker.start()
+    while not broker.listening:
+        await asyncio.sleep(0.05)
+
+    project_ids = [uuid4() for _ in range(args.projects)]
+    tasks = [
+        asyncio.create_task(
+            subscriber(
+                split_lines(broker.stream(project_ids[n % len(project_ids)])),
+                stats,
+                rng.random() < args.slow,
+            )
+        )
+        for n in range(args.subscribers)
+    ]
+    # Let every subscriber subscribe before publishing.
+    await asyncio.sleep(1)
+    stats.counts["peak_subscribers"] = broker.subscribers
+
+    try:
+        await publish(project_ids, args.rate, args.duration, stats, args.database, rng)
+        await asyncio.sleep(1)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await broker.stop()
+
+
+async def run_against_server(args: argparse.Namespace, stats: Stats) -> None:
+    rng = random.Random(args.seed)
+    users = await load_virtual_users(args.users, args.database)
+    if not users:
+        raise SystemExit(
+            "No seeded users found. Run `api.tests.benchmarks.seed` first."
+        )
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    timeout = httpx.Timeout(30, read=None)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=timeout
+    ) as client:
+        for user in users:
+            await login(client, user)
+
+        subscriptions = [
+            (user, user.project_ids[n % len(user.project_ids)])
+            for n, user in zip(range(args.subscribers), itertools.cycle(users))
+        ]
+        project_ids = sorted({project_id for _, project_id in subscriptions})
+
+        async def subscribe(user, project_id) -> None:
+            try:
+                async with client.stream(
+                    "GET", f"/projects/{project_id}/events", headers=user.headers
+                ) as response:
+                    if response.status_code != 200:
+                        stats.counts["errors"] += 1
+                        return
+                    await subscriber(
+                        response.aiter_lines(), stats, rng.random() < args.slow
+                    )
+            except httpx.HTTPError:
+                stats.counts["errors"] += 1
+
+        tasks = [asyncio.create_task(subscribe(*s)) for s in subscriptions]
+        while stats.counts["subscribed"] + stats.counts["errors"] < len(tasks):
+            await asyncio.sleep(0.1)
+        stats.counts["peak_subscribers"] = stats.counts["subscribed"]
+
+        try:
+            await publish(
+                project_ids, args.rate, args.duration, stats, args.database, rng
+            )
+            await asyncio.sleep(1)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    stats = Stats()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if args.base_url:
+        await run_against_server(args, stats)
+    else:
+        await run_in_process(args, stats)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "target": args.base_url or "in-process",
+        "subscribers": stats.counts["peak_subscribers"],
+        "published": stats.counts["published"],
+        "received": stats.counts["received"],
+        "cut_off": stats.counts["cut_off"],
+        "errors": stats.counts["errors"],
+        # Peak resident memory grown during the run, in kilobytes.
+        "max_rss_growth_kb": rss_after - rss_before,
+        "latency": percentiles(stats.latencies) if stats.latencies else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=10000)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=100, help="Events per second.")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--slow", type=float, default=0.01)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--database", default=None)
+    parser.add_argument("--output", default=None, help="Write results to JSON file.")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    for name, value in result.items():
+        if name == "latency" and value:
+            value = ", ".join(
+                f"{p} {value[p] * 1000:.1f} ms" for p in ("p50", "p95", "p99")
+            )
+        print(f"{name:<20}{value}")
+
+    if args.output:
+        write_json(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Time critical path computation of a project with many dependent tasks.
+
+A project with `--tasks` tasks is added to the first organization of the
+database, each task depending on up to `--dependencies` earlier ones, and its
+critical path is read through `TaskDependencyService`: cold (loading the graph
+from the database), cached, and after adding a dependency, which updates the
+cached graph in place. The project is deleted afterwards.
+
+Seed the database first, e.g.:
+    python -m api.tests.benchmarks.seed --rows 10000 --truncate
+
+Usage:
+    python -m api.tests.benchmarks.task_graph --tasks 50000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.config import settings
+from api.database.setup import async_database_url_scheme
+from api.tasks.dependencies import TaskDependencyService, dependency_graphs
+from api.tasks.enums import TaskState
+from api.tasks.models import Task
+from api.tests.benchmarks.utils import connect, write_json
+from api.utils.ids import uuid7
+
+OPEN_STATES = [s.name for s in TaskState if s != TaskState.COMPLETED]
+
+
+async def create_project(
+    tasks: int, dependencies: int, database: str | None, rng: random.Random
+) -> tuple[UUID, list[UUID]]:
+    conn = await connect(database)
+    try:
+        organization_id = await conn.fetchval("SELECT id FROM organizations LIMIT 1")
+        if organization_id is None:
+            raise SystemExit(
+                "No organization found. Run `api.tests.benchmarks.seed` first."
+            )
+
+        project_id = uuid7()
+        now = datetime.now(timezone.utc)
+        today = date.today()
+        task_ids = [uuid7() for _ in range(tasks)]
+        task_rows = []
+        for n, task_id in enumerate(task_ids):
+            start_date = today + timedelta(days=rng.randint(-30, 30))
+            task_rows.append(
+                (
+                    task_id,
+                    project_id,
+                    f"Task {n}",
+                    rng.choice(OPEN_STATES),
+                    rng.randint(0, 3),
+                    start_date,
+                    start_date + timedelta(days=rng.randint(0, 10)),
+                    now,
+                    now,
+                )
+            )
+        dependency_rows = {
+            (task_id, task_ids[rng.randrange(max(0, n - 200), n)], project_id)
+            for n, task_id in enumerate(task_ids[1:], 1)
+            for _ in range(rng.randint(0, dependencies))
+        }
+
+        async with conn.transaction():
+            await conn.execute(
+                "INSERT INTO projects (id, organization_id, title, created_at, modified_at) "
+                "VALUES ($1, $2, 'Task graph benchmark', $3, $3)",
+                project_id,
+                organization_id,
+                now,
+            )
+            await conn.copy_records_to_table(
+                Task.__tablename__,
+                records=task_rows,
+                columns=[
+                    "id",
+                    "project_id",
+                    "title",
+                    "state",
+                    "priority",
+                    "start_date",
+                    "deadline",
+                    "created_at",
+                    "modified_at",
+                ],
+            )
+            await conn.copy_records_to_table(
+                "task_dependencies",
+                records=list(dependency_rows),
+                columns=["task_id", "depends_on_id", "project_id"],
+            )
+    finally:
+        await conn.close()
+
+    return project_id, task_ids
+
+
+async def delete_project(project_id: UUID, database: str | None) -> None:
+    conn = await connect(database)
+    try:
+        await conn.execute("DELETE FROM projects WHERE id = $1", project_id)
+    finally:
+        await conn.close()
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    engine = create_async_engine(
+        async_database_url_scheme.format(
+            settings.DATABASE_USERNAME,
+            settings.DATABASE_PASSWORD,
+            settings.DATABASE_HOST,
+            settings.DATABASE_PORT,
+            args.database or settings.DATABASE_NAME,
+        )
+    )
+    service = TaskDependencyService(
+        async_sessionmaker(bind=engine, expire_on_commit=False)
+    )
+    project_id, task_ids = await create_project(
+        args.tasks, args.dependencies, args.database, rng
+    )
+
+    timings = {}
+    try:
+        started_at = time.perf_counter()
+        result = await service.get_critical_path(project_id)
+        timings["cold"] = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        await service.get_critical_path(project_id)
+        timings["cached"] = time.perf_counter() - started_at
+
+        task = Task(
+            project_id=project_id,
+            title="",
+            description=None,
+            start_date=None,
+            finish_date=None,
+            deadline=None,
+            state=TaskState.TODO,
+            priority=0,
+        )
+        task.id = task_ids[-1]
+        await service.add_dependency(task, task_ids[0])
+        started_at = time.perf_counter()
+        await service.get_critical_path(project_id)
+        timings["after_change"] = time.perf_counter() - started_at
+    finally:
+        dependency_graphs.invalidate(project_id)
+        await delete_project(project_id, args.database)
+        await engine.dispose()
+
+    return {
+        "tasks": args.tasks,
+        "critical_path_length": len(result.path),
+        **{f"{name}_ms": seconds * 1000 for name, seconds in timings.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=50000)
+    parser.add_argument(
+        "--dependencies", type=int, default=3, help="Maximum dependencies per task."
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", default=None)
+    parser.add_argument("--output", default=None, help="Write results to JSON file.")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    for name, value in result.items():
+        print(
+            f"{name:<24}{value:.1f}"
+            if isinstance(value, float)
+            else f"{name:<24}{value}"
+        )
+
+    if args.output:
+        write_json(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Compare project task stats read from `project_task_stats` with live aggregation.
+
+For random projects of the seeded database, stats are read through
+`TaskService.get_project_stats` and computed by aggregating `tasks` on demand;
+latency percentiles of both are reported, and both results are checked to be
+equal.
+
+Seed the database first; e.g. for about 5M tasks:
+    python -m api.tests.benchmarks.seed --rows 13200000 --truncate
+
+Usage:
+    python -m api.tests.benchmarks.task_stats --requests 500
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.config import settings
+from api.database.setup import async_database_url_scheme
+from api.tasks.enums import CLOSED_TASK_STATES, TaskState
+from api.tasks.models import Task
+from api.tasks.services import TaskService
+from api.tests.benchmarks.utils import connect, percentiles, write_json
+
+
+async def live_stats(session_maker: async_sessionmaker, project_id: UUID) -> dict:
+    """Aggregate stats of a project straight from `tasks`."""
+    query = (
+        select(
+            Task.state,
+            func.count(),
+            func.count().filter(
+                Task.deadline < func.current_date(),
+                Task.state.not_in(CLOSED_TASK_STATES),
+            ),
+        )
+        .where(Task.project_id == project_id)
+        .group_by(Task.state)
+    )
+    async with session_maker() as ac:
+        rows = (await ac.execute(query)).all()
+
+    states = {state: 0 for state in TaskState}
+    states |= {state: count for state, count, _ in rows}
+    return {"states": states, "overdue": sum(overdue for *_, overdue in rows)}
+
+
+async def load_projects(
+    count: int, database: str | None, rng: random.Random
+) -> list[UUID]:
+    conn = await connect(database)
+    try:
+        rows = await conn.fetch(
+            "SELECT id FROM projects WHERE deleted_at IS NULL ORDER BY id LIMIT $1",
+            count * 10,
+        )
+    finally:
+        await conn.close()
+
+    return [row["id"] for row in rng.sample(list(rows), min(count, len(rows)))]
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    engine = create_async_engine(
+        async_database_url_scheme.format(
+            settings.DATABASE_USERNAME,
+            settings.DATABASE_PASSWORD,
+            settings.DATABASE_HOST,
+            settings.DATABASE_PORT,
+            args.database or settings.DATABASE_NAME,
+        )
+    )
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    service = TaskService(session_maker)
+    projects = await load_projects(args.projects, args.database, rng)
+
+    samples: dict[str, list[float]] = {"summary": [], "live": []}
+    mismatches = 0
+    try:
+        for _ in range(args.requests):
+            project_id = rng.choice(projects)
+
+            started_at = time.perf_counter()
+            summary = await service.get_project_stats(project_id)
+            samples["summary"].append(time.perf_counter() - started_at)
+
+            started_at = time.perf_counter()
+            live = await live_stats(session_maker, project_id)
+            samples["live"].append(time.perf_counter() - started_at)
+
+            if summary.states != live["states"] or summary.overdue != live["overdue"]:
+                mismatches += 1
+    finally:
+        await engine.dispose()
+
+    return {
+        "mismatches": mismatches,
+        **{
+            name: {"requests": len(values), **percentiles(values)}
+            for name, values in samples.items()
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", default=None)
+    parser.add_argument("--output", default=None, help="Write results to JSON file.")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    print(f"{'stats':<12}{'requests':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name in ("summary", "live"):
+        r = result[name]
+        print(
+            f"{name:<12}{r['requests']:>9}"
+            f"{r['p50'] * 1000:>10.1f}{r['p95'] * 1000:>10.1f}{r['p99'] * 1000:>10.1f}"
+        )
+    print(f"mismatches: {result['mismatches']}")
+
+    if args.output:
+        write_json(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
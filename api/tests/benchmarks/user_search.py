@@ -0,0 +1,117 @@
+"""Measure user search latency on a seeded database.
+
+Runs organization and project scoped user searches, through `SearchService`,
+for prefixes of the seed's names and emails and for substrings of its last
+names, along with unscoped lookups of full emails, and reports latency
+percentiles per scope and query kind.
+
+Seed the database first; e.g. for about 5M users:
+    python -m api.tests.benchmarks.seed --rows 31000000 --tasks-per-project 0 --truncate
+
+Usage:
+    python -m api.tests.benchmarks.user_search --queries 200
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.config import settings
+from api.database.setup import async_database_url_scheme
+from api.search.schemas import UserSearchParams
+from api.search.services import SearchService
+from api.tests.benchmarks.search import load_scopes
+from api.tests.benchmarks.seed import FIRST_NAMES, LAST_NAMES, SEED_EMAIL_DOMAIN
+from api.tests.benchmarks.utils import percentiles, write_json
+
+KINDS = ("first_name", "full_name", "email", "substring")
+
+
+def make_query(kind: str, rng: random.Random) -> str:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    start = rng.randrange(1, len(last) - 2)
+    return {
+        "first_name": first[:3],
+        "full_name": f"{first} {last[:3]}",
+        "email": f"user{rng.randrange(100000)}",
+        # Not a prefix of any field, so searched on the trigram index.
+        "substring": last[start : start + 3],
+    }[kind]
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    engine = create_async_engine(
+        async_database_url_scheme.format(
+            settings.DATABASE_USERNAME,
+            settings.DATABASE_PASSWORD,
+            settings.DATABASE_HOST,
+            settings.DATABASE_PORT,
+            args.database or settings.DATABASE_NAME,
+        )
+    )
+    service = SearchService(async_sessionmaker(bind=engine, expire_on_commit=False))
+    scopes = await load_scopes(args.scopes, args.database, rng)
+
+    samples: dict[str, list[float]] = defaultdict(list)
+    try:
+        for _ in range(args.queries):
+            organization_id, _, project_id = rng.choice(scopes)
+            kind = rng.choice(KINDS)
+            q = make_query(kind, rng)
+            email = f"user{rng.randrange(100000)}@{SEED_EMAIL_DOMAIN}"
+
+            for name, params in (
+                ("users:email", UserSearchParams(q=email)),
+                (
+                    f"organization:{kind}",
+                    UserSearchParams(
+                        q=q, limit=args.limit, organization_id=organization_id
+                    ),
+                ),
+                (
+                    f"project:{kind}",
+                    UserSearchParams(q=q, limit=args.limit, project_id=project_id),
+                ),
+            ):
+                started_at = time.perf_counter()
+                await service.search_users(params)
+                samples[name].append(time.perf_counter() - started_at)
+    finally:
+        await engine.dispose()
+
+    return {
+        name: {"requests": len(values), **percentiles(values)}
+        for name, values in sorted(samples.items())
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scopes", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", default=None)
+    parser.add_argument("--output", default=None, help="Write results to JSON file.")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    print(f"{'search':<36}{'requests':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in result.items():
+        print(
+            f"{name:<36}{r['requests']:>9}"
+            f"{r['p50'] * 1000:>10.1f}{r['p95'] * 1000:>10.1f}{r['p99'] * 1000:>10.1f}"
+        )
+
+    if args.output:
+        write_json(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import json
+import statistics
+from pathlib import Path
+
+import asyncpg
+
+from api.config import settings
+
+
+async def connect(database: str | None = None) -> asyncpg.Connection:
+    """Open a raw asyncpg connection using the configured database credentials.
+
+    Benchmarks talk to asyncpg directly, since COPY and server-side timings are
+    not exposed through SQLAlchemy sessions.
+    """
+    return await asyncpg.connect(
+        user=settings.DATABASE_USERNAME,
+        password=settings.DATABASE_PASSWORD,
+        host=settings.DATABASE_HOST,
+        port=settings.DATABASE_PORT,
+        database=database or settings.DATABASE_NAME,
+    )
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """Return p50/p95/p99 of given samples (inclusive method, 0 when empty)."""
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+    if len(samples) == 1:
+        return {"p50": samples[0], "p95": samples[0], "p99": samples[0]}
+
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+
+
+def write_json(path: str | Path, data: dict) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, sort_keys=True, default=str))
+
+
+def read_json(path: str | Path) -> dict:
+    return json.loads(Path(path).read_text())
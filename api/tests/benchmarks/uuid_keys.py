@@ -0,0 +1,138 @@
+"""Compare random (v4) and time-ordered (v7) UUID primary keys on a tasks-like table.
+
+Rows are inserted in batches with COPY into two identical scratch tables, one
+per id version. For each version the script reports insert throughput, WAL
+volume (write amplification) and the resulting primary key index size.
+
+Usage:
+    python -m api.tests.benchmarks.uuid_keys --rows 10000000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+
+from api.tests.benchmarks.utils import connect, write_json
+from api.utils.ids import uuid7
+
+_STARTED_AT_MS = time.time_ns() // 1_000_000
+
+TABLE_DDL = """
+CREATE TABLE {table} (
+    id uuid PRIMARY KEY,
+    project_id uuid NOT NULL,
+    title varchar(255) NOT NULL,
+    priority smallint NOT NULL,
+    created_at timestamptz NOT NULL
+)
+"""
+
+
+def _ids(version: int, offset: int, count: int, rng: random.Random) -> list[uuid.UUID]:
+    if version == 4:
+        return [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(count)]
+
+    # Generating a batch takes a few milliseconds, while in production rows
+    # arrive spread over time. Simulate one insert per millisecond.
+    return [
+        uuid7(_STARTED_AT_MS + offset + n, rng.getrandbits(74)) for n in range(count)
+    ]
+
+
+async def run_variant(
+    version: int, rows: int, batch_size: int, database: str | None, keep: bool
+) -> dict:
+    table = f"bench_uuid_v{version}_tasks"
+    rng = random.Random(version)
+    project_ids = [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(100)]
+    created_at = datetime.now(timezone.utc)
+
+    conn = await connect(database)
+    try:
+        await conn.execute(f"DROP TABLE IF EXISTS {table}")
+        await conn.execute(TABLE_DDL.format(table=table))
+
+        wal_before = await conn.fetchval("SELECT pg_current_wal_lsn()")
+        elapsed = 0.0
+
+        for offset in range(0, rows, batch_size):
+            count = min(batch_size, rows - offset)
+            records = [
+                (id_, rng.choice(project_ids), "Benchmark task", offset % 4, created_at)
+                for id_ in _ids(version, offset, count, rng)
+            ]
+
+            # Only the time spent in the database is measured.
+            started_at = time.perf_counter()
+            await conn.copy_records_to_table(
+                table,
+                records=records,
+                columns=("id", "project_id", "title", "priority", "created_at"),
+            )
+            elapsed += time.perf_counter() - started_at
+
+        wal_bytes = await conn.fetchval(
+            "SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), $1)", wal_before
+        )
+        index_bytes = await conn.fetchval(
+            "SELECT pg_relation_size($1::regclass)", f"{table}_pkey"
+        )
+        table_bytes = await conn.fetchval(
+            "SELECT pg_relation_size($1::regclass)", table
+        )
+
+        if not keep:
+            await conn.execute(f"DROP TABLE {table}")
+    finally:
+        await conn.close()
+
+    return {
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed,
+        "wal_bytes": int(wal_bytes),
+        "pkey_index_bytes": index_bytes,
+        "table_bytes": table_bytes,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    return {
+        f"v{version}": await run_variant(
+            version, args.rows, args.batch_size, args.database, args.keep
+        )
+        for version in (4, 7)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--database", default=None)
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep scratch tables for inspection."
+    )
+    parser.add_argument("--output", default=None, help="Write results to JSON file.")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    print(f"{'version':<9}{'rows/s':>12}{'WAL MB':>10}{'pkey MB':>10}{'table MB':>10}")
+    for version, r in result.items():
+        print(
+            f"{version:<9}{r['rows_per_second']:>12.0f}"
+            f"{r['wal_bytes'] / 2**20:>10.1f}"
+            f"{r['pkey_index_bytes'] / 2**20:>10.1f}"
+            f"{r['table_bytes'] / 2**20:>10.1f}"
+        )
+
+    if args.output:
+        write_json(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""Time the workload report of an organization with many members.
+
+An organization with `--members` new members is created along with `--projects`
+projects of `--tasks` tasks in total, each assigned to one or two members. Its
+workload is then read through `OrganizationWorkloadService` `--requests` times
+uncached and once cached. Everything created is deleted afterwards.
+
+Usage:
+    python -m api.tests.benchmarks.workload --members 5000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.config import settings
+from api.database.setup import async_database_url_scheme
+from api.orgs.workload import OrganizationWorkloadService, workload_cache
+from api.tasks.enums import TaskState
+from api.tests.benchmarks.utils import connect, percentiles, write_json
+from api.utils.ids import uuid7
+
+STATES = [s.name for s in TaskState]
+
+
+async def create_organization(
+    args: argparse.Namespace, rng: random.Random
+) -> tuple[UUID, list[UUID], list[UUID]]:
+    now = datetime.now(timezone.utc)
+    today = date.today()
+    user_ids = [uuid7() for _ in range(args.members)]
+    organization_id = uuid7()
+    project_ids = [uuid7() for _ in range(args.projects)]
+    task_rows, assignee_rows = [], set()
+    for n in range(args.tasks):
+        task_id, state = uuid7(), rng.choice(STATES)
+        task_rows.append(
+            (
+                task_id,
+                rng.choice(project_ids),
+                f"Task {n}",
+                state,
+                rng.randint(0, 3),
+                today + timedelta(days=rng.randint(-30, 30)),
+                today if state == TaskState.COMPLETED.name else None,
+                now,
+                now,
+            )
+        )
+        for user_id in rng.sample(user_ids, rng.randint(1, 2)):
+            assignee_rows.add((task_id, user_id, now))
+
+    conn = await connect(args.database)
+    try:
+        async with conn.transaction():
+            await conn.copy_records_to_table(
+                "users",
+                records=[
+                    (
+                        user_id,
+                        f"workload-{user_id}@foo.buz",
+                        "",
+                        "Member",
+                        "Buz",
+                        now,
+                        now,
+                    )
+                    for user_id in user_ids
+                ],
+                columns=[
+                    "id",
+                    "email",
+                    "password",
+                    "first_name",
+                    "last_name",
+                    "created_at",
+                    "modified_at",
+                ],
+            )
+            await conn.execute(
+                "INSERT INTO organizations (id, manager_id, name, created_at, modified_at) "
+                "VALUES ($1, $2, 'Workload benchmark', $3, $3)",
+                organization_id,
+                user_ids[0],
+                now,
+            )
+            await conn.copy_records_to_table(
+                "organization_memberships",
+                records=[
+                    (organization_id, user_id, rng.random() < 0.95, now, now)
+                    for user_id in user_ids
+                ],
+                columns=[
+                    "organization_id",
+                    "user_id",
+                    "is_active",
+                    "created_at",
+                    "modified_at",
+                ],
+            )
+            await conn.copy_records_to_table(
+                "projects",
+                records=[
+                    (project_id, organization_id, f"Project {n}", now, now)
+                    for n, project_id in enumerate(project_ids)
+                ],
+                columns=["id", "organization_id", "title", "created_at", "modified_at"],
+            )
+            await conn.copy_records_to_table(
+                "tasks",
+                records=task_rows,
+                columns=[
+                    "id",
+                    "project_id",
+                    "title",
+                    "state",
+                    "priority",
+                    "deadline",
+                    "finish_date",
+                    "created_at",
+                    "modified_at",
+                ],
+            )
+            await conn.copy_records_to_table(
+                "task_assignees",
+                records=list(assignee_rows),
+                columns=["task_id", "user_id", "created_at"],
+            )
+        # As autovacuum would eventually, for index-only scans and fresh stats.
+        await conn.execute(
+            "VACUUM ANALYZE organization_memberships, projects, tasks, task_assignees"
+        )
+    finally:
+        await conn.close()
+
+    return organization_id, project_ids, user_ids
+
+
+async def delete_organization(
+    organization_id: UUID, user_ids: list[UUID], database: str | None
+) -> None:
+    conn = await connect(database)
+    try:
+        async with conn.transaction():
+            await conn.execute(
+                "DELETE FROM projects WHERE organization_id = $1", organization_id
+            )
+            await conn.execute(
+                "DELETE FROM organizations WHERE id = $1", organization_id
+            )
+            await conn.execute("DELETE FROM users WHERE id = ANY($1)", user_ids)
+    finally:
+        await conn.close()
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    engine = create_async_engine(
+        async_database_url_scheme.format(
+            settings.DATABASE_USERNAME,
+            settings.DATABASE_PASSWORD,
+            settings.DATABASE_HOST,
+            settings.DATABASE_PORT,
+            args.database or settings.DATABASE_NAME,
+        )
+    )
+    service = OrganizationWorkloadService(
+        async_sessionmaker(bind=engine, expire_on_commit=False)
+    )
+    organization_id, _, user_ids = await create_organization(args, rng)
+
+    samples = []
+    try:
+        for _ in range(args.requests):
+            workload_cache.invalidate(organization_id)
+            started_at = time.perf_counter()
+            result = await service.get_workload(organization_id)
+            samples.append((time.perf_counter() - started_at) * 1000)
+
+        started_at = time.perf_counter()
+        await service.get_workload(organization_id)
+        cached = (time.perf_counter() - started_at) * 1000
+    finally:
+        workload_cache.invalidate(organization_id)
+        await delete_organization(organization_id, user_ids, args.database)
+        await engine.dispose()
+
+    return {
+        "members": args.members,
+        "active_members": len(result.members),
+        "tasks": args.tasks,
+        **{
+            f"uncached_{name}_ms": value for name, value in percentiles(samples).items()
+        },
+        "cached_ms": cached,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=5000)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", default=None)
+    parser.add_argument("--output", default=None, help="Write results to JSON file.")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    for name, value in result.items():
+        print(
+            f"{name:<24}{value:.1f}"
+            if isinstance(value, float)
+            else f"{name:<24}{value}"
+        )
+
+    if args.output:
+        write_json(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
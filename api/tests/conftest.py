@@ -1,10 +1,16 @@
-from typing import AsyncGenerator, Generator
+from functools import partial
+from typing import AsyncGenerator, Callable, ContextManager, Generator
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import create_engine, event, text
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, SessionTransaction
 
 from api.config import settings
@@ -15,6 +21,7 @@ from api.database.setup import (
     sync_database_url_scheme,
 )
 from api.main import app
+from api.tests.utils import record_statements
 
 pass  # Trick to load `BaseDatabaseModel` the last, since all database models must be imported before base model.
 from api.database.models import BaseDatabaseModel  # noqa: E402
@@ -94,9 +101,8 @@ def setup_test_db(setup_db: Generator) -> Generator:
 
 
 @pytest.fixture
-async def session() -> AsyncGenerator:
-    # https://github.com/sqlalchemy/sqlalchemy/issues/5811#issuecomment-756269881
-    async_engine = create_async_engine(
+async def async_engine() -> AsyncGenerator:
+    engine = create_async_engine(
         async_database_url_scheme.format(
             settings.DATABASE_USERNAME,
             settings.DATABASE_PASSWORD,
@@ -105,6 +111,13 @@ async def session() -> AsyncGenerator:
             "test",
         )
     )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(async_engine: AsyncEngine) -> AsyncGenerator:
+    # https://github.com/sqlalchemy/sqlalchemy/issues/5811#issuecomment-756269881
     async with async_engine.connect() as conn:
         await conn.begin()
         await conn.begin_nested()
@@ -138,4 +151,16 @@ async def session() -> AsyncGenerator:
         await async_session.close()
         await conn.rollback()
 
-    await async_engine.dispose()
+
+@pytest.fixture
+def session_maker(session: AsyncSession) -> async_sessionmaker:
+    """Session maker bound to the test transaction, e.g. for a `JobRunner`."""
+    return async_sessionmaker(
+        bind=session.bind, autoflush=False, expire_on_commit=False
+    )
+
+
+@pytest.fixture
+def statements(async_engine: AsyncEngine) -> Callable[[], ContextManager[list[str]]]:
+    """Return a context manager recording statements executed by the app."""
+    return partial(record_statements, async_engine)
@@ -0,0 +1,28 @@
+import asyncio
+import time
+
+import pytest
+
+from api.monitoring import EventLoopMonitor
+
+
+def _block(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.anyio
+async def test_blocking_call_is_detected_and_its_stack_captured():
+    monitor = EventLoopMonitor(
+        interval=0.01, threshold=0.05, report_interval=60, capture_stacks=True
+    )
+    monitor.start()
+
+    await asyncio.sleep(0.05)
+    _block(0.3)
+    await asyncio.sleep(0.05)
+
+    await monitor.stop()
+
+    assert monitor.blocked >= 1
+    assert monitor.max_lag >= 0.25
+    assert "_block" in monitor.last_blocking_stack
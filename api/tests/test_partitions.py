@@ -0,0 +1,91 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.partitions import create_monthly_partitions
+from api.orgs.models import Organization
+from api.projects.models import Project
+from api.tasks.enums import TaskState
+from api.tasks.models import Task, TaskStateTransition
+from api.users.models import User
+
+
+@pytest.mark.anyio
+async def test_rows_in_default_partition_are_moved_to_created_partitions(
+    session: AsyncSession,
+):
+    user = User(
+        email="user@foo.buz",
+        password="",
+        first_name="Foo",
+        last_name="Buz",
+        display_name=None,
+    )
+    session.add(user)
+    await session.flush()
+    organization = Organization(manager_id=user.id, name="Foo", description="Foo")
+    session.add(organization)
+    await session.flush()
+    project = Project(
+        title="Project",
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        organization_id=organization.id,
+    )
+    session.add(project)
+    await session.flush()
+    task = Task(
+        project_id=project.id,
+        title="Task",
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        state=TaskState.TODO,
+        priority=1,
+    )
+    session.add(task)
+    await session.flush()
+
+    # Transitions recorded before their month's partition was created.
+    for created_at in (
+        datetime(2019, 12, 31, tzinfo=timezone.utc),
+        datetime(2020, 1, 1, tzinfo=timezone.utc),
+        datetime(2020, 1, 31, 23, 59, tzinfo=timezone.utc),
+    ):
+        transition = TaskStateTransition(
+            task_id=task.id,
+            project_id=project.id,
+            from_state=None,
+            to_state=TaskState.TODO,
+            changed_by_id=None,
+        )
+        session.add(transition)
+        await session.flush()
+        await session.execute(
+            update(TaskStateTransition)
+            .where(TaskStateTransition.id == transition.id)
+            .values(created_at=created_at)
+        )
+
+    table = "task_state_transitions"
+    created = await create_monthly_partitions(
+        session, table, months=2, start=date(2020, 1, 15)
+    )
+    assert created == [f"{table}_y2020m01", f"{table}_y2020m02"]
+    created = await create_monthly_partitions(
+        session, table, months=2, start=date(2020, 1, 1)
+    )
+    assert created == []
+
+    rows = await session.execute(
+        text(
+            f"SELECT tableoid::regclass::text, count(*) FROM {table} "
+            "GROUP BY 1 ORDER BY 1"
+        )
+    )
+    assert rows.all() == [(f"{table}_default", 1), (f"{table}_y2020m01", 2)]
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import PlainTextResponse
+
+from api.config import settings
+from api.profiling import ProfilingMiddleware
+from api.users.services import AuthenticationService
+
+_ADMIN_ID = "7b9c2a0e-9a51-4d5e-9a41-0d0a6f1f5b11"
+
+
+async def _app(scope, receive, send):
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+@pytest.fixture
+def profiling_dir(tmp_path, monkeypatch) -> str:
+    monkeypatch.setattr(settings, "LOGGING_FILE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILING_ADMIN_USER_IDS", [_ADMIN_ID])
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "PROFILING_MAX_FILES", 2)
+    return os.path.join(tmp_path, settings.PROFILING_DIR_NAME)
+
+
+async def _get(headers: dict) -> None:
+    transport = ASGITransport(app=ProfilingMiddleware(_app))
+    async with AsyncClient(transport=transport, base_url="https://test") as c:
+        response = await c.get("/", headers=headers)
+        assert response.status_code == 200
+
+
+def _token(user_id: str) -> str:
+    return AuthenticationService(None)._create_access_token(user_id)
+
+
+@pytest.mark.anyio
+async def test_admin_request_with_header_is_profiled(profiling_dir: str):
+    await _get(
+        {
+            settings.PROFILING_HEADER: "1",
+            "Authorization": f"Bearer {_token(_ADMIN_ID)}",
+        }
+    )
+
+    assert len(os.listdir(profiling_dir)) == 1
+
+
+@pytest.mark.anyio
+async def test_non_admin_request_with_header_is_not_profiled(profiling_dir: str):
+    await _get(
+        {
+            settings.PROFILING_HEADER: "1",
+            "Authorization": f"Bearer {_token('e4b7e1a8-8f0b-4a7e-b7c5-1c7f8b1b0d55')}",
+        }
+    )
+
+    assert not os.path.exists(profiling_dir)
+
+
+@pytest.mark.anyio
+async def test_old_profiles_are_rotated(profiling_dir: str):
+    headers = {
+        settings.PROFILING_HEADER: "1",
+        "Authorization": f"Bearer {_token(_ADMIN_ID)}",
+    }
+    for _ in range(4):
+        await _get(headers)
+
+    assert len(os.listdir(profiling_dir)) == settings.PROFILING_MAX_FILES
@@ -0,0 +1,169 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.config import settings
+from api.orgs.models import Organization, OrganizationMembership
+from api.projects.enums import ProjectParticipationType
+from api.projects.models import Project, ProjectParticipant
+from api.tasks.enums import TaskState
+from api.tasks.models import Task
+from api.tasks.services import TaskService
+from api.users.models import User
+from api.users.services import AuthenticationService
+from api.utils.pagination import encode_cursor
+
+
+def _project(organization: Organization, title: str) -> Project:
+    return Project(
+        title=title,
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        organization_id=organization.id,
+    )
+
+
+def _task(project: Project, title: str) -> Task:
+    return Task(
+        project_id=project.id,
+        title=title,
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        state=TaskState.TODO,
+        priority=1,
+    )
+
+
+def _cursor_at(at: datetime) -> str:
+    kinds = ("organization", "projects", "participants", "tasks", "deleted")
+    return encode_cursor({kind: [at.isoformat()] for kind in kinds})
+
+
+@pytest.fixture
+async def member(
+    session: AsyncSession, created_user: User, monkeypatch: pytest.MonkeyPatch
+) -> User:
+    """Member of an organization managed by `created_user`, participating in the
+    "Billing" project but not in the "Hiring" one."""
+    # Everything is written a moment before the feed is read, by the same
+    # transaction; it needs no time to settle.
+    monkeypatch.setattr(settings, "CHANGES_SETTLE_SECONDS", 0)
+
+    member = User(
+        email="member@foo.buz",
+        password="...",
+        first_name="Member",
+        last_name="Buz",
+        display_name=None,
+    )
+    organization = Organization(
+        manager_id=created_user.id, name="Something", description="Foo"
+    )
+    session.add_all([member, organization])
+    await session.flush()
+
+    billing = _project(organization, "Billing")
+    hiring = _project(organization, "Hiring")
+    session.add_all(
+        [billing, hiring, OrganizationMembership(organization.id, member.id, True)]
+    )
+    await session.flush()
+
+    member.tasks = [
+        _task(billing, "Send invoices"),
+        _task(billing, "Fix rounding"),
+        _task(billing, "Update logo"),
+    ]
+    session.add_all(
+        [
+            ProjectParticipant(
+                billing.id, member.id, ProjectParticipationType.CONTRIBUTOR
+            ),
+            *member.tasks,
+            _task(hiring, "Hire a designer"),
+        ]
+    )
+    await session.flush()
+
+    member.organization = organization
+    return member
+
+
+@pytest.mark.anyio
+async def test_changes_are_paginated_and_include_deletions(
+    ac: AsyncClient, member: User, session_maker: async_sessionmaker
+):
+    token = AuthenticationService(None)._create_access_token(member.id)
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"/organizations/{member.organization.id}/changes"
+
+    response = await ac.get(url, params={"page_size": 2}, headers=headers)
+    assert response.status_code == 200
+    first = response.json()
+    assert first["has_more"] is True
+    assert first["organization"]["id"] == str(member.organization.id)
+    assert {project["title"] for project in first["projects"]} == {
+        "Billing",
+        "Hiring",
+    }
+    assert [p["user_id"] for p in first["participants"]] == [str(member.id)]
+    assert len(first["tasks"]) == 2
+    assert first["deleted"] == []
+
+    response = await ac.get(
+        url, params={"page_size": 2, "since": first["cursor"]}, headers=headers
+    )
+    assert response.status_code == 200
+    second = response.json()
+    assert second["has_more"] is False
+    assert second["organization"] is None
+    assert second["projects"] == []
+    # Tasks of "Hiring" are not visible to the member.
+    assert {task["title"] for task in first["tasks"] + second["tasks"]} == {
+        task.title for task in member.tasks
+    }
+
+    deleted_task = member.tasks[0]
+    await TaskService(session_maker).delete_task_and_assignees(deleted_task.id)
+
+    # The test's transaction started before any cursor handed out above.
+    response = await ac.get(
+        url,
+        params={"since": _cursor_at(datetime.now(timezone.utc) - timedelta(hours=1))},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    changes = response.json()
+    assert changes["deleted"] == [
+        {
+            "type": "Task",
+            "id": str(deleted_task.id),
+            "project_id": str(deleted_task.project_id),
+            "deleted_at": changes["deleted"][0]["deleted_at"],
+        }
+    ]
+    assert str(deleted_task.id) not in {task["id"] for task in changes["tasks"]}
+
+
+@pytest.mark.anyio
+async def test_changes_reject_invalid_and_expired_cursors(
+    ac: AsyncClient, member: User
+):
+    token = AuthenticationService(None)._create_access_token(member.id)
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"/organizations/{member.organization.id}/changes"
+
+    response = await ac.get(url, params={"since": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400
+
+    expired = datetime.now(timezone.utc) - timedelta(
+        days=settings.CHANGES_RETENTION_DAYS + 1
+    )
+    response = await ac.get(url, params={"since": _cursor_at(expired)}, headers=headers)
+    assert response.status_code == 410
@@ -11,7 +11,11 @@ _PASSWORD = "Something-th@t-cann0t-be-guessed"
 @pytest.fixture
 async def created_user(session: AsyncSession) -> User:
     user = User(
-        email="user@foo.buz", password=UserService(None)._hash_password(_PASSWORD)
+        email="user@foo.buz",
+        password=UserService(None)._hash_password(_PASSWORD),
+        first_name="Foo",
+        last_name="Buz",
+        display_name=None,
     )
     session.add(user)
     await session.flush()
@@ -0,0 +1,122 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.jobs.runner import JobRunner
+from api.orgs.models import Organization, OrganizationMembership
+from api.projects.models import Project
+from api.tasks.enums import TaskState
+from api.tasks.models import Task, TaskAssignee
+from api.users.models import User
+from api.users.services import AuthenticationService
+
+
+@pytest.fixture
+async def organization(session: AsyncSession, created_user: User) -> Organization:
+    """Organization of `created_user` with two projects having a few assigned tasks."""
+    organization = Organization(
+        manager_id=created_user.id, name="Something", description="Foo"
+    )
+    session.add(organization)
+    await session.flush()
+
+    projects = [
+        Project(
+            title=f"Project {i}",
+            description=None,
+            start_date=None,
+            finish_date=None,
+            deadline=None,
+            organization_id=organization.id,
+        )
+        for i in range(2)
+    ]
+    session.add_all(
+        [*projects, OrganizationMembership(organization.id, created_user.id, True)]
+    )
+    await session.flush()
+
+    tasks = [
+        Task(
+            project_id=project.id,
+            title=f"Task {i}",
+            description=None,
+            start_date=None,
+            finish_date=None,
+            deadline=None,
+            state=TaskState.TODO,
+            priority=1,
+        )
+        for project in projects
+        for i in range(5)
+    ]
+    session.add_all(tasks)
+    await session.flush()
+
+    session.add_all([TaskAssignee(task.id, created_user.id) for task in tasks])
+    await session.flush()
+    return organization
+
+
+@pytest.mark.anyio
+async def test_organization_is_deleted_in_batches_by_a_job(
+    ac: AsyncClient,
+    session: AsyncSession,
+    session_maker: async_sessionmaker,
+    created_user_access_token: str,
+    organization: Organization,
+):
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+
+    response = await ac.delete(f"/organizations/{organization.id}", headers=headers)
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    assert response.json()["status"] == "Pending"
+
+    # The organization is hidden before the job runs.
+    response = await ac.get(f"/organizations/{organization.id}", headers=headers)
+    assert response.status_code == 404
+
+    await JobRunner(session_maker, batch_size=2).run_until_idle()
+
+    response = await ac.get(f"/jobs/{job_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "Completed"
+    assert response.json()["progress"] == {"tasks": 10, "projects": 2, "memberships": 1}
+
+    for model in (Organization, Project, Task, TaskAssignee):
+        count = (
+            await session.execute(select(func.count()).select_from(model))
+        ).scalar()
+        assert count == 0, model
+
+
+@pytest.mark.anyio
+async def test_job_is_not_visible_to_other_users(
+    ac: AsyncClient,
+    session: AsyncSession,
+    created_user_access_token: str,
+    organization: Organization,
+):
+    response = await ac.delete(
+        f"/organizations/{organization.id}",
+        headers={"Authorization": f"Bearer {created_user_access_token}"},
+    )
+    job_id = response.json()["id"]
+
+    other_user = User(
+        email="other@foo.buz",
+        password="...",
+        first_name="Other",
+        last_name="Buz",
+        display_name=None,
+    )
+    session.add(other_user)
+    await session.flush()
+
+    token = AuthenticationService(None)._create_access_token(other_user.id)
+    response = await ac.get(
+        f"/jobs/{job_id}", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 404
@@ -0,0 +1,251 @@
+from datetime import timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.orgs.invitations import prune
+from api.orgs.models import (
+    Organization,
+    OrganizationInvitation,
+    OrganizationMembership,
+)
+from api.users.models import User
+
+
+@pytest.mark.anyio
+async def test_bulk_invitation_reports_outcome_of_each_email(
+    ac: AsyncClient,
+    created_user: User,
+    created_user_access_token: str,
+    session: AsyncSession,
+):
+    member, invitee, outsider = (
+        User(
+            email=f"{name}@foo.buz",
+            password="",
+            first_name=name.title(),
+            last_name="Buz",
+            display_name=None,
+        )
+        for name in ("member", "invitee", "outsider")
+    )
+    session.add_all([member, invitee, outsider])
+    await session.flush()
+
+    organization = Organization(
+        manager_id=created_user.id, name="Something", description="Foo"
+    )
+    session.add(organization)
+    await session.flush()
+    session.add_all(
+        [
+            OrganizationMembership(organization.id, member.id, True),
+            OrganizationInvitation(None, organization.id, invitee.id),
+        ]
+    )
+    await session.flush()
+
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    response = await ac.post(
+        f"/organizations/{organization.id}/invitations:bulk",
+        json={
+            "emails": [
+                "Outsider@foo.buz",
+                "member@foo.buz",
+                "invitee@foo.buz",
+                "nobody@foo.buz",
+                "outsider@FOO.buz",
+            ]
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert [
+        (r["email"], r["outcome"], r["user_id"]) for r in response.json()["results"]
+    ] == [
+        ("outsider@foo.buz", "invited", str(outsider.id)),
+        ("member@foo.buz", "already_member", str(member.id)),
+        ("invitee@foo.buz", "already_invited", str(invitee.id)),
+        ("nobody@foo.buz", "user_not_found", None),
+    ]
+
+    invited = await session.scalars(
+        select(OrganizationInvitation.user_id).where(
+            OrganizationInvitation.organization_id == organization.id,
+            OrganizationInvitation.accepted.is_(None),
+        )
+    )
+    assert set(invited) == {invitee.id, outsider.id}
+
+    # Inviting again is a no-op.
+    response = await ac.post(
+        f"/organizations/{organization.id}/invitations:bulk",
+        json={"emails": ["outsider@foo.buz"]},
+        headers=headers,
+    )
+    assert response.json()["results"][0]["outcome"] == "already_invited"
+
+
+@pytest.mark.anyio
+async def test_accepting_invitation_again_changes_nothing(
+    ac: AsyncClient,
+    created_user: User,
+    created_user_access_token: str,
+    session: AsyncSession,
+):
+    manager = User(
+        email="manager@foo.buz",
+        password="",
+        first_name="Manager",
+        last_name="Buz",
+        display_name=None,
+    )
+    session.add(manager)
+    await session.flush()
+    organization = Organization(
+        manager_id=manager.id, name="Something", description="Foo"
+    )
+    session.add(organization)
+    await session.flush()
+    session.add(OrganizationInvitation(None, organization.id, created_user.id))
+    await session.flush()
+
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    path = f"/users/me/organizations/invitations/{organization.id}"
+    for _ in range(2):
+        response = await ac.post(path, json={"accepted": True}, headers=headers)
+        assert response.status_code == 204
+
+    memberships = await session.scalars(
+        select(OrganizationMembership.user_id).where(
+            OrganizationMembership.organization_id == organization.id
+        )
+    )
+    assert list(memberships) == [created_user.id]
+
+    # Answers can't be changed.
+    response = await ac.post(path, json={"accepted": False}, headers=headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_expired_invitations_are_hidden_and_pruned(
+    ac: AsyncClient,
+    created_user: User,
+    created_user_access_token: str,
+    session: AsyncSession,
+):
+    manager = User(
+        email="manager@foo.buz",
+        password="",
+        first_name="Manager",
+        last_name="Buz",
+        display_name=None,
+    )
+    session.add(manager)
+    await session.flush()
+    organizations = [
+        Organization(manager_id=manager.id, name=name, description="Foo")
+        for name in ("Pending", "Expired", "Declined")
+    ]
+    session.add_all(organizations)
+    await session.flush()
+    pending, expired, declined = (
+        OrganizationInvitation(accepted, organization.id, created_user.id)
+        for organization, accepted in zip(organizations, (None, None, False))
+    )
+    session.add_all([pending, expired, declined])
+    await session.flush()
+    await session.execute(
+        update(OrganizationInvitation)
+        .where(OrganizationInvitation.organization_id == expired.organization_id)
+        .values(created_at=func.now() - timedelta(days=15))
+    )
+
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    response = await ac.get("/users/me/organizations/invitations", headers=headers)
+    assert [i["organization"]["name"] for i in response.json()["items"]] == ["Pending"]
+    response = await ac.post(
+        f"/users/me/organizations/invitations/{expired.organization_id}",
+        json={"accepted": True},
+        headers=headers,
+    )
+    assert response.status_code == 404
+
+    assert await prune(session, batch_size=1) == 1
+    assert await prune(session, batch_size=10) == 1
+    remaining = await session.scalars(select(OrganizationInvitation.organization_id))
+    assert list(remaining) == [pending.organization_id]
+
+
+@pytest.mark.anyio
+async def test_expired_and_declined_invitations_can_be_sent_again(
+    ac: AsyncClient,
+    created_user: User,
+    created_user_access_token: str,
+    session: AsyncSession,
+):
+    expired, declined = (
+        User(
+            email=f"{name}@foo.buz",
+            password="",
+            first_name=name.title(),
+            last_name="Buz",
+            display_name=None,
+        )
+        for name in ("expired", "declined")
+    )
+    session.add_all([expired, declined])
+    await session.flush()
+    organization = Organization(
+        manager_id=created_user.id, name="Something", description="Foo"
+    )
+    session.add(organization)
+    await session.flush()
+    session.add_all(
+        [
+            OrganizationInvitation(None, organization.id, expired.id),
+            OrganizationInvitation(False, organization.id, declined.id),
+        ]
+    )
+    await session.flush()
+    await session.execute(
+        update(OrganizationInvitation)
+        .where(OrganizationInvitation.organization_id == organization.id)
+        .values(created_at=func.now() - timedelta(days=15))
+    )
+
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    response = await ac.post(
+        f"/organizations/{organization.id}/invite/",
+        json={"email": "expired@foo.buz"},
+        headers=headers,
+    )
+    assert response.status_code == 204
+    response = await ac.post(
+        f"/organizations/{organization.id}/invitations:bulk",
+        json={"emails": ["expired@foo.buz", "declined@foo.buz"]},
+        headers=headers,
+    )
+    assert [r["outcome"] for r in response.json()["results"]] == [
+        "already_invited",
+        "invited",
+    ]
+
+    renewed = await session.scalars(
+        select(OrganizationInvitation.user_id).where(
+            OrganizationInvitation.organization_id == organization.id,
+            OrganizationInvitation.accepted.is_(None),
+            OrganizationInvitation.created_at == func.now(),
+        )
+    )
+    assert set(renewed) == {expired.id, declined.id}
+
+    response = await ac.post(
+        f"/organizations/{organization.id}/invite/",
+        json={"email": "declined@foo.buz"},
+        headers=headers,
+    )
+    assert response.status_code == 400
@@ -0,0 +1,76 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.orgs.models import Organization, OrganizationMembership
+from api.users.models import User
+
+
+@pytest.mark.anyio
+async def test_members_are_listed_and_searched(
+    ac: AsyncClient,
+    created_user: User,
+    created_user_access_token: str,
+    session: AsyncSession,
+):
+    manager, former, other = (
+        User(
+            email=email,
+            password="",
+            first_name=first_name,
+            last_name=last_name,
+            display_name=None,
+        )
+        for email, first_name, last_name in (
+            ("boss@foo.buz", "Ada", "Lovelace"),
+            ("former@foo.buz", "Alan", "Turing"),
+            ("grace_h@bar.buz", "Grace", "Hopper"),
+        )
+    )
+    session.add_all([manager, former, other])
+    await session.flush()
+
+    organization = Organization(
+        manager_id=manager.id, name="Something", description="Foo"
+    )
+    session.add(organization)
+    await session.flush()
+    session.add_all(
+        [
+            OrganizationMembership(organization.id, manager.id, True),
+            OrganizationMembership(organization.id, former.id, False),
+            OrganizationMembership(organization.id, other.id, True),
+            OrganizationMembership(organization.id, created_user.id, True),
+        ]
+    )
+    await session.flush()
+
+    # Members who aren't the manager don't see inactive members.
+    path = f"/organizations/{organization.id}/members"
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    response = await ac.get(path, params={"page_size": 2}, headers=headers)
+    assert response.status_code == 200
+    page = response.json()
+    assert (page["total_pages"], page["count"]) == (2, 2)
+    assert [
+        (m["email"], m["metadata"]["is_manager"], m["metadata"]["is_active"])
+        for m in page["items"]
+    ] == [("boss@foo.buz", True, True), (created_user.email, False, True)]
+
+    for q, emails in (
+        ("hop", ["grace_h@bar.buz"]),
+        ("ada LOVE", ["boss@foo.buz"]),
+        ("turing", []),
+        ("_", ["grace_h@bar.buz"]),
+    ):
+        response = await ac.get(path, params={"q": q}, headers=headers)
+        assert [m["email"] for m in response.json()["items"]] == emails, q
+
+    response = await ac.get(path, params={"page": 3}, headers=headers)
+    assert response.status_code == 400
+
+    # Any page of no results is empty rather than invalid.
+    response = await ac.get(path, params={"q": "nomatch", "page": 2}, headers=headers)
+    assert response.status_code == 200
+    page = response.json()
+    assert (page["total_pages"], page["items"]) == (0, [])
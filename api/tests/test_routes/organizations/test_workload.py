@@ -0,0 +1,114 @@
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.orgs.models import Organization, OrganizationMembership
+from api.projects.enums import ProjectParticipationType
+from api.projects.models import Project, ProjectParticipant
+from api.tasks.enums import TaskState
+from api.tasks.models import Task, TaskAssignee
+from api.users.models import User
+
+
+@pytest.mark.anyio
+async def test_workload_counts_open_tasks_of_active_members(
+    ac: AsyncClient,
+    created_user: User,
+    created_user_access_token: str,
+    session: AsyncSession,
+):
+    member, inactive = (
+        User(
+            email=f"{name}@foo.buz",
+            password="",
+            first_name=name.title(),
+            last_name="Buz",
+            display_name=None,
+        )
+        for name in ("member", "inactive")
+    )
+    session.add_all([member, inactive])
+    await session.flush()
+
+    organization = Organization(
+        manager_id=created_user.id, name="Something", description="Foo"
+    )
+    session.add(organization)
+    await session.flush()
+
+    project = Project(
+        title="Project",
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        organization_id=organization.id,
+    )
+    session.add(project)
+    await session.flush()
+
+    yesterday = date.today() - timedelta(days=1)
+    tasks = [
+        Task(
+            project_id=project.id,
+            title=title,
+            description=None,
+            start_date=None,
+            finish_date=yesterday if state == TaskState.COMPLETED else None,
+            deadline=deadline,
+            state=state,
+            priority=priority,
+        )
+        for title, state, deadline, priority in (
+            ("Overdue", TaskState.IN_PROGRESS, yesterday, 3),
+            ("Open", TaskState.TODO, None, 1),
+            ("Done", TaskState.COMPLETED, None, 2),
+            ("Unassigned", TaskState.TODO, None, 0),
+        )
+    ]
+    session.add_all(
+        [
+            *tasks,
+            OrganizationMembership(organization.id, created_user.id, True),
+            OrganizationMembership(organization.id, member.id, True),
+            OrganizationMembership(organization.id, inactive.id, False),
+            ProjectParticipant(
+                project.id, member.id, ProjectParticipationType.CONTRIBUTOR
+            ),
+        ]
+    )
+    await session.flush()
+    session.add_all(
+        [
+            TaskAssignee(task_id=task.id, user_id=user.id)
+            for task, user in zip(tasks, (member, member, member, inactive))
+        ]
+    )
+    await session.flush()
+
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    response = await ac.get(
+        f"/organizations/{organization.id}/workload", headers=headers
+    )
+    assert response.status_code == 200
+    assert [
+        (m["user"]["id"], m["open"], m["priorities"], m["overdue"])
+        for m in response.json()["members"]
+    ] == [
+        (str(member.id), 2, {"0": 0, "1": 1, "2": 0, "3": 1}, 1),
+        (str(created_user.id), 0, {"0": 0, "1": 0, "2": 0, "3": 0}, 0),
+    ]
+
+    # Assigning a task drops the cached workload.
+    response = await ac.post(
+        f"/tasks/{tasks[3].id}/assignees",
+        json={"user_id": str(member.id)},
+        headers=headers,
+    )
+    assert response.status_code == 204
+    response = await ac.get(
+        f"/organizations/{organization.id}/workload", headers=headers
+    )
+    assert response.json()["members"][0]["open"] == 3
@@ -0,0 +1,123 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.orgs.models import Organization, OrganizationMembership
+from api.projects.enums import ProjectParticipationType
+from api.projects.models import Project, ProjectParticipant
+from api.tasks.enums import TaskState
+from api.tasks.models import Task
+from api.users.models import User
+from api.users.services import AuthenticationService
+
+
+def _project(organization: Organization, title: str) -> Project:
+    return Project(
+        title=title,
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        organization_id=organization.id,
+    )
+
+
+def _task(project: Project, title: str, description: str | None = None) -> Task:
+    return Task(
+        project_id=project.id,
+        title=title,
+        description=description,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        state=TaskState.TODO,
+        priority=1,
+    )
+
+
+@pytest.fixture
+async def member(session: AsyncSession, created_user: User) -> User:
+    """Member of an organization managed by `created_user`, participating in the
+    "Billing" project but not in the "Hiring" one."""
+    member = User(
+        email="member@foo.buz",
+        password="...",
+        first_name="Member",
+        last_name="Buz",
+        display_name=None,
+    )
+    organization = Organization(
+        manager_id=created_user.id, name="Something", description="Foo"
+    )
+    session.add_all([member, organization])
+    await session.flush()
+
+    billing = _project(organization, "Billing")
+    hiring = _project(organization, "Hiring")
+    session.add_all(
+        [
+            billing,
+            hiring,
+            OrganizationMembership(organization.id, member.id, True),
+        ]
+    )
+    await session.flush()
+
+    session.add_all(
+        [
+            ProjectParticipant(
+                billing.id, member.id, ProjectParticipationType.CONTRIBUTOR
+            ),
+            _task(billing, "Send invoices", "Invoices for December"),
+            _task(billing, "Fix rounding", "Totals of an invoice are off by a cent"),
+            _task(billing, "Update logo"),
+            _task(hiring, "Invoice the recruiting agency"),
+        ]
+    )
+    await session.flush()
+
+    member.organization = organization
+    member.project = billing
+    return member
+
+
+@pytest.mark.anyio
+async def test_search_is_ranked_paginated_and_limited_to_participated_projects(
+    ac: AsyncClient, member: User
+):
+    token = AuthenticationService(None)._create_access_token(member.id)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await ac.get(
+        f"/organizations/{member.organization.id}/search",
+        params={"q": "invoice", "page_size": 1},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    first_page = response.json()
+    # Matches in the title rank higher than matches in the description.
+    assert first_page["items"][0]["title"] == "Send invoices"
+    assert "<b>invoices</b>" in first_page["items"][0]["snippet"].lower()
+
+    response = await ac.get(
+        f"/organizations/{member.organization.id}/search",
+        params={"q": "invoice", "page_size": 1, "cursor": first_page["next_cursor"]},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    second_page = response.json()
+    assert [item["title"] for item in second_page["items"]] == ["Fix rounding"]
+    # The task of "Hiring" project is not visible to the member.
+    assert second_page["next_cursor"] is None
+
+
+@pytest.mark.anyio
+async def test_search_rejects_invalid_cursor(ac: AsyncClient, member: User):
+    token = AuthenticationService(None)._create_access_token(member.id)
+
+    response = await ac.get(
+        f"/projects/{member.project.id}/search",
+        params={"q": "invoice", "cursor": "not-a-cursor"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 400
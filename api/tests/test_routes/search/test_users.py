@@ -0,0 +1,184 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.orgs.models import Organization, OrganizationMembership
+from api.projects.enums import ProjectParticipationType
+from api.projects.models import Project, ProjectParticipant
+from api.users.models import User
+
+
+@pytest.fixture
+async def users(session: AsyncSession) -> dict[str, User]:
+    users = {
+        email: User(
+            email=email,
+            password="",
+            first_name=first_name,
+            last_name=last_name,
+            display_name=display_name,
+        )
+        for email, first_name, last_name, display_name in (
+            ("doe@foo.buz", "John", "Doe", None),
+            ("ali@foo.buz", "Ali", "Johnson", None),
+            ("bob@foo.buz", "Bob", "Ray", "Johnny B."),
+            ("johnny@bar.buz", "Robert", "Ray", None),
+            ("mary@foo.buz", "Mary", "St. John", None),
+            ("jane@foo.buz", "Jane", "Doe", None),
+        )
+    }
+    session.add_all(users.values())
+    await session.flush()
+    return users
+
+
+@pytest.mark.anyio
+async def test_users_starting_with_query_are_found_first(
+    ac: AsyncClient,
+    created_user: User,
+    created_user_access_token: str,
+    session: AsyncSession,
+    users: dict[str, User],
+):
+    organization = Organization(
+        manager_id=created_user.id, name="Something", description="Foo"
+    )
+    session.add(organization)
+    await session.flush()
+    session.add_all(
+        OrganizationMembership(organization.id, user.id, True)
+        for user in users.values()
+    )
+    await session.flush()
+
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    scope = {"organization_id": str(organization.id)}
+    for q, emails in (
+        # Full names, last names, display names and emails starting with the
+        # query, then users containing it elsewhere.
+        (
+            "JOHN",
+            [
+                "doe@foo.buz",
+                "ali@foo.buz",
+                "bob@foo.buz",
+                "johnny@bar.buz",
+                "mary@foo.buz",
+            ],
+        ),
+        ("john  d", ["doe@foo.buz"]),
+        ("jane", ["jane@foo.buz"]),
+        ("ray bar", ["johnny@bar.buz"]),
+        ("nobody", []),
+        ("o'john \\%_", []),
+    ):
+        response = await ac.get(
+            "/users/search", params={"q": q, **scope}, headers=headers
+        )
+        assert response.status_code == 200
+        assert [u["email"] for u in response.json()["items"]] == emails, q
+
+    response = await ac.get(
+        "/users/search", params={"q": "john", "limit": 2, **scope}, headers=headers
+    )
+    assert [u["email"] for u in response.json()["items"]] == [
+        "doe@foo.buz",
+        "ali@foo.buz",
+    ]
+
+
+@pytest.mark.anyio
+async def test_users_are_only_found_by_email_outside_of_scopes(
+    ac: AsyncClient, created_user_access_token: str, users: dict[str, User]
+):
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+
+    for q, emails in (
+        (" Johnny@BAR.buz ", ["johnny@bar.buz"]),
+        ("johnny@bar", []),
+        ("john", []),
+        ("%@foo.buz", []),
+    ):
+        response = await ac.get("/users/search", params={"q": q}, headers=headers)
+        assert response.status_code == 200
+        assert [u["email"] for u in response.json()["items"]] == emails, q
+
+
+@pytest.mark.anyio
+async def test_users_search_is_scoped_to_organization_or_project(
+    ac: AsyncClient,
+    created_user: User,
+    created_user_access_token: str,
+    session: AsyncSession,
+    users: dict[str, User],
+):
+    organization = Organization(
+        manager_id=created_user.id, name="Something", description="Foo"
+    )
+    other_organization = Organization(
+        manager_id=users["jane@foo.buz"].id, name="Other", description="Foo"
+    )
+    session.add_all([organization, other_organization])
+    await session.flush()
+
+    project = Project(
+        title="Project",
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        organization_id=organization.id,
+    )
+    session.add_all(
+        [
+            project,
+            OrganizationMembership(organization.id, users["doe@foo.buz"].id, True),
+            OrganizationMembership(organization.id, users["ali@foo.buz"].id, True),
+            OrganizationMembership(organization.id, users["bob@foo.buz"].id, False),
+        ]
+    )
+    await session.flush()
+    session.add_all(
+        [
+            ProjectParticipant(
+                project.id,
+                users["ali@foo.buz"].id,
+                ProjectParticipationType.CONTRIBUTOR,
+            ),
+            ProjectParticipant(
+                project.id, users["doe@foo.buz"].id, ProjectParticipationType.VIEWER
+            ),
+        ]
+    )
+    await session.flush()
+
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    for scope, emails in (
+        # Inactive members are left out.
+        ({"organization_id": str(organization.id)}, ["doe@foo.buz", "ali@foo.buz"]),
+        # Only contributors can be assigned tasks.
+        ({"project_id": str(project.id)}, ["ali@foo.buz"]),
+    ):
+        response = await ac.get(
+            "/users/search", params={"q": "john", **scope}, headers=headers
+        )
+        assert response.status_code == 200
+        assert [u["email"] for u in response.json()["items"]] == emails
+
+    response = await ac.get(
+        "/users/search",
+        params={"q": "john", "organization_id": str(other_organization.id)},
+        headers=headers,
+    )
+    assert response.status_code == 403
+
+    response = await ac.get(
+        "/users/search",
+        params={
+            "q": "john",
+            "organization_id": str(organization.id),
+            "project_id": str(project.id),
+        },
+        headers=headers,
+    )
+    assert response.status_code == 422
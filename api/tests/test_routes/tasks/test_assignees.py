@@ -0,0 +1,162 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.changes.models import Tombstone
+from api.orgs.models import Organization, OrganizationMembership
+from api.projects.enums import ProjectParticipationType
+from api.projects.models import Project, ProjectParticipant
+from api.tasks.enums import TaskState
+from api.tasks.models import Task, TaskAssignee
+from api.users.models import User
+
+
+@pytest.fixture
+async def task(session: AsyncSession, created_user: User) -> Task:
+    """Task of a project managed by `created_user`, whose organization has three
+    more active members and an inactive one."""
+    users = [
+        User(
+            email=f"user{n}@foo.buz",
+            password="",
+            first_name=f"User {n}",
+            last_name="Buz",
+            display_name=None,
+        )
+        for n in range(4)
+    ]
+    session.add_all(users)
+    await session.flush()
+
+    organization = Organization(
+        manager_id=created_user.id, name="Something", description="Foo"
+    )
+    session.add(organization)
+    await session.flush()
+
+    project = Project(
+        title="Project",
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        organization_id=organization.id,
+    )
+    session.add(project)
+    session.add_all(
+        OrganizationMembership(organization.id, user.id, n < 3)
+        for n, user in enumerate(users)
+    )
+    await session.flush()
+
+    task = Task(
+        project_id=project.id,
+        title="Task",
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        state=TaskState.TODO,
+        priority=1,
+    )
+    session.add(task)
+    await session.flush()
+    return task
+
+
+async def _participants(session: AsyncSession, project_id) -> dict:
+    rows = await session.execute(
+        select(ProjectParticipant.user_id, ProjectParticipant.participation_type).where(
+            ProjectParticipant.project_id == project_id
+        )
+    )
+    return dict(rows.all())
+
+
+async def _assignees(session: AsyncSession, task_id) -> set:
+    rows = await session.scalars(
+        select(TaskAssignee.user_id).where(TaskAssignee.task_id == task_id)
+    )
+    return set(rows)
+
+
+@pytest.mark.anyio
+async def test_participants_and_assignees_are_changed_in_bulk(
+    ac: AsyncClient,
+    created_user_access_token: str,
+    session: AsyncSession,
+    task: Task,
+):
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    user_ids = list(
+        await session.scalars(
+            select(User.id).where(User.email.like("user%@foo.buz")).order_by(User.email)
+        )
+    )
+    contributor = ProjectParticipationType.CONTRIBUTOR
+
+    response = await ac.put(
+        f"/projects/{task.project_id}/participants",
+        json={
+            "participants": [
+                {"participation_type": "Contributor", "user_id": str(user_id)}
+                for user_id in user_ids[:3]
+            ]
+        },
+        headers=headers,
+    )
+    assert response.status_code == 204
+    assert await _participants(session, task.project_id) == {
+        user_id: contributor for user_id in user_ids[:3]
+    }
+
+    response = await ac.put(
+        f"/tasks/{task.id}/assignees",
+        json={"user_ids": [str(user_id) for user_id in user_ids[:3]]},
+        headers=headers,
+    )
+    assert response.status_code == 204
+    assert await _assignees(session, task.id) == set(user_ids[:3])
+
+    response = await ac.patch(
+        f"/tasks/{task.id}/assignees",
+        json={"add": [], "remove": [str(user_ids[0])]},
+        headers=headers,
+    )
+    assert response.status_code == 204
+    assert await _assignees(session, task.id) == set(user_ids[1:3])
+
+    # Viewers can't be assigned, and inactive members can't participate.
+    response = await ac.patch(
+        f"/projects/{task.project_id}/participants",
+        json={
+            "add": [{"participation_type": "Viewer", "user_id": str(user_ids[1])}],
+            "remove": [str(user_ids[2])],
+        },
+        headers=headers,
+    )
+    assert response.status_code == 204
+    assert await _participants(session, task.project_id) == {
+        user_ids[0]: contributor,
+        user_ids[1]: ProjectParticipationType.VIEWER,
+    }
+    removed = await session.scalars(
+        select(Tombstone.record_id).where(Tombstone.project_id == task.project_id)
+    )
+    assert list(removed) == [user_ids[2]]
+
+    response = await ac.put(
+        f"/tasks/{task.id}/assignees",
+        json={"user_ids": [str(user_ids[0]), str(user_ids[1])]},
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert await _assignees(session, task.id) == set(user_ids[1:3])
+
+    response = await ac.patch(
+        f"/projects/{task.project_id}/participants",
+        json={"add": [{"participation_type": "Viewer", "user_id": str(user_ids[3])}]},
+        headers=headers,
+    )
+    assert response.status_code == 400
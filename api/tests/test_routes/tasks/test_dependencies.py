@@ -0,0 +1,129 @@
+from datetime import date, timedelta
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.orgs.models import Organization
+from api.projects.models import Project
+from api.tasks.enums import TaskState
+from api.tasks.models import Task
+from api.users.models import User
+
+
+@pytest.fixture
+async def tasks(session: AsyncSession, created_user: User) -> dict[str, Task]:
+    """Tasks of a project managed by `created_user`: A takes four days from
+    today, B two days and C has no dates."""
+    organization = Organization(
+        manager_id=created_user.id, name="Something", description="Foo"
+    )
+    session.add(organization)
+    await session.flush()
+
+    project = Project(
+        title="Project",
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        organization_id=organization.id,
+    )
+    session.add(project)
+    await session.flush()
+
+    today = date.today()
+    tasks = {
+        title: Task(
+            project_id=project.id,
+            title=title,
+            description=None,
+            start_date=today if days is not None else None,
+            finish_date=None,
+            deadline=today + timedelta(days=days) if days is not None else None,
+            state=TaskState.TODO,
+            priority=1,
+        )
+        for title, days in (("A", 3), ("B", 1), ("C", None))
+    }
+    session.add_all(tasks.values())
+    await session.flush()
+    return tasks
+
+
+def _day(days: int) -> str:
+    return (date.today() + timedelta(days=days)).isoformat()
+
+
+@pytest.mark.anyio
+async def test_dependencies_decide_critical_path(
+    ac: AsyncClient, created_user_access_token: str, tasks: dict[str, Task]
+):
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    a, b, c = (str(tasks[title].id) for title in "ABC")
+    project_id = tasks["A"].project_id
+
+    for task_id, depends_on_id in ((b, a), (c, b)):
+        response = await ac.post(
+            f"/tasks/{task_id}/dependencies",
+            json={"depends_on_id": depends_on_id},
+            headers=headers,
+        )
+        assert response.status_code == 204
+
+    response = await ac.get(f"/tasks/{b}/dependencies", headers=headers)
+    assert response.json() == {"depends_on": [a], "dependents": [c]}
+
+    response = await ac.get(f"/projects/{project_id}/critical-path", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "earliest_finish": _day(6),
+        "path": [
+            {"id": a, "earliest_start": _day(0), "earliest_finish": _day(3)},
+            {"id": b, "earliest_start": _day(4), "earliest_finish": _day(5)},
+            {"id": c, "earliest_start": _day(6), "earliest_finish": _day(6)},
+        ],
+    }
+
+    # The cached graph follows changes.
+    response = await ac.request(
+        "DELETE",
+        f"/tasks/{b}/dependencies",
+        json={"depends_on_id": a},
+        headers=headers,
+    )
+    assert response.status_code == 204
+    response = await ac.get(f"/projects/{project_id}/critical-path", headers=headers)
+    assert response.json() == {
+        "earliest_finish": _day(3),
+        "path": [{"id": a, "earliest_start": _day(0), "earliest_finish": _day(3)}],
+    }
+
+
+@pytest.mark.anyio
+async def test_invalid_dependencies_are_rejected(
+    ac: AsyncClient, created_user_access_token: str, tasks: dict[str, Task]
+):
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    a, b, c = (str(tasks[title].id) for title in "ABC")
+
+    for task_id, depends_on_id in ((b, a), (c, b)):
+        response = await ac.post(
+            f"/tasks/{task_id}/dependencies",
+            json={"depends_on_id": depends_on_id},
+            headers=headers,
+        )
+        assert response.status_code == 204
+
+    for task_id, depends_on_id, status_code in (
+        (a, c, 409),
+        (a, a, 400),
+        (a, str(uuid4()), 400),
+    ):
+        response = await ac.post(
+            f"/tasks/{task_id}/dependencies",
+            json={"depends_on_id": depends_on_id},
+            headers=headers,
+        )
+        assert response.status_code == status_code
@@ -0,0 +1,534 @@
+import asyncio
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.orgs.models import Organization
+from api.projects.models import Project
+from api.tasks.enums import TaskState
+from api.tasks.events import task_events
+from api.tasks.models import (
+    LONG_RANK,
+    ProjectTaskSnapshot,
+    Task,
+    TaskAssignee,
+    TaskStateTransition,
+)
+from api.tasks.rebalance import rebalance_column
+from api.users.models import User
+
+
+@pytest.fixture
+async def project(session: AsyncSession, created_user: User) -> Project:
+    """Project managed by `created_user` with tasks due yesterday and tomorrow."""
+    organization = Organization(
+        manager_id=created_user.id, name="Something", description="Foo"
+    )
+    session.add(organization)
+    await session.flush()
+
+    project = Project(
+        title="Project",
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        organization_id=organization.id,
+    )
+    session.add(project)
+    await session.flush()
+
+    yesterday = date.today() - timedelta(days=1)
+    tomorrow = date.today() + timedelta(days=1)
+    session.add_all(
+        [
+            Task(
+                project_id=project.id,
+                title=title,
+                description=None,
+                start_date=None,
+                finish_date=yesterday if state == TaskState.COMPLETED else None,
+                deadline=deadline,
+                state=state,
+                priority=priority,
+            )
+            for title, state, deadline, priority in (
+                ("Overdue", TaskState.IN_PROGRESS, yesterday, 1),
+                ("Done late", TaskState.COMPLETED, yesterday, 0),
+                ("Due", TaskState.TODO, tomorrow, 2),
+                ("Urgent overdue", TaskState.TODO, yesterday, 3),
+            )
+        ]
+    )
+    await session.flush()
+    return project
+
+
+@pytest.mark.anyio
+async def test_tasks_can_be_filtered_and_ordered(
+    ac: AsyncClient, created_user_access_token: str, project: Project
+):
+    response = await ac.get(
+        f"/projects/{project.id}/tasks",
+        params={"overdue": True, "order_by": "-deadline"},
+        headers={"Authorization": f"Bearer {created_user_access_token}"},
+    )
+    assert response.status_code == 200
+    assert {t["title"] for t in response.json()["items"]} == {
+        "Overdue",
+        "Urgent overdue",
+    }
+
+    response = await ac.get(
+        f"/projects/{project.id}/tasks",
+        params={"state": ["Todo", "Completed"], "order_by": "-priority"},
+        headers={"Authorization": f"Bearer {created_user_access_token}"},
+    )
+    assert response.status_code == 200
+    assert [t["title"] for t in response.json()["items"]] == [
+        "Urgent overdue",
+        "Due",
+        "Done late",
+    ]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"overdue": True, "priority_min": 1},
+        {"state": ["Todo"], "order_by": "deadline"},
+        {"priority_min": 3, "priority_max": 1},
+        {"state": ["Todo", "Backlog"], "order_by": "rank"},
+    ],
+)
+async def test_unsupported_task_queries_are_rejected(
+    ac: AsyncClient, created_user_access_token: str, project: Project, params: dict
+):
+    response = await ac.get(
+        f"/projects/{project.id}/tasks",
+        params=params,
+        headers={"Authorization": f"Bearer {created_user_access_token}"},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_board_groups_tasks_by_state(
+    ac: AsyncClient, created_user_access_token: str, project: Project
+):
+    response = await ac.get(
+        f"/projects/{project.id}/board",
+        params={"page_size": 1},
+        headers={"Authorization": f"Bearer {created_user_access_token}"},
+    )
+    assert response.status_code == 200
+
+    columns = {c["state"]: c for c in response.json()["columns"]}
+    assert len(columns) == len(TaskState)
+    assert columns["Todo"]["count"] == 2
+    assert [t["title"] for t in columns["Todo"]["items"]] == ["Urgent overdue"]
+    assert columns["Todo"]["next_cursor"] is not None
+    assert columns["Backlog"] == {
+        "state": "Backlog",
+        "count": 0,
+        "next_cursor": None,
+        "items": [],
+    }
+
+    response = await ac.get(
+        f"/projects/{project.id}/board/Todo",
+        params={"page_size": 1, "cursor": columns["Todo"]["next_cursor"]},
+        headers={"Authorization": f"Bearer {created_user_access_token}"},
+    )
+    assert response.status_code == 200
+    column = response.json()
+    assert column["count"] == 2
+    assert [t["title"] for t in column["items"]] == ["Due"]
+    assert column["next_cursor"] is None
+
+
+@pytest.mark.anyio
+async def test_tasks_can_be_moved_within_their_column(
+    ac: AsyncClient, created_user_access_token: str, project: Project
+):
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    body = {
+        "description": None,
+        "start_date": None,
+        "finish_date": None,
+        "deadline": None,
+        "priority": 1,
+        "state": "Todo",
+    }
+    task_ids = {}
+    for title in ("A", "B", "C"):
+        response = await ac.post(
+            f"/projects/{project.id}/tasks",
+            json={**body, "title": title},
+            headers=headers,
+        )
+        assert response.status_code == 201
+        task_ids[title] = response.json()["id"]
+
+    async def by_rank() -> dict[str, str]:
+        response = await ac.get(
+            f"/projects/{project.id}/board/Todo",
+            params={"order_by": "rank"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        return {t["title"]: t["id"] for t in response.json()["items"]}
+
+    # Created tasks are appended after the fixture's ones, which share a rank.
+    first, second, *created = await by_rank()
+    assert {first, second} == {"Due", "Urgent overdue"}
+    assert created == ["A", "B", "C"]
+
+    response = await ac.put(
+        f"/tasks/{task_ids['C']}/rank",
+        json={"after_id": task_ids["A"]},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    response = await ac.put(
+        f"/tasks/{task_ids['B']}/rank", json={"after_id": None}, headers=headers
+    )
+    assert response.status_code == 200
+    tasks = await by_rank()
+    assert list(tasks) == ["B", first, second, "A", "C"]
+
+    # Placing a task between tied ones spreads the column first.
+    response = await ac.put(
+        f"/tasks/{task_ids['A']}/rank",
+        json={"after_id": tasks[first]},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert list(await by_rank()) == ["B", first, "A", second, "C"]
+
+    response = await ac.get(
+        f"/projects/{project.id}/tasks",
+        params={"state": ["Todo"], "order_by": "rank"},
+        headers=headers,
+    )
+    assert [t["title"] for t in response.json()["items"]] == list(await by_rank())
+
+    response = await ac.put(
+        f"/tasks/{task_ids['A']}/rank",
+        json={"after_id": str(uuid4())},
+        headers=headers,
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_long_ranks_are_rebalanced(session: AsyncSession, project: Project):
+    tasks = (
+        (
+            await session.execute(
+                select(Task).where(
+                    Task.project_id == project.id, Task.state == TaskState.TODO
+                )
+            )
+        )
+        .scalars()
+        .all()
+    )
+    tasks[0].rank, tasks[1].rank = "V" * 20, "V" * 20 + "1"
+    await session.flush()
+
+    assert await rebalance_column(session, project.id, TaskState.TODO) == 2
+
+    ranks = (
+        await session.execute(
+            select(Task.id, Task.rank)
+            .where(Task.project_id == project.id, Task.state == TaskState.TODO)
+            .order_by(Task.rank)
+        )
+    ).all()
+    assert [task_id for task_id, _ in ranks] == [tasks[0].id, tasks[1].id]
+    assert not (await session.execute(select(Task.id).where(LONG_RANK))).scalars().all()
+
+
+@pytest.mark.anyio
+async def test_project_stats_follow_task_changes(
+    ac: AsyncClient, created_user_access_token: str, project: Project
+):
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    body = {
+        "description": None,
+        "start_date": None,
+        "finish_date": None,
+        "deadline": None,
+        "priority": 1,
+    }
+    today = date.today().isoformat()
+    task_ids = {}
+    for title, state in (("A", "Todo"), ("B", "Todo"), ("C", "Cancelled")):
+        response = await ac.post(
+            f"/projects/{project.id}/tasks",
+            json={**body, "title": title, "state": state, "start_date": today},
+            headers=headers,
+        )
+        assert response.status_code == 201
+        task_ids[title] = response.json()["id"]
+
+    response = await ac.put(
+        f"/tasks/{task_ids['B']}/state",
+        json={"state": "Completed", "finish_date": today},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    response = await ac.delete(f"/tasks/{task_ids['C']}", headers=headers)
+    assert response.status_code == 204
+
+    response = await ac.get(f"/projects/{project.id}/stats", headers=headers)
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["total"] == 2
+    assert stats["states"] == {
+        state.value: 1 if state in (TaskState.TODO, TaskState.COMPLETED) else 0
+        for state in TaskState
+    }
+    assert stats["percent_complete"] == 50.0
+    # Counted live; the fixture's tasks aren't part of the stats since they
+    # were inserted directly, but two of them are overdue.
+    assert stats["overdue"] == 2
+
+
+@pytest.mark.anyio
+async def test_state_transitions_feed_analytics(
+    ac: AsyncClient, created_user_access_token: str, project: Project
+):
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    today = date.today().isoformat()
+    response = await ac.post(
+        f"/projects/{project.id}/tasks",
+        json={
+            "title": "Task",
+            "description": None,
+            "start_date": today,
+            "finish_date": None,
+            "deadline": None,
+            "state": "Todo",
+            "priority": 1,
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201
+    task_id = response.json()["id"]
+
+    response = await ac.get(
+        f"/projects/{project.id}/analytics/cycle-time", headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["completed"] == 0
+    assert response.json()["cycle_time"]["p50"] is None
+
+    for state, finish_date in (("In_Progress", None), ("Completed", today)):
+        response = await ac.put(
+            f"/tasks/{task_id}/state",
+            json={"state": state, "finish_date": finish_date},
+            headers=headers,
+        )
+        assert response.status_code == 200
+
+    # Cached results of the project are dropped as its tasks change.
+    response = await ac.get(
+        f"/projects/{project.id}/analytics/cycle-time", headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["completed"] == 1
+    assert response.json()["cycle_time"]["p50"] >= 0
+
+    response = await ac.get(
+        f"/projects/{project.id}/analytics/time-in-state",
+        params={"days": 7},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert [s["state"] for s in response.json()["states"]] == ["In_Progress", "Todo"]
+    assert all(s["transitions"] == 1 for s in response.json()["states"])
+
+
+@pytest.mark.anyio
+async def test_burndown_counts_tasks_per_day_and_keeps_past_days(
+    ac: AsyncClient,
+    created_user_access_token: str,
+    project: Project,
+    session: AsyncSession,
+):
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    # Days are in UTC, even when the database uses another time zone.
+    await session.execute(text("SET LOCAL TIME ZONE 'Pacific/Kiritimati'"))
+    today = datetime.now(timezone.utc).date()
+    project.start_date = today - timedelta(days=5)
+    project.deadline = today + timedelta(days=10)
+    await session.flush()
+
+    # The fixture's tasks have no stats nor transitions, so they don't count.
+    task_ids = []
+    for title in ("A", "B"):
+        response = await ac.post(
+            f"/projects/{project.id}/tasks",
+            json={
+                "title": title,
+                "description": None,
+                "start_date": project.start_date.isoformat(),
+                "finish_date": None,
+                "deadline": None,
+                "state": "Todo",
+                "priority": 1,
+            },
+            headers=headers,
+        )
+        task_ids.append(response.json()["id"])
+    response = await ac.put(
+        f"/tasks/{task_ids[0]}/state",
+        json={"state": "Completed", "finish_date": today.isoformat()},
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+    # A was created four days ago and completed two days ago, B three days ago,
+    # late in the day (already the next day in the database's time zone).
+    for task_id, to_state, days_ago in (
+        (task_ids[0], TaskState.TODO, 4),
+        (task_ids[0], TaskState.COMPLETED, 2),
+        (task_ids[1], TaskState.TODO, 3),
+    ):
+        day = today - timedelta(days=days_ago)
+        await session.execute(
+            update(TaskStateTransition)
+            .where(
+                TaskStateTransition.task_id == task_id,
+                TaskStateTransition.to_state == to_state,
+            )
+            .values(created_at=datetime.combine(day, time(20), timezone.utc))
+        )
+    await session.flush()
+
+    response = await ac.get(
+        f"/projects/{project.id}/analytics/burndown", headers=headers
+    )
+    assert response.status_code == 200
+    burndown = response.json()
+    assert burndown["days"] == [
+        (today - timedelta(days=n)).isoformat() for n in range(5, -1, -1)
+    ]
+    assert burndown["open"] == [0, 1, 2, 1, 1, 1]
+    assert burndown["completed"] == [0, 0, 0, 1, 1, 1]
+
+    # Past days are kept as they were; recent ones follow changes.
+    response = await ac.delete(f"/tasks/{task_ids[1]}", headers=headers)
+    assert response.status_code == 204
+    response = await ac.get(
+        f"/projects/{project.id}/analytics/burndown", headers=headers
+    )
+    assert response.json()["open"] == [0, 1, 2, 1, 0, 0]
+    stored = await session.scalars(
+        select(ProjectTaskSnapshot.day).where(
+            ProjectTaskSnapshot.project_id == project.id
+        )
+    )
+    assert max(stored.all()) == today - timedelta(days=2)
+
+
+@pytest.mark.anyio
+async def test_assigned_tasks_are_listed_across_projects(
+    ac: AsyncClient,
+    created_user: User,
+    created_user_access_token: str,
+    project: Project,
+    session: AsyncSession,
+):
+    tasks = (
+        await session.scalars(select(Task).where(Task.project_id == project.id))
+    ).all()
+    session.add_all([TaskAssignee(task.id, created_user.id) for task in tasks])
+    await session.flush()
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+
+    response = await ac.get(
+        "/users/me/tasks", params={"state": ["Todo"]}, headers=headers
+    )
+    assert response.status_code == 200
+    assert {t["title"] for t in response.json()["items"]} == {"Due", "Urgent overdue"}
+    assert response.json()["items"][0]["project"] == {
+        "id": str(project.id),
+        "title": "Project",
+    }
+    assert response.json()["items"][0]["organization"]["name"] == "Something"
+
+    titles, cursor = [], None
+    while True:
+        response = await ac.get(
+            "/users/me/tasks",
+            params={"page_size": 3, **({"cursor": cursor} if cursor else {})},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        titles += [t["title"] for t in response.json()["items"]]
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            break
+    # Assigned at once, so ordered by task.
+    assert titles == [t.title for t in sorted(tasks, key=lambda t: t.id, reverse=True)]
+
+
+@pytest.mark.anyio
+async def test_project_events_are_streamed_until_subscriber_falls_behind(
+    ac: AsyncClient,
+    created_user_access_token: str,
+    project: Project,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    url = f"/projects/{project.id}/events"
+
+    response = await ac.get(url, headers=headers)
+    assert response.status_code == 503
+
+    # Nothing listens in tests; events are dispatched by hand instead.
+    monkeypatch.setattr(task_events, "listening", True)
+    monkeypatch.setattr(task_events, "queue_size", 2)
+    monkeypatch.setattr(task_events, "max_stream_seconds", 0.5)
+
+    def event(project_id) -> str:
+        return json.dumps(
+            {"type": "Updated", "project_id": str(project_id), "task_id": "..."}
+        )
+
+    async def dispatch_when_subscribed(*events: str) -> None:
+        while not task_events.subscribers:
+            await asyncio.sleep(0.01)
+        for e in events:
+            task_events.dispatch(e)
+
+    # Events are queued all at once, faster than the stream is read; the third
+    # one of the project overflows the queue.
+    response, _ = await asyncio.gather(
+        ac.get(url, headers=headers),
+        dispatch_when_subscribed(
+            event(project.id), event(uuid4()), event(project.id), event(project.id)
+        ),
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.split("\n\n")[:2] == ["retry: 3000", "event: resync\ndata: {}"]
+    assert task_events.subscribers == 0
+
+    response, _ = await asyncio.gather(
+        ac.get(url, headers=headers),
+        dispatch_when_subscribed(event(project.id)),
+    )
+    assert response.text.split("\n\n")[:2] == [
+        "retry: 3000",
+        f"event: task\ndata: {event(project.id)}",
+    ]
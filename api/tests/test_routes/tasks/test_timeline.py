@@ -0,0 +1,177 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.orgs.models import Organization
+from api.projects.models import Project
+from api.tasks.enums import TaskState
+from api.tasks.models import Task, TaskAssignee
+from api.users.models import User
+
+
+@pytest.fixture
+async def project(session: AsyncSession, created_user: User) -> Project:
+    """Project managed by `created_user` with tasks around March 2026."""
+    organization = Organization(
+        manager_id=created_user.id, name="Something", description="Foo"
+    )
+    session.add(organization)
+    await session.flush()
+
+    project = Project(
+        title="Project",
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        organization_id=organization.id,
+    )
+    session.add(project)
+    await session.flush()
+
+    session.add_all(
+        [
+            Task(
+                project_id=project.id,
+                title=title,
+                description=None,
+                start_date=start_date,
+                finish_date=finish_date,
+                deadline=deadline,
+                state=TaskState.COMPLETED if finish_date else TaskState.TODO,
+                priority=1,
+            )
+            for title, start_date, deadline, finish_date in (
+                ("Early", date(2026, 2, 20), date(2026, 3, 3), None),
+                ("Open ended", date(2026, 3, 10), None, None),
+                ("Done", date(2026, 3, 5), date(2026, 3, 30), date(2026, 3, 20)),
+                ("Later", date(2026, 4, 20), None, None),
+                ("Unscheduled", None, date(2026, 3, 10), None),
+                ("Over", date(2026, 2, 1), date(2026, 2, 10), None),
+            )
+        ]
+    )
+    await session.flush()
+    return project
+
+
+@pytest.mark.anyio
+async def test_timeline_buckets_tasks_of_window(
+    ac: AsyncClient,
+    created_user_access_token: str,
+    created_user: User,
+    project: Project,
+    session: AsyncSession,
+):
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    response = await ac.get(
+        f"/projects/{project.id}/tasks", params={"page_size": 50}, headers=headers
+    )
+    ids = {t["title"]: t["id"] for t in response.json()["items"]}
+    session.add(TaskAssignee(task_id=ids["Done"], user_id=created_user.id))
+    await session.flush()
+
+    # 2026-03-04 is a Wednesday, so the window starts on the Monday before.
+    response = await ac.get(
+        f"/projects/{project.id}/timeline",
+        params={"start": "2026-03-04", "finish": "2026-03-25", "zoom": "week"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    timeline = response.json()
+    assert timeline["start"] == "2026-03-02"
+    assert timeline["finish"] == "2026-03-29"
+    assert timeline["buckets"] == [
+        "2026-03-02",
+        "2026-03-09",
+        "2026-03-16",
+        "2026-03-23",
+    ]
+    assert timeline["ids"] == [ids["Early"], ids["Done"], ids["Open ended"]]
+    assert timeline["states"] == ["Todo", "Completed", "Todo"]
+    assert timeline["start_dates"] == [-10, 3, 8]
+    assert timeline["deadlines"] == [1, 28, None]
+    assert timeline["finish_dates"] == [None, 18, None]
+    assert timeline["first_buckets"] == [0, 0, 1]
+    assert timeline["last_buckets"] == [0, 2, 1]
+    assert timeline["assignees"] == [[], [0], []]
+    assert [u["id"] for u in timeline["users"]] == [str(created_user.id)]
+
+    response = await ac.get(
+        f"/projects/{project.id}/timeline",
+        params={"start": "2026-03-04", "finish": "2026-04-30", "zoom": "month"},
+        headers=headers,
+    )
+    timeline = response.json()
+    assert timeline["buckets"] == ["2026-03-01", "2026-04-01"]
+    assert timeline["ids"][-1] == ids["Later"]
+    assert timeline["first_buckets"] == [0, 0, 0, 1]
+
+
+@pytest.mark.anyio
+async def test_timeline_is_smaller_than_task_listing(
+    ac: AsyncClient,
+    created_user_access_token: str,
+    created_user: User,
+    project: Project,
+    session: AsyncSession,
+):
+    start = date(2026, 3, 2)
+    tasks = [
+        Task(
+            project_id=project.id,
+            title=f"Task {n}",
+            description=None,
+            start_date=start + timedelta(days=n % 20),
+            finish_date=None,
+            deadline=start + timedelta(days=n % 20 + 5),
+            state=TaskState.IN_PROGRESS,
+            priority=1,
+        )
+        for n in range(40)
+    ]
+    session.add_all(tasks)
+    await session.flush()
+    session.add_all(
+        [TaskAssignee(task_id=task.id, user_id=created_user.id) for task in tasks]
+    )
+    await session.flush()
+
+    headers = {"Authorization": f"Bearer {created_user_access_token}"}
+    response = await ac.get(
+        f"/projects/{project.id}/timeline",
+        params={"start": "2026-03-01", "finish": "2026-03-31", "zoom": "day"},
+        headers=headers,
+    )
+    timeline = response.json()
+    listing = await ac.get(
+        f"/projects/{project.id}/tasks",
+        params={"page_size": 50, "order_by": "created_at"},
+        headers=headers,
+    )
+    items = [t for t in listing.json()["items"] if t["id"] in set(timeline["ids"])]
+    assert len(items) == len(timeline["ids"]) == 43
+
+    assert len(json.dumps(timeline)) * 3 < len(json.dumps(items))
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"start": "2026-03-04", "finish": "2026-03-01"},
+        {"start": "2026-01-01", "finish": "2027-06-01", "zoom": "day"},
+    ],
+)
+async def test_invalid_timeline_windows_are_rejected(
+    ac: AsyncClient, created_user_access_token: str, project: Project, params: dict
+):
+    response = await ac.get(
+        f"/projects/{project.id}/timeline",
+        params=params,
+        headers={"Authorization": f"Bearer {created_user_access_token}"},
+    )
+    assert response.status_code == 422
@@ -0,0 +1,540 @@
+"""Statement budgets for every route.
+
+Each route declares the maximum number of SQL statements it may execute for a
+typical successful request. Adding a query to a route (e.g. another permission
+check) fails these tests until the budget below is raised deliberately.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+import pytest
+from fastapi.routing import APIRoute
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.jobs.models import Job
+from api.main import app
+from api.orgs.models import Organization, OrganizationInvitation, OrganizationMembership
+from api.projects.enums import ProjectParticipationType
+from api.projects.models import Project, ProjectParticipant
+from api.tasks.enums import TaskState
+from api.tasks.models import Task, TaskAssignee
+from api.tests.test_routes.conftest import _PASSWORD
+from api.users.models import User
+from api.users.services import AuthenticationService, UserService
+
+
+@dataclass
+class Case:
+    method: str
+    path: str
+    budget: int
+    status_code: int
+    as_user: str = "manager"
+    json: Any = None
+    params: dict = field(default_factory=dict)
+
+
+_TASK_BODY = {
+    "title": "Task",
+    "description": None,
+    "start_date": None,
+    "finish_date": None,
+    "deadline": None,
+    "state": "Todo",
+    "priority": 1,
+}
+
+# Route name -> statement budget along with a request that exercises it.
+# Paths, bodies and params are formatted with the `world` fixture's attributes.
+CASES: dict[str, Case] = {
+    # Users
+    "obtain_access_token": Case(
+        "POST",
+        "/auth/token",
+        budget=1,
+        status_code=200,
+        as_user=None,
+        json={"email": "manager@foo.buz", "password": _PASSWORD},
+    ),
+    "create_single_user": Case(
+        "POST",
+        "/users",
+        budget=3,
+        status_code=201,
+        as_user=None,
+        json={
+            "email": "new@foo.buz",
+            "password": "something",
+            "first_name": "New",
+            "last_name": "User",
+            "display_name": None,
+        },
+    ),
+    "get_user_self": Case("GET", "/users/me", budget=1, status_code=200),
+    "get_assigned_tasks": Case(
+        "GET", "/users/me/tasks", budget=2, status_code=200, as_user="member"
+    ),
+    # Organizations
+    "get_organizations": Case(
+        "GET", "/users/me/organizations", budget=3, status_code=200
+    ),
+    "create_organization": Case(
+        "POST",
+        "/organizations",
+        budget=6,
+        status_code=201,
+        json={"name": "New", "description": "Foo"},
+    ),
+    "get_organization": Case(
+        "GET", "/organizations/{organization.id}", budget=2, status_code=200
+    ),
+    "update_organization": Case(
+        "PUT",
+        "/organizations/{organization.id}",
+        budget=4,
+        status_code=200,
+        json={"name": "Renamed", "description": "Bar"},
+    ),
+    "delete_organization": Case(
+        "DELETE", "/organizations/{empty_organization.id}", budget=6, status_code=202
+    ),
+    "get_organization_members": Case(
+        "GET", "/organizations/{organization.id}/members", budget=3, status_code=200
+    ),
+    "get_organization_workload": Case(
+        "GET", "/organizations/{organization.id}/workload", budget=3, status_code=200
+    ),
+    "activate_organization_member": Case(
+        "POST",
+        "/organizations/{organization.id}/members/{member.id}/activate",
+        budget=4,
+        status_code=204,
+    ),
+    "deactivate_organization_member": Case(
+        "POST",
+        "/organizations/{organization.id}/members/{member.id}/deactivate",
+        budget=4,
+        status_code=204,
+    ),
+    "invite_to_organization": Case(
+        "POST",
+        "/organizations/{organization.id}/invite/",
+        budget=7,
+        status_code=204,
+        json={"email": "outsider@foo.buz"},
+    ),
+    "bulk_invite_to_organization": Case(
+        "POST",
+        "/organizations/{organization.id}/invitations:bulk",
+        budget=3,
+        status_code=200,
+        json={"emails": ["outsider@foo.buz", "invitee@foo.buz", "nobody@foo.buz"]},
+    ),
+    "get_user_invitations": Case(
+        "GET",
+        "/users/me/organizations/invitations",
+        budget=3,
+        status_code=200,
+        as_user="invitee",
+    ),
+    "set_invitation_status": Case(
+        "POST",
+        "/users/me/organizations/invitations/{organization.id}",
+        budget=2,
+        status_code=204,
+        as_user="invitee",
+        json={"accepted": True},
+    ),
+    # Projects
+    "get_projects": Case(
+        "GET", "/organizations/{organization.id}/projects", budget=4, status_code=200
+    ),
+    "create_project": Case(
+        "POST",
+        "/organizations/{organization.id}/projects",
+        budget=5,
+        status_code=201,
+        json={
+            "title": "New project",
+            "description": None,
+            "start_date": None,
+            "deadline": None,
+        },
+    ),
+    "get_project": Case("GET", "/projects/{project.id}", budget=3, status_code=200),
+    "update_project": Case(
+        "PUT",
+        "/projects/{project.id}",
+        budget=5,
+        status_code=200,
+        json={
+            "title": "Renamed",
+            "description": None,
+            "start_date": None,
+            "finish_date": None,
+            "deadline": None,
+        },
+    ),
+    "delete_project": Case(
+        "DELETE", "/projects/{empty_project.id}", budget=7, status_code=202
+    ),
+    "get_project_participants": Case(
+        "GET", "/projects/{project.id}/participants", budget=5, status_code=200
+    ),
+    "create_project_participant": Case(
+        "POST",
+        "/projects/{project.id}/participants",
+        budget=7,
+        status_code=201,
+        json={"participation_type": "Viewer", "user_id": "{outsider.id}"},
+    ),
+    "update_project_participants": Case(
+        "PATCH",
+        "/projects/{project.id}/participants",
+        budget=8,
+        status_code=204,
+        json={
+            "add": [{"participation_type": "Viewer", "user_id": "{manager.id}"}],
+            "remove": ["{member.id}"],
+        },
+    ),
+    "replace_project_participants": Case(
+        "PUT",
+        "/projects/{project.id}/participants",
+        budget=8,
+        status_code=204,
+        json={
+            "participants": [
+                {"participation_type": "Viewer", "user_id": "{manager.id}"},
+                {"participation_type": "Contributor", "user_id": "{member.id}"},
+            ]
+        },
+    ),
+    "update_project_participant": Case(
+        "PUT",
+        "/projects/{project.id}/participants/{member.id}",
+        budget=6,
+        status_code=200,
+        json={"participation_type": "Viewer"},
+    ),
+    "delete_project_participant": Case(
+        "DELETE",
+        "/projects/{project.id}/participants/{member.id}",
+        budget=5,
+        status_code=204,
+    ),
+    # Tasks
+    "get_project_tasks": Case(
+        "GET", "/projects/{project.id}/tasks", budget=6, status_code=200
+    ),
+    "get_project_board": Case(
+        "GET", "/projects/{project.id}/board", budget=4, status_code=200
+    ),
+    "get_project_board_column": Case(
+        "GET", "/projects/{project.id}/board/Todo", budget=4, status_code=200
+    ),
+    "get_project_stats": Case(
+        "GET", "/projects/{project.id}/stats", budget=4, status_code=200
+    ),
+    # Nothing listens for task events in tests.
+    "get_project_events": Case(
+        "GET", "/projects/{project.id}/events", budget=3, status_code=503
+    ),
+    "get_project_critical_path": Case(
+        "GET", "/projects/{project.id}/critical-path", budget=5, status_code=200
+    ),
+    "get_project_timeline": Case(
+        "GET",
+        "/projects/{project.id}/timeline",
+        budget=5,
+        status_code=200,
+        params={"start": "2026-01-01", "finish": "2026-12-31"},
+    ),
+    "get_project_cycle_time": Case(
+        "GET",
+        "/projects/{project.id}/analytics/cycle-time",
+        budget=4,
+        status_code=200,
+    ),
+    "get_project_time_in_state": Case(
+        "GET",
+        "/projects/{project.id}/analytics/time-in-state",
+        budget=4,
+        status_code=200,
+    ),
+    "get_project_burndown": Case(
+        "GET",
+        "/projects/{project.id}/analytics/burndown",
+        budget=5,
+        status_code=200,
+    ),
+    "create_task": Case(
+        "POST",
+        "/projects/{project.id}/tasks",
+        budget=10,
+        status_code=201,
+        json=_TASK_BODY,
+    ),
+    "get_task": Case("GET", "/tasks/{task.id}", budget=3, status_code=200),
+    "update_task": Case(
+        "PUT", "/tasks/{task.id}", budget=5, status_code=200, json=_TASK_BODY
+    ),
+    "delete_task": Case("DELETE", "/tasks/{task.id}", budget=8, status_code=204),
+    "set_task_state": Case(
+        "PUT",
+        "/tasks/{task.id}/state",
+        budget=12,
+        status_code=200,
+        as_user="member",
+        json={"state": "In_Progress", "finish_date": None},
+    ),
+    "move_task": Case(
+        "PUT",
+        "/tasks/{task.id}/rank",
+        budget=10,
+        status_code=200,
+        json={"after_id": "{unassigned_task.id}"},
+    ),
+    "add_task_assignee": Case(
+        "POST",
+        "/tasks/{unassigned_task.id}/assignees",
+        budget=9,
+        status_code=204,
+        json={"user_id": "{member.id}"},
+    ),
+    "delete_task_assignee": Case(
+        "DELETE",
+        "/tasks/{task.id}/assignees",
+        budget=6,
+        status_code=204,
+        json={"user_id": "{member.id}"},
+    ),
+    "update_task_assignees": Case(
+        "PATCH",
+        "/tasks/{unassigned_task.id}/assignees",
+        budget=8,
+        status_code=204,
+        json={"add": ["{member.id}"], "remove": ["{manager.id}"]},
+    ),
+    "replace_task_assignees": Case(
+        "PUT",
+        "/tasks/{task.id}/assignees",
+        budget=8,
+        status_code=204,
+        json={"user_ids": []},
+    ),
+    "get_task_dependencies": Case(
+        "GET", "/tasks/{task.id}/dependencies", budget=4, status_code=200
+    ),
+    "add_task_dependency": Case(
+        "POST",
+        "/tasks/{task.id}/dependencies",
+        budget=6,
+        status_code=204,
+        json={"depends_on_id": "{unassigned_task.id}"},
+    ),
+    "delete_task_dependency": Case(
+        "DELETE",
+        "/tasks/{task.id}/dependencies",
+        budget=4,
+        status_code=204,
+        json={"depends_on_id": "{unassigned_task.id}"},
+    ),
+    # Search
+    "search_organization": Case(
+        "GET",
+        "/organizations/{organization.id}/search",
+        budget=3,
+        status_code=200,
+        params={"q": "task"},
+    ),
+    "search_project": Case(
+        "GET",
+        "/projects/{project.id}/search",
+        budget=5,
+        status_code=200,
+        as_user="member",
+        params={"q": "task"},
+    ),
+    "search_users": Case(
+        "GET",
+        "/users/search",
+        budget=3,
+        status_code=200,
+        params={"q": "mem", "organization_id": "{organization.id}"},
+    ),
+    # Changes
+    "get_organization_changes": Case(
+        "GET",
+        "/organizations/{organization.id}/changes",
+        budget=7,
+        status_code=200,
+        as_user="member",
+    ),
+    # Jobs
+    "get_job": Case("GET", "/jobs/{job.id}", budget=2, status_code=200),
+}
+
+
+@dataclass
+class World:
+    manager: User
+    member: User
+    invitee: User
+    outsider: User
+    organization: Organization
+    empty_organization: Organization
+    project: Project
+    empty_project: Project
+    task: Task
+    unassigned_task: Task
+    job: Job
+
+
+@pytest.fixture
+async def world(session: AsyncSession) -> World:
+    """Organization managed by `manager`, where `member` contributes to `project`
+    and is assigned to `task`, and `invitee` has a pending invitation."""
+    hashed_password = UserService(None)._hash_password(_PASSWORD)
+    users = {
+        name: User(
+            email=f"{name}@foo.buz",
+            password=hashed_password,
+            first_name=name.title(),
+            last_name="Buz",
+            display_name=None,
+        )
+        for name in ("manager", "member", "invitee", "outsider")
+    }
+    session.add_all(users.values())
+    await session.flush()
+
+    organization = Organization(
+        manager_id=users["manager"].id, name="Organization", description="Foo"
+    )
+    empty_organization = Organization(
+        manager_id=users["manager"].id, name="Empty", description="Foo"
+    )
+    session.add_all([organization, empty_organization])
+    await session.flush()
+
+    project = Project(
+        title="Project",
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        organization_id=organization.id,
+    )
+    empty_project = Project(
+        title="Empty project",
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        organization_id=organization.id,
+    )
+    session.add_all(
+        [
+            project,
+            empty_project,
+            OrganizationMembership(organization.id, users["manager"].id, True),
+            OrganizationMembership(organization.id, users["member"].id, True),
+            OrganizationInvitation(None, organization.id, users["invitee"].id),
+        ]
+    )
+    await session.flush()
+
+    task = Task(
+        project_id=project.id,
+        title="Task",
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        state=TaskState.TODO,
+        priority=1,
+    )
+    unassigned_task = Task(
+        project_id=project.id,
+        title="Unassigned task",
+        description=None,
+        start_date=None,
+        finish_date=None,
+        deadline=None,
+        state=TaskState.TODO,
+        priority=1,
+    )
+    session.add_all(
+        [
+            task,
+            unassigned_task,
+            ProjectParticipant(
+                project.id, users["member"].id, ProjectParticipationType.CONTRIBUTOR
+            ),
+        ]
+    )
+    await session.flush()
+
+    job = Job(
+        kind="delete_project",
+        payload={"project_id": str(empty_project.id)},
+        created_by_id=users["manager"].id,
+    )
+    session.add_all([TaskAssignee(task.id, users["member"].id), job])
+    await session.flush()
+
+    return World(
+        **users,
+        organization=organization,
+        empty_organization=empty_organization,
+        project=project,
+        empty_project=empty_project,
+        task=task,
+        unassigned_task=unassigned_task,
+        job=job,
+    )
+
+
+def _format(value: Any, world: World) -> Any:
+    if isinstance(value, str):
+        return value.format(**world.__dict__)
+    if isinstance(value, dict):
+        return {k: _format(v, world) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_format(v, world) for v in value]
+    return value
+
+
+def test_every_route_has_a_statement_budget():
+    route_names = [r.name for r in app.routes if isinstance(r, APIRoute)]
+
+    assert len(route_names) == len(set(route_names)), "Route names must be unique."
+    assert set(route_names) == set(CASES)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("name", CASES)
+async def test_route_stays_within_statement_budget(
+    name: str, ac: AsyncClient, world: World, statements
+):
+    case = CASES[name]
+    headers = {}
+    if case.as_user:
+        user = getattr(world, case.as_user)
+        token = AuthenticationService(None)._create_access_token(user.id)
+        headers["Authorization"] = f"Bearer {token}"
+
+    with statements() as executed:
+        response = await ac.request(
+            case.method,
+            _format(case.path, world),
+            json=_format(case.json, world),
+            params=_format(case.params, world),
+            headers=headers,
+        )
+
+    assert response.status_code == case.status_code, response.text
+    assert len(executed) <= case.budget, "\n\n".join(executed)
@@ -1,3 +1,5 @@
+from uuid import UUID
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy import select
@@ -9,7 +11,13 @@ from api.users.models import User
 
 @pytest.mark.anyio
 async def test_user_create(ac: AsyncClient, session: AsyncSession):
-    payload = {"email": "foo@bar.buz", "password": "doesn't_matter"}
+    payload = {
+        "email": "foo@bar.buz",
+        "password": "doesn't_matter",
+        "first_name": "Foo",
+        "last_name": "Bar",
+        "display_name": None,
+    }
 
     response = await ac.post("/users", json=payload)
     user = (
@@ -25,7 +33,13 @@ async def test_user_create(ac: AsyncClient, session: AsyncSession):
 async def test_duplicate_user_cannot_be_created(
     ac: AsyncClient, session: AsyncSession, created_user: User
 ):
-    payload = {"email": created_user.email, "password": "doesn't_matter"}
+    payload = {
+        "email": created_user.email,
+        "password": "doesn't_matter",
+        "first_name": "Foo",
+        "last_name": "Bar",
+        "display_name": None,
+    }
     response = await ac.post("/users", json=payload)
     assert response.status_code == 400
 
@@ -35,3 +49,20 @@ async def test_user_can_obtain_access_token(ac: AsyncClient, created_user: User)
     payload = {"email": created_user.email, "password": _PASSWORD}
     response = await ac.post("/auth/token", json=payload)
     assert response.status_code == 200
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("session")
+async def test_created_user_id_is_time_ordered(ac: AsyncClient):
+    payload = {
+        "email": "foo@bar.buz",
+        "password": "doesn't_matter",
+        "first_name": "Foo",
+        "last_name": "Bar",
+        "display_name": None,
+    }
+
+    response = await ac.post("/users", json=payload)
+
+    assert response.status_code == 201
+    assert UUID(response.json()["id"]).version == 7
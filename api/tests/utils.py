@@ -0,0 +1,40 @@
+import re
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Savepoints are emitted by the test session fixture, not by the application.
+_IGNORED_STATEMENTS = re.compile(
+    r"^\s*(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.IGNORECASE
+)
+
+
+@contextmanager
+def record_statements(engine: AsyncEngine) -> Iterator[list[str]]:
+    """Record SQL statements executed on given engine while the block runs.
+
+    Usage:
+        with record_statements(async_engine) as statements:
+            await ac.get("/users/me")
+
+        assert len(statements) <= 1
+
+    Args:
+        engine (AsyncEngine): Engine to listen on.
+
+    Yields:
+        list[str]: Executed statements, appended to as they run.
+    """
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args) -> None:
+        if not _IGNORED_STATEMENTS.match(statement):
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
@@ -1,9 +1,10 @@
 from uuid import UUID
 
-from sqlalchemy import text, types
+from sqlalchemy import DDL, Index, event, func, text, types
 from sqlalchemy.orm import Mapped, mapped_column
 
 from api.database.models import BaseDatabaseModel, TimestampedModelMixin
+from api.utils.ids import uuid7
 
 
 class User(BaseDatabaseModel, TimestampedModelMixin):
@@ -15,6 +16,7 @@ class User(BaseDatabaseModel, TimestampedModelMixin):
         types.Uuid,
         primary_key=True,
         init=False,
+        insert_default=uuid7,
         server_default=text("gen_random_uuid()"),
     )
 
@@ -25,3 +27,32 @@ class User(BaseDatabaseModel, TimestampedModelMixin):
     first_name: Mapped[str] = mapped_column(types.String(255), nullable=False)
     last_name: Mapped[str] = mapped_column(types.String(255), nullable=False)
     display_name: Mapped[str] = mapped_column(types.String(255), nullable=True)
+
+    __table_args__ = (
+        # Emails are looked up case-insensitively.
+        Index("ix_users_email_lower", func.lower(email)),
+        # Substring search of names and emails, see `contains_words`.
+        Index(
+            "ix_users_trgm",
+            "email",
+            "first_name",
+            "last_name",
+            "display_name",
+            postgresql_using="gin",
+            postgresql_ops={
+                "email": "gin_trgm_ops",
+                "first_name": "gin_trgm_ops",
+                "last_name": "gin_trgm_ops",
+                "display_name": "gin_trgm_ops",
+            },
+        ),
+    )
+
+
+# Trigram operator classes come with the `pg_trgm` extension; tables created
+# from models (e.g. in tests) need it as well as migrated ones.
+event.listen(
+    User.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
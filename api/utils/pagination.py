@@ -1,3 +1,6 @@
+import base64
+import binascii
+import json
 import math
 from typing import Annotated, Generic, TypeVar
 
@@ -19,6 +22,11 @@ class PaginationParams(BaseModel):
 PaginationQueryParams = Annotated[PaginationParams, Query()]
 
 
+class CursorPaginationParams(BaseModel):
+    page_size: int = Field(ge=1, le=50, default=DEFAULT_PER_PAGE)
+    cursor: str | None = Field(None)
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     total_pages: int = 0
     current_page: int = 1
@@ -27,6 +35,39 @@ class PaginatedResponse(BaseModel, Generic[T]):
     items: list[T] = []
 
 
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    """Page of a keyset paginated listing. Pass `next_cursor` to get the next
+    page; it is None on the last page."""
+
+    next_cursor: str | None = None
+    count: int = 0
+    items: list[T] = []
+
+
+def encode_cursor(values: dict) -> str:
+    """Encode keyset values (of the last item of a page) as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor made by `encode_cursor`.
+
+    Raises:
+        HTTPException: When cursor is malformed.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError):
+        values = None
+
+    if not isinstance(values, dict):
+        raise HTTPException(
+            detail="Invalid cursor.", status_code=status.HTTP_400_BAD_REQUEST
+        )
+
+    return values
+
+
 async def paginate[T](
     query: Select,
     session: async_sessionmaker,